@@ -0,0 +1,38 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from dependency_injector.wiring import Provide, inject
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from infrastructure.container import Container
+from infrastructure.database.session import read_session_ctx_var, session_scope
+
+
+@asynccontextmanager
+async def database_scope(
+    session_factory: async_sessionmaker[AsyncSession],
+    read_session_factory: async_sessionmaker[AsyncSession],
+) -> AsyncIterator[AsyncSession]:
+    """Vincula as sessões de escrita e de leitura ao contexto atual.
+
+    As sessões só pegam uma conexão do pool no primeiro comando, então abrir
+    as duas não custa nada a quem usa apenas uma delas.
+    """
+    async with session_scope(session_factory) as session:
+        async with session_scope(read_session_factory, read_session_ctx_var):
+            yield session
+
+
+@inject
+async def request_session(
+    session_factory: async_sessionmaker[AsyncSession] = Depends(
+        Provide[Container.session_factory]
+    ),
+    read_session_factory: async_sessionmaker[AsyncSession] = Depends(
+        Provide[Container.read_session_factory]
+    ),
+) -> AsyncIterator[AsyncSession]:
+    """Dependência FastAPI: uma sessão por requisição."""
+    async with database_scope(session_factory, read_session_factory) as session:
+        yield session
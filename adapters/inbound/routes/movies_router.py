@@ -1,5 +1,5 @@
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 
 from adapters.inbound.auth import require_auth
 from application.movie_service import MovieService
@@ -7,6 +7,23 @@ from infrastructure.container import Container
 
 router = APIRouter(prefix="/movies", tags=["movies"])
 
+MAX_BATCH_SIZE = 100
+
+
+@router.get("")
+@inject
+async def get_movies(
+    ids: str = Query(..., pattern=r"^\d+(,\d+)*$", examples=["1,2,3"]),
+    service: MovieService = Depends(Provide[Container.movie_service]),
+    _=Depends(require_auth),
+):
+    movie_ids = [int(movie_id) for movie_id in ids.split(",")]
+    if len(movie_ids) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=422, detail=f"At most {MAX_BATCH_SIZE} ids per request"
+        )
+    return await service.get_many(movie_ids)
+
 
 @router.get("/search/{query}")
 @inject
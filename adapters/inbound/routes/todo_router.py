@@ -1,16 +1,40 @@
+from typing import Optional
+
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 
 from application.todo_service import TodoService
+from domain.todo import ToDo
 from infrastructure.container import Container
 
 router = APIRouter(prefix="/todos", tags=["todos"])
 
+MAX_PAGE_SIZE = 200
+TODO_FIELDS = frozenset(ToDo.model_fields)
+
 
 @router.get("/")
 @inject
-async def list_todos(service: TodoService = Depends(Provide[Container.todo_service])):
-    return await service.find_all()
+async def list_todos(
+    user_id: Optional[int] = Query(None, alias="userId"),
+    completed: Optional[bool] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    fields: Optional[str] = Query(None, examples=["id,title"]),
+    service: TodoService = Depends(Provide[Container.todo_service]),
+):
+    selected = set(fields.split(",")) if fields else None
+    if selected is not None and not selected <= TODO_FIELDS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unknown fields: {', '.join(sorted(selected - TODO_FIELDS))}",
+        )
+
+    todos = await service.find_by(user_id=user_id, completed=completed)
+    page = todos[offset : offset + limit if limit else None]
+    if selected is None:
+        return page
+    return [todo.model_dump(include=selected) for todo in page]
 
 
 @router.get("/{todo_id}")
@@ -1,13 +1,46 @@
+import csv
+import io
+from contextlib import contextmanager
+from typing import AsyncIterator, Callable, Iterator, List, Literal, Optional
+
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from adapters.inbound.auth import require_auth
+from adapters.inbound.database import database_scope, request_session
+from adapters.inbound.user_import import (
+    LineTooLongError,
+    csv_batches,
+    iter_lines,
+    ndjson_batches,
+)
 from application.user_service import UserService
-from domain.user import User
+from domain.user import DuplicateEmailError, User, UserBatchResult, UserImportReport
 from infrastructure.container import Container
 from infrastructure.logger.logger_middleware import log_with_request
 
-router = APIRouter(prefix="/users", tags=["users"])
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+MAX_SEARCH_RESULTS = 100
+EXPORT_CHUNK_SIZE = 1000
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+# Precisa estar em expose_headers do CORS para o frontend conseguir ler
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+@contextmanager
+def _email_conflict() -> Iterator[None]:
+    try:
+        yield
+    except DuplicateEmailError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from None
+
+
+router = APIRouter(
+    prefix="/users", tags=["users"], dependencies=[Depends(request_session)]
+)
 
 
 @router.post("/", dependencies=[Depends(require_auth)])
@@ -22,13 +55,122 @@ async def create_user(
         request, data={"event": "Usuário criado com sucesso", "user": "fulano"}
     )
 
-    return await service.save(user)
+    with _email_conflict():
+        return await service.save(user)
 
 
 @router.get("/", dependencies=[Depends(require_auth)])
 @inject
-async def list_users(service: UserService = Depends(Provide[Container.user_service])):
-    return await service.find_all()
+async def list_users(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    service: UserService = Depends(Provide[Container.user_service]),
+):
+    try:
+        users, next_cursor = await service.find_page(limit, cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return users
+
+
+def _ndjson(users: List[User]) -> str:
+    return "".join(user.model_dump_json() + "\n" for user in users)
+
+
+def _csv(users: List[User], header: bool) -> str:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(User.model_fields))
+    if header:
+        writer.writeheader()
+    writer.writerows(user.model_dump() for user in users)
+    return buffer.getvalue()
+
+
+@router.get("/export", dependencies=[Depends(require_auth)])
+@inject
+async def export_users(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    session_factory: async_sessionmaker[AsyncSession] = Depends(
+        Provide[Container.session_factory]
+    ),
+    read_session_factory: async_sessionmaker[AsyncSession] = Depends(
+        Provide[Container.read_session_factory]
+    ),
+    service_provider: Callable[[], UserService] = Depends(
+        Provide[Container.user_service.provider]
+    ),
+):
+    # A sessão da requisição é fechada antes do corpo ser enviado, então o
+    # stream abre a sua própria e só lê o próximo lote quando o cliente consome.
+    async def body() -> AsyncIterator[str]:
+        async with database_scope(session_factory, read_session_factory):
+            header = True
+            async for users in service_provider().export(EXPORT_CHUNK_SIZE):
+                yield _ndjson(users) if format == "ndjson" else _csv(users, header)
+                header = False
+        if header and format == "csv":
+            yield _csv([], header)
+
+    return StreamingResponse(
+        body(),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="users.{format}"'},
+    )
+
+
+@router.post("/import", dependencies=[Depends(require_auth)])
+@inject
+async def import_users(
+    request: Request,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    service: UserService = Depends(Provide[Container.user_service]),
+) -> UserImportReport:
+    lines = iter_lines(request.stream())
+    batches = ndjson_batches(lines) if format == "ndjson" else csv_batches(lines)
+    try:
+        with _email_conflict():
+            return await service.import_users(batches)
+    except LineTooLongError as exc:
+        # Os lotes anteriores à linha já foram gravados
+        raise HTTPException(status_code=413, detail=str(exc)) from None
+
+
+@router.post("/batch", dependencies=[Depends(require_auth)])
+@inject
+async def create_users(
+    users: List[User],
+    service: UserService = Depends(Provide[Container.user_service]),
+) -> List[UserBatchResult]:
+    for user in users:
+        user.id = None
+    with _email_conflict():
+        return await service.save_many(users)
+
+
+@router.put("/batch", dependencies=[Depends(require_auth)])
+@inject
+async def update_users(
+    users: List[User],
+    service: UserService = Depends(Provide[Container.user_service]),
+) -> List[UserBatchResult]:
+    if any(user.id is None for user in users):
+        raise HTTPException(status_code=422, detail="Todo usuário precisa de um id")
+    with _email_conflict():
+        return await service.update_many(
+            {user.id: user.model_dump(exclude_unset=True) for user in users}
+        )
+
+
+@router.delete("/batch", dependencies=[Depends(require_auth)])
+@inject
+async def delete_users(
+    ids: List[str] = Body(...),
+    service: UserService = Depends(Provide[Container.user_service]),
+) -> List[UserBatchResult]:
+    return await service.delete_many(ids)
 
 
 @router.delete("/{user_id}", dependencies=[Depends(require_auth)])
@@ -41,6 +183,28 @@ async def delete_user(
     return True
 
 
+@router.get("/search", dependencies=[Depends(require_auth)])
+@inject
+async def search_users(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=MAX_SEARCH_RESULTS),
+    offset: int = Query(0, ge=0),
+    service: UserService = Depends(Provide[Container.user_service]),
+):
+    return await service.search(q, limit, offset)
+
+
+@router.get("/by-email", dependencies=[Depends(require_auth)])
+@inject
+async def get_user_by_email(
+    email: str, service: UserService = Depends(Provide[Container.user_service])
+):
+    user = await service.get_by_email(email)
+    if user is None:
+        raise HTTPException(status_code=404, detail="Usuário não encontrado")
+    return user
+
+
 @router.get("/{user_id}", dependencies=[Depends(require_auth)])
 @inject
 async def get_user(
@@ -59,7 +223,8 @@ async def update_user(
     user: User,
     service: UserService = Depends(Provide[Container.user_service]),
 ):
-    updated = await service.update(user_id, user.model_dump(exclude_unset=True))
+    with _email_conflict():
+        updated = await service.update(user_id, user.model_dump(exclude_unset=True))
     if updated is None:
         raise HTTPException(status_code=404, detail="Usuário não encontrado")
     return updated
@@ -0,0 +1,132 @@
+import csv
+from typing import Any, AsyncIterator, Callable, List, Tuple
+
+from pydantic import TypeAdapter, ValidationError
+
+from domain.user import User, UserImportError
+
+BATCH_SIZE = 1000
+MAX_LINE_BYTES = 64 * 1024
+USER_LIST_ADAPTER = TypeAdapter(List[User])
+
+Line = Tuple[int, bytes]
+Batch = Tuple[List[User], List[UserImportError]]
+
+
+class LineTooLongError(ValueError):
+    def __init__(self, line: int, limit: int):
+        super().__init__(f"Linha {line} excede o limite de {limit} bytes")
+        self.line = line
+
+
+async def iter_lines(
+    chunks: AsyncIterator[bytes], max_line_bytes: int = MAX_LINE_BYTES
+) -> AsyncIterator[Line]:
+    """Quebra o corpo em linhas à medida que chega, sem bufferizar o todo.
+
+    Guarda só os pedaços da linha corrente (nada de `pending += chunk`, que é
+    quadrático) e recusa linhas acima de `max_line_bytes`.
+    """
+    parts: List[bytes] = []
+    size = 0
+    number = 0
+    async for chunk in chunks:
+        start = 0
+        while (end := chunk.find(b"\n", start)) != -1:
+            number += 1
+            size += end - start
+            if size > max_line_bytes:
+                raise LineTooLongError(number, max_line_bytes)
+            parts.append(chunk[start:end])
+            line = b"".join(parts).rstrip(b"\r")
+            if line.strip():
+                yield number, line
+            parts, size = [], 0
+            start = end + 1
+        size += len(chunk) - start
+        if size > max_line_bytes:
+            raise LineTooLongError(number + 1, max_line_bytes)
+        parts.append(chunk[start:])
+    line = b"".join(parts).rstrip(b"\r")
+    if line.strip():
+        yield number + 1, line
+
+
+async def _batched(lines: AsyncIterator[Line], size: int) -> AsyncIterator[List[Line]]:
+    batch: List[Line] = []
+    async for line in lines:
+        batch.append(line)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _error(number: int, exc: ValidationError) -> UserImportError:
+    error = exc.errors()[0]
+    field = ".".join(str(part) for part in error["loc"])
+    detail = f"{field}: {error['msg']}" if field else error["msg"]
+    return UserImportError(line=number, detail=detail)
+
+
+def _validate(
+    numbers: List[int],
+    validate_all: Callable[[], List[User]],
+    validate_one: Callable[[int], User],
+) -> Batch:
+    # ✅ Caminho rápido: o lote inteiro numa única validação; só em caso de
+    # erro cada linha é validada individualmente para localizar o problema
+    try:
+        users = validate_all()
+        if len(users) == len(numbers):
+            return users, []
+    except ValidationError:
+        pass
+    return _validate_each(numbers, validate_one)
+
+
+def _validate_each(numbers: List[int], validate_one: Callable[[int], User]) -> Batch:
+    users: List[User] = []
+    errors: List[UserImportError] = []
+    for index, number in enumerate(numbers):
+        try:
+            users.append(validate_one(index))
+        except ValidationError as exc:
+            errors.append(_error(number, exc))
+    return users, errors
+
+
+async def ndjson_batches(
+    lines: AsyncIterator[Line], batch_size: int = BATCH_SIZE
+) -> AsyncIterator[Batch]:
+    # Cada linha é validada sozinha: juntar linhas num array JSON deixaria
+    # duas linhas malformadas vizinhas se completarem em objetos válidos
+    async for batch in _batched(lines, batch_size):
+        numbers = [number for number, _ in batch]
+        payloads = [payload for _, payload in batch]
+        yield _validate_each(
+            numbers, lambda index: User.model_validate_json(payloads[index])
+        )
+
+
+async def csv_batches(
+    lines: AsyncIterator[Line], batch_size: int = BATCH_SIZE
+) -> AsyncIterator[Batch]:
+    """CSV com cabeçalho; campos vazios viram None. Não aceita quebras de linha
+    dentro de campos entre aspas, já que o corpo é lido linha a linha."""
+    header: List[str] = []
+    async for batch in _batched(lines, batch_size):
+        if not header:
+            header = next(csv.reader([batch[0][1].decode(errors="replace")]))
+            batch = batch[1:]
+        numbers = [number for number, _ in batch]
+        rows: List[Any] = [
+            {key: value or None for key, value in zip(header, values)}
+            for values in csv.reader(line.decode(errors="replace") for _, line in batch)
+        ]
+        yield _validate(
+            numbers,
+            lambda: USER_LIST_ADAPTER.validate_python(rows),
+            lambda index: User.model_validate(rows[index]),
+        )
@@ -0,0 +1,72 @@
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+import httpx
+
+from adapters.out.api.http_cache import HttpCacheEntry, SqliteHttpCache
+from infrastructure.cache.memory_cache import MemoryCache
+from infrastructure.single_flight import SingleFlight
+
+T = TypeVar("T")
+
+PARSED_CACHE_ENTRIES = 256
+
+
+class BaseApiClient:
+    def __init__(
+        self,
+        base_url: str,
+        client: httpx.AsyncClient,
+        http_cache: Optional[SqliteHttpCache] = None,
+    ):
+        self.base_url = base_url
+        # ✅ Cliente compartilhado, criado e fechado pelo Container/lifespan
+        self.client = client
+        self.http_cache = http_cache
+        self.single_flight = SingleFlight()
+        # corpo bruto -> objetos já validados, para não decodificar o mesmo JSON
+        self.parsed = MemoryCache(max_entries=PARSED_CACHE_ENTRIES, default_ttl=None)
+
+    async def _fetch(self, path: str, parse: Callable[[bytes], T], **kwargs: Any) -> T:
+        url = f"{self.base_url}{path}"
+        if self.http_cache is None:
+            response = await self.client.get(url, **kwargs)
+            response.raise_for_status()
+            return parse(response.content)
+
+        key = str(httpx.URL(url, params=kwargs.get("params")))
+        request_headers = httpx.Headers(self.client.headers)
+        request_headers.update(kwargs.get("headers", {}))
+        entry = await self.http_cache.get(key)
+        if entry is not None and not entry.matches(request_headers):
+            entry = None  # variante diferente (Vary); baixa e substitui
+        if entry is not None and entry.is_fresh():
+            return self._parse_body(key, entry.body, parse)
+
+        validators = self._validators(entry)
+        if validators:
+            kwargs["headers"] = {**kwargs.get("headers", {}), **validators}
+        response = await self.client.get(url, **kwargs)
+
+        if entry is not None and response.status_code == 304:
+            await self.http_cache.revalidate(key, entry, response)
+            return self._parse_body(key, entry.body, parse)
+
+        response.raise_for_status()
+        await self.http_cache.store(key, response, request_headers)
+        return self._parse_body(key, response.content, parse)
+
+    def _validators(self, entry: Optional[HttpCacheEntry]) -> Dict[str, str]:
+        headers = {}
+        if entry is not None and entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry is not None and entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def _parse_body(self, key: str, body: bytes, parse: Callable[[bytes], T]) -> T:
+        cached = self.parsed.get(key)
+        if cached is not None and cached[0] == body:
+            return cached[1]
+        value = parse(body)
+        self.parsed.set(key, (body, value))
+        return value
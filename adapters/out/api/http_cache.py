@@ -0,0 +1,181 @@
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import aiosqlite
+import httpx
+
+DEFAULT_TTL = 300.0
+DEFAULT_RETENTION = 86400.0
+PRUNE_EVERY = 100
+
+
+@dataclass
+class HttpCacheEntry:
+    body: bytes
+    expires_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    # JSON {cabeçalho: valor} dos cabeçalhos de requisição listados no Vary
+    vary: Optional[str] = None
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        return (time.time() if now is None else now) < self.expires_at
+
+    def matches(self, request_headers: httpx.Headers) -> bool:
+        """A entrada só serve para requisições com os mesmos valores do Vary."""
+        if self.vary is None:
+            return True
+        return all(
+            request_headers.get(name) == value
+            for name, value in json.loads(self.vary).items()
+        )
+
+
+def vary_values(
+    response_headers: httpx.Headers, request_headers: httpx.Headers
+) -> Optional[Dict[str, Optional[str]]]:
+    names = [
+        name.strip().lower()
+        for name in response_headers.get("vary", "").split(",")
+        if name.strip()
+    ]
+    return {name: request_headers.get(name) for name in sorted(names)} or None
+
+
+def parse_cache_control(
+    headers: httpx.Headers, default_ttl: float
+) -> Tuple[bool, float]:
+    """Retorna (armazenável, ttl) a partir do Cache-Control da resposta."""
+    directives = {}
+    for part in headers.get("cache-control", "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"')
+
+    # ✅ Cache compartilhado: respostas privadas não podem ser guardadas
+    if "no-store" in directives or "private" in directives:
+        return False, 0.0
+    if "no-cache" in directives:
+        return True, 0.0
+    for name in ("s-maxage", "max-age"):
+        if directives.get(name, "").isdigit():
+            return True, float(directives[name])
+    return True, default_ttl
+
+
+class SqliteHttpCache:
+    """Cache HTTP persistente em SQLite, compartilhado entre workers do host.
+
+    Guarda o corpo bruto com expiração e validadores (ETag/Last-Modified).
+    Entradas expiradas são mantidas por `retention` segundos para permitir
+    requisições condicionais antes de serem removidas.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        default_ttl: float = DEFAULT_TTL,
+        retention: float = DEFAULT_RETENTION,
+    ):
+        self.path = path
+        self.default_ttl = default_ttl if default_ttl is not None else DEFAULT_TTL
+        self.retention = retention if retention is not None else DEFAULT_RETENTION
+        self._conn: Optional[aiosqlite.Connection] = None
+        self._lock = asyncio.Lock()
+        self._writes = 0
+
+    async def _connection(self) -> aiosqlite.Connection:
+        async with self._lock:
+            if self._conn is None:
+                conn = await aiosqlite.connect(self.path)
+                await conn.execute("PRAGMA journal_mode=WAL")
+                await conn.execute("PRAGMA busy_timeout=5000")
+                await conn.execute(
+                    "CREATE TABLE IF NOT EXISTS http_cache ("
+                    "key TEXT PRIMARY KEY, body BLOB NOT NULL, etag TEXT, "
+                    "last_modified TEXT, expires_at REAL NOT NULL, vary TEXT)"
+                )
+                async with conn.execute("PRAGMA table_info(http_cache)") as cursor:
+                    columns = {row[1] async for row in cursor}
+                if "vary" not in columns:
+                    # Arquivo de uma versão anterior; o cache é descartável
+                    await conn.execute("ALTER TABLE http_cache ADD COLUMN vary TEXT")
+                await conn.commit()
+                self._conn = conn
+            return self._conn
+
+    async def get(self, key: str) -> Optional[HttpCacheEntry]:
+        conn = await self._connection()
+        async with conn.execute(
+            "SELECT body, expires_at, etag, last_modified, vary FROM http_cache "
+            "WHERE key = ?",
+            (key,),
+        ) as cursor:
+            row = await cursor.fetchone()
+        return HttpCacheEntry(*row) if row else None
+
+    async def set(self, key: str, entry: HttpCacheEntry) -> None:
+        conn = await self._connection()
+        await conn.execute(
+            "INSERT OR REPLACE INTO http_cache "
+            "(key, body, expires_at, etag, last_modified, vary) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                key,
+                entry.body,
+                entry.expires_at,
+                entry.etag,
+                entry.last_modified,
+                entry.vary,
+            ),
+        )
+        self._writes += 1
+        if self._writes % PRUNE_EVERY == 0:
+            await conn.execute(
+                "DELETE FROM http_cache WHERE expires_at < ?",
+                (time.time() - self.retention,),
+            )
+        await conn.commit()
+
+    async def store(
+        self,
+        key: str,
+        response: httpx.Response,
+        request_headers: Optional[httpx.Headers] = None,
+    ) -> Optional[HttpCacheEntry]:
+        cacheable, ttl = parse_cache_control(response.headers, self.default_ttl)
+        vary = vary_values(response.headers, request_headers or httpx.Headers())
+        if not cacheable or (vary is not None and "*" in vary):
+            return None
+        entry = HttpCacheEntry(
+            body=response.content,
+            expires_at=time.time() + ttl,
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified"),
+            vary=json.dumps(vary) if vary is not None else None,
+        )
+        await self.set(key, entry)
+        return entry
+
+    async def revalidate(
+        self, key: str, entry: HttpCacheEntry, response: httpx.Response
+    ) -> HttpCacheEntry:
+        """Renova a validade de uma entrada após um 304 Not Modified."""
+        _, ttl = parse_cache_control(response.headers, self.default_ttl)
+        entry = HttpCacheEntry(
+            body=entry.body,
+            expires_at=time.time() + ttl,
+            etag=response.headers.get("etag", entry.etag),
+            last_modified=response.headers.get("last-modified", entry.last_modified),
+            vary=entry.vary,
+        )
+        await self.set(key, entry)
+        return entry
+
+    async def close(self) -> None:
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
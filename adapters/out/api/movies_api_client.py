@@ -1,61 +1,71 @@
 from typing import List, Optional
 
 import httpx
+from pydantic import BaseModel, TypeAdapter
 from ta_envy import Env
 
+from adapters.out.api.base_api_client import BaseApiClient
+from adapters.out.api.http_cache import SqliteHttpCache
 from domain.movie import Movie
 from domain.movie_api_client_interface import IMovieGateway
 
 env = Env(required=["MOVIE_API_KEY"])
 
+POSTER_BASE_URL = "https://image.tmdb.org/t/p/w600_and_h900_bestv2"
+PARSE_CONTEXT = {"poster_base_url": POSTER_BASE_URL}
 
-class MoviesApiClient(IMovieGateway):
-    def __init__(self, base_url: str):
-        self.base_url = base_url
+
+class MoviePage(BaseModel):
+    results: List[Movie]
+
+
+MOVIE_ADAPTER = TypeAdapter(Movie)
+
+
+class MoviesApiClient(BaseApiClient, IMovieGateway):
+    def __init__(
+        self,
+        base_url: str,
+        client: httpx.AsyncClient,
+        http_cache: Optional[SqliteHttpCache] = None,
+    ):
+        super().__init__(base_url, client=client, http_cache=http_cache)
         self.headers = {
             "Authorization": f"Bearer {env.get('MOVIE_API_KEY')}",
             "Accept": "application/json",
         }
 
-    def _process_movies(self, raw_data: dict) -> List[Movie]:
-        results = []
-        for movie_data in raw_data["results"]:
-            if "poster_path" in movie_data:
-                movie_data["poster_path"] = (
-                    f"https://image.tmdb.org/t/p/w600_and_h900_bestv2{movie_data['poster_path']}"
-                )
-            results.append(Movie.model_validate(movie_data))
-        return results
+    def _process_movie(self, body: bytes) -> Movie:
+        return MOVIE_ADAPTER.validate_json(body, context=PARSE_CONTEXT)
+
+    def _process_movies(self, body: bytes) -> List[Movie]:
+        return MoviePage.model_validate_json(body, context=PARSE_CONTEXT).results
 
     async def find_all(self, query: str) -> Optional[List[Movie]]:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/search/movie",
-                headers=self.headers,
-                params={"query": query},
-            )
-            response.raise_for_status()
-            return self._process_movies(response.json())
+        return await self.single_flight.do(
+            ("search", query), lambda: self._find_all(query)
+        )
 
     async def popular(self) -> Optional[List[Movie]]:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/movie/popular", headers=self.headers
-            )
-            response.raise_for_status()
-            return self._process_movies(response.json())
+        return await self.single_flight.do(("popular",), self._popular)
 
     async def get(self, id: int) -> Movie:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/movie/{id}", headers=self.headers
-            )
-            response.raise_for_status()
-            movie_data = response.json()
-
-            if "poster_path" in movie_data:
-                movie_data["poster_path"] = (
-                    f"https://image.tmdb.org/t/p/w600_and_h900_bestv2{movie_data['poster_path']}"
-                )
-
-            return Movie.model_validate(movie_data)
+        return await self.single_flight.do(("movie", id), lambda: self._get(id))
+
+    async def _find_all(self, query: str) -> Optional[List[Movie]]:
+        return await self._fetch(
+            "/search/movie",
+            self._process_movies,
+            headers=self.headers,
+            params={"query": query},
+        )
+
+    async def _popular(self) -> Optional[List[Movie]]:
+        return await self._fetch(
+            "/movie/popular", self._process_movies, headers=self.headers
+        )
+
+    async def _get(self, id: int) -> Movie:
+        return await self._fetch(
+            f"/movie/{id}", self._process_movie, headers=self.headers
+        )
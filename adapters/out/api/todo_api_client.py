@@ -1,25 +1,24 @@
 from typing import List
 
-import httpx
+from pydantic import TypeAdapter
 
+from adapters.out.api.base_api_client import BaseApiClient
 from domain.todo import ToDo
 from domain.todo_api_client_interface import ITodoGateway
 
+TODO_ADAPTER = TypeAdapter(ToDo)
+TODO_LIST_ADAPTER = TypeAdapter(List[ToDo])
 
-class TodoApiClient(ITodoGateway):
-    def __init__(self, base_url: str):
-        self.base_url = base_url
 
+class TodoApiClient(BaseApiClient, ITodoGateway):
     async def find_all(self) -> List[ToDo]:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{self.base_url}/todos")
-            response.raise_for_status()
-            todos_data = response.json()
-            return [ToDo.model_validate(todo) for todo in todos_data]
+        return await self.single_flight.do(("todos",), self._find_all)
 
     async def get(self, id: int) -> ToDo:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{self.base_url}/todos/{id}")
-            response.raise_for_status()
-            todo_data = response.json()
-            return ToDo.model_validate(todo_data)
+        return await self.single_flight.do(("todo", id), lambda: self._get(id))
+
+    async def _find_all(self) -> List[ToDo]:
+        return await self._fetch("/todos", TODO_LIST_ADAPTER.validate_json)
+
+    async def _get(self, id: int) -> ToDo:
+        return await self._fetch(f"/todos/{id}", TODO_ADAPTER.validate_json)
@@ -1,48 +1,255 @@
-from typing import Any, Generic, List, Type, TypeVar
+import base64
+import binascii
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+)
 
+from sqlalchemy import Column, RowMapping, Select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import SQLModel, select
+from sqlmodel import SQLModel, delete, insert, select, update
+
+from infrastructure.database.write_batcher import WriteBatcher
 
 T = TypeVar("T", bound=SQLModel)
+R = TypeVar("R")
+
+# Mantém cada IN (...) bem abaixo do limite de variáveis do SQLite
+CHUNK_SIZE = 500
+
+
+def encode_cursor(key: str) -> str:
+    return base64.urlsafe_b64encode(key.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> str:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return base64.b64decode(padded, altchars=b"-_", validate=True).decode()
+    except (binascii.Error, UnicodeDecodeError):
+        raise ValueError("Cursor inválido") from None
+
+
+def chunked(items: List[Any], size: int = CHUNK_SIZE) -> Iterator[List[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
 
 
 class BaseRepository(Generic[T]):
-    def __init__(self, session: AsyncSession, model: Type[T]):
+    def __init__(
+        self,
+        session: AsyncSession,
+        model: Type[T],
+        write_batcher: Optional[WriteBatcher] = None,
+        read_session: Optional[AsyncSession] = None,
+    ):
         self.session = session
+        # ✅ Leituras vão para o pool somente leitura, se houver
+        self.read_session = read_session or session
         self.model = model
+        self.write_batcher = write_batcher
 
     async def get(self, id: str) -> T | None:
-        return await self.session.get(self.model, id)
+        # Pelo id público: a chave primária da tabela pode ser outra coluna
+        statement = select(self.model).where(self.model.id == id)
+        result = await self.read_session.execute(statement)
+        return result.scalars().first()
+
+    async def find_all_rows(self, columns: Sequence[str]) -> Sequence[RowMapping]:
+        """Lista a tabela só com as colunas pedidas, sem instanciar o modelo.
+
+        As linhas não passam pelo identity map da sessão: servem para leitura.
+        """
+        result = await self.read_session.execute(self._project(columns))
+        return result.mappings().all()
+
+    async def stream_rows(
+        self, columns: Sequence[str], chunk_size: int = CHUNK_SIZE
+    ) -> AsyncIterator[Sequence[RowMapping]]:
+        """Percorre a tabela com cursor no servidor, `chunk_size` linhas por vez."""
+        statement = (
+            self._project(columns)
+            .order_by(self.model.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        result = await self.read_session.stream(statement)
+        async for partition in result.mappings().partitions():
+            yield partition
+
+    async def find_page_rows(
+        self, columns: Sequence[str], limit: int, cursor: Optional[str] = None
+    ) -> Tuple[Sequence[RowMapping], Optional[str]]:
+        """Paginação por chave (keyset) ordenada pelo id.
+
+        O cursor é opaco para o cliente e aponta para o último id entregue, então
+        cada página custa o mesmo independentemente da posição na tabela.
+        """
+        statement = self._project(columns)
+        result = await self.read_session.execute(
+            self._paginate(statement, limit, cursor)
+        )
+        return self._page(result.mappings().all(), limit, lambda row: row["id"])
+
+    def _project(self, columns: Sequence[str]) -> Select:
+        # ✅ SELECT só das colunas: linhas simples, sem hidratar objetos ORM
+        return select(*(getattr(self.model, column) for column in columns))
+
+    def _paginate(self, statement: Select, limit: int, cursor: Optional[str]) -> Select:
+        statement = statement.order_by(self.model.id).limit(limit + 1)
+        if cursor is not None:
+            statement = statement.where(self.model.id > decode_cursor(cursor))
+        return statement
 
-    async def find_all(self) -> List[T]:
-        statement = select(self.model)
-        result = await self.session.execute(statement)
-        return result.scalars().all()
+    @staticmethod
+    def _page(
+        rows: Sequence[R], limit: int, key: Callable[[R], str]
+    ) -> Tuple[Sequence[R], Optional[str]]:
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        return rows, encode_cursor(key(rows[-1]))
 
     async def save(self, entity: T) -> T:
+        if self.write_batcher is not None:
+            return await self.write_batcher.submit(
+                lambda session: self._add(session, entity)
+            )
         self.session.add(entity)
         await self.session.commit()
         await self.session.refresh(entity)
         return entity
 
     async def delete(self, id: str) -> bool:
-        obj = await self.session.get(self.model, id)
-        if obj:
-            await self.session.delete(obj)
+        return await self._write(lambda session: self._delete(session, id))
+
+    async def update(self, id: str, data: dict[str, Any]) -> Optional[T]:
+        values = self._writable(data)
+        if not values:
+            return await self.get(id)
+
+        return await self._write(lambda session: self._update(session, id, values))
+
+    async def _write(self, operation: Callable[[AsyncSession], Awaitable[R]]) -> R:
+        """Executa a escrita no group commit, se houver, ou na sessão atual."""
+        if self.write_batcher is not None:
+            return await self.write_batcher.submit(operation)
+        result = await operation(self.session)
+        await self.session.commit()
+        return result
+
+    async def _add(self, session: AsyncSession, entity: T) -> T:
+        session.add(entity)
+        await session.flush()
+        # Como no caminho direto: devolve o que o banco gravou (defaults, triggers)
+        await session.refresh(entity)
+        return entity
+
+    async def _delete(self, session: AsyncSession, id: str) -> bool:
+        # ✅ DELETE ... RETURNING: uma ida ao banco, sem carregar o objeto
+        statement = (
+            delete(self.model).where(self.model.id == id).returning(self.model.id)
+        )
+        result = await session.execute(statement)
+        return result.scalar_one_or_none() is not None
+
+    async def _update(
+        self, session: AsyncSession, id: str, values: dict[str, Any]
+    ) -> Optional[T]:
+        # ✅ UPDATE ... RETURNING: devolve a linha atualizada (ou nada se não existe)
+        statement = (
+            update(self.model)
+            .where(self.model.id == id)
+            .values(**values)
+            .returning(self.model)
+            .execution_options(synchronize_session=False)
+        )
+        result = await session.execute(statement)
+        return result.scalar_one_or_none()
+
+    async def save_many(self, entities: List[T]) -> List[T]:
+        """Insere tudo numa única transação com um INSERT em lote (executemany)."""
+        await self.insert_many([entity.model_dump() for entity in entities])
+        return entities
+
+    async def insert_many(self, rows: List[dict[str, Any]]) -> None:
+        """Como `save_many`, mas a partir de dicts, sem instanciar o modelo ORM."""
+        if rows:
+            await self.session.execute(insert(self.model), rows)
             await self.session.commit()
-            return True
-        return False
 
-    async def update(self, id: str, data: dict[str, Any]) -> T:
-        obj = await self.session.get(self.model, id)
+    async def update_many(
+        self, changes: Dict[str, dict[str, Any]]
+    ) -> Dict[str, Optional[T]]:
+        """Atualiza vários registros por id; ids inexistentes resultam em None."""
+        primary_keys = await self._primary_keys(list(changes))
+        primary_key = self._primary_key().key
+        rows = [
+            {**self._writable(data), primary_key: primary_keys[id]}
+            for id, data in changes.items()
+            if id in primary_keys
+        ]
+        rows = [row for row in rows if len(row) > 1]
+        if rows:
+            # ✅ UPDATE em lote por chave primária (executemany)
+            await self.session.execute(update(self.model), rows)
+        await self.session.commit()
 
-        for key, value in data.items():
-            if key == "id":
-                continue
-            if hasattr(obj, key):
-                setattr(obj, key, value)
+        updated: Dict[str, T] = {}
+        for ids in chunked(list(primary_keys)):
+            result = await self.session.execute(
+                select(self.model)
+                .where(self.model.id.in_(ids))
+                .execution_options(populate_existing=True)
+            )
+            updated.update((obj.id, obj) for obj in result.scalars())
+        return {id: updated.get(id) for id in changes}
 
-        self.session.add(obj)
+    async def delete_many(self, ids: List[str]) -> Set[str]:
+        """Remove vários registros; devolve os ids efetivamente removidos."""
+        deleted: Set[str] = set()
+        for chunk in chunked(ids):
+            result = await self.session.execute(
+                delete(self.model)
+                .where(self.model.id.in_(chunk))
+                .returning(self.model.id)
+            )
+            deleted.update(result.scalars())
         await self.session.commit()
-        await self.session.refresh(obj)
-        return obj
+        return deleted
+
+    def _writable(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Campos do modelo que a escrita pode alterar (nunca o id nem a chave)."""
+        keys = {"id", self._primary_key().key}
+        return {
+            key: value
+            for key, value in data.items()
+            if key not in keys and key in self.model.model_fields
+        }
+
+    def _primary_key(self) -> Column:
+        (column,) = self.model.__table__.primary_key.columns
+        return column
+
+    async def _primary_keys(self, ids: List[str]) -> Dict[str, Any]:
+        """Chave primária de cada id existente: o UPDATE em lote é feito por ela."""
+        primary_keys: Dict[str, Any] = {}
+        for chunk in chunked(ids):
+            result = await self.session.execute(
+                select(self.model.id, self._primary_key()).where(
+                    self.model.id.in_(chunk)
+                )
+            )
+            primary_keys.update(result.all())
+        return primary_keys
@@ -4,7 +4,14 @@ from typing import Optional
 from sqlmodel import Field, SQLModel
 
 
+def new_id() -> str:
+    return str(uuid.uuid4())
+
+
 class UserDB(SQLModel, table=True):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
+    # ✅ Mesmo schema das migrações: `seq` é o alias estável do rowid, para o
+    # qual o índice FTS5 aponta; o id público é único
+    seq: Optional[int] = Field(default=None, primary_key=True)
+    id: str = Field(default_factory=new_id, unique=True)
     name: str
-    email: Optional[str] = None
+    email: Optional[str] = Field(default=None, index=True)
@@ -1,32 +1,165 @@
-from typing import Any, List, Optional
+import re
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
 
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlmodel import select
 
 from adapters.out.database.base_repository import BaseRepository
-from adapters.out.database.models import UserDB
-from domain.user import User
+from adapters.out.database.models import UserDB, new_id
+from domain.user import DuplicateEmailError, User
 from domain.user_repository_interface import IUserRepository
+from infrastructure.database.migrations import CHANGE_LOG_SIZE
+from infrastructure.database.session import read_session_ctx_var, session_scope
+from infrastructure.database.write_batcher import WriteBatcher
+
+SEARCH_SQL = text(
+    "SELECT userdb.seq, userdb.id, userdb.name, userdb.email FROM userdb_fts "
+    "JOIN userdb ON userdb.seq = userdb_fts.rowid WHERE userdb_fts MATCH :match "
+    "ORDER BY rank LIMIT :limit OFFSET :offset"
+)
+
+LAST_CHANGE_SQL = text("SELECT MAX(version) FROM userdb_changes")
+CHANGED_IDS_SQL = text(
+    "SELECT DISTINCT id FROM userdb_changes "
+    "WHERE version > :since AND version <= :current"
+)
+
+# Colunas lidas nas listagens: só o que o modelo de domínio expõe
+USER_COLUMNS = tuple(User.model_fields)
+
+
+def fts_prefix_query(query: str) -> str:
+    """Converte texto livre em consulta FTS5: todos os termos, por prefixo."""
+    return " ".join(f'"{term}"*' for term in re.findall(r"\w+", query))
 
 
 class UserRepository(BaseRepository[UserDB], IUserRepository):
-    def __init__(self, session: AsyncSession):
-        super().__init__(session, UserDB)
+    def __init__(
+        self,
+        session: AsyncSession,
+        write_batcher: Optional[WriteBatcher] = None,
+        read_session: Optional[AsyncSession] = None,
+    ):
+        super().__init__(
+            session, UserDB, write_batcher=write_batcher, read_session=read_session
+        )
 
     async def get(self, id: str) -> User | None:
         user_db = await super().get(id)
         return User.model_validate(user_db) if user_db else None
 
+    async def get_by_email(self, email: str) -> User | None:
+        # ✅ Usa o índice ix_userdb_email
+        statement = select(UserDB).where(UserDB.email == email).limit(1)
+        result = await self.read_session.execute(statement)
+        user_db = result.scalars().first()
+        return User.model_validate(user_db) if user_db else None
+
+    async def search(self, query: str, limit: int, offset: int = 0) -> List[User]:
+        match = fts_prefix_query(query)
+        if not match:
+            return []
+        statement = select(UserDB).from_statement(SEARCH_SQL)
+        result = await self.read_session.execute(
+            statement, {"match": match, "limit": limit, "offset": offset}
+        )
+        return [User.model_validate(u) for u in result.scalars()]
+
+    async def changes_since(
+        self, version: Optional[int]
+    ) -> Tuple[int, Optional[Set[str]]]:
+        """Versão atual do log de UPDATE/DELETE e ids alterados desde `version`.
+
+        Devolve None no lugar dos ids quando o log já foi podado além de
+        `version` (ou o banco foi trocado).
+        """
+        current = await self.read_session.scalar(LAST_CHANGE_SQL) or 0
+        if version is None or version == current:
+            return current, set()
+        if version > current or current - version > CHANGE_LOG_SIZE:
+            return current, None
+        result = await self.read_session.scalars(
+            CHANGED_IDS_SQL, {"since": version, "current": current}
+        )
+        return current, set(result)
+
     async def find_all(self) -> List[User]:
-        users_db = await super().find_all()
-        return [User.model_validate(u) for u in users_db]
+        # ✅ Projeção: evita hidratar UserDB e revalidar cada objeto
+        rows = await super().find_all_rows(USER_COLUMNS)
+        return [User(**row) for row in rows]
+
+    async def stream(self, chunk_size: int = 500) -> AsyncIterator[List[User]]:
+        async for rows in super().stream_rows(USER_COLUMNS, chunk_size):
+            yield [User(**row) for row in rows]
+
+    async def find_page(
+        self, limit: int, cursor: Optional[str] = None
+    ) -> Tuple[List[User], Optional[str]]:
+        rows, next_cursor = await super().find_page_rows(USER_COLUMNS, limit, cursor)
+        return [User(**row) for row in rows], next_cursor
 
     async def save(self, user: User) -> User:
         user_db = UserDB(**user.model_dump())
-        saved = await super().save(user_db)
+        async with self._unique_email(batched=self.write_batcher is not None):
+            saved = await super().save(user_db)
         return User.model_validate(saved)
 
     async def delete(self, id: str) -> bool:
         return await super().delete(id)
 
     async def update(self, id: str, data: dict[str, Any]) -> Optional[User]:
-        return await super().update(id, data)
+        async with self._unique_email(batched=self.write_batcher is not None):
+            user_db = await super().update(id, data)
+        return User.model_validate(user_db) if user_db else None
+
+    async def save_many(self, users: List[User]) -> List[User]:
+        # ✅ Sem construir UserDB por linha: o custo do SQLModel domina o INSERT
+        rows = [{**user.model_dump(), "id": user.id or new_id()} for user in users]
+        async with self._unique_email():
+            await super().insert_many(rows)
+        return [User.model_validate(row) for row in rows]
+
+    async def update_many(
+        self, changes: Dict[str, dict[str, Any]]
+    ) -> Dict[str, Optional[User]]:
+        async with self._unique_email():
+            updated = await super().update_many(changes)
+        return {
+            id: User.model_validate(user_db) if user_db else None
+            for id, user_db in updated.items()
+        }
+
+    async def delete_many(self, ids: List[str]) -> Set[str]:
+        return await super().delete_many(ids)
+
+    @asynccontextmanager
+    async def _unique_email(self, batched: bool = False) -> AsyncIterator[None]:
+        """Traduz a violação do índice único de e-mail para o domínio.
+
+        `batched` indica que a escrita rodou no group commit, cuja sessão é
+        do batcher; caso contrário a sessão atual precisa do rollback.
+        """
+        try:
+            yield
+        except IntegrityError as exc:
+            if "userdb.email" not in str(exc.orig):
+                raise
+            if not batched:
+                await self.session.rollback()
+            raise DuplicateEmailError() from exc
+
+
+@asynccontextmanager
+async def isolated_user_repository(
+    read_session_factory: async_sessionmaker[AsyncSession],
+) -> AsyncIterator[UserRepository]:
+    """Repositório de leitura com sessão própria, fora da requisição atual.
+
+    Usado pelas cargas do cache, que o single-flight compartilha entre
+    requisições: não podem depender da sessão de quem chegou primeiro.
+    """
+    async with session_scope(read_session_factory, read_session_ctx_var) as session:
+        yield UserRepository(session, read_session=session)
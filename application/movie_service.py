@@ -1,24 +1,81 @@
-from typing import List, Optional
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
 
-from domain.movie import Movie
+from domain.cache_interface import IReadThroughCache
+from domain.movie import Movie, MovieBatch
 from domain.movie_api_client_interface import IMovieGateway
 from infrastructure.logger.logger import Logger
 
+DEFAULT_BATCH_CONCURRENCY = 10
+
+
+def batch_semaphore(concurrency: Optional[int]) -> asyncio.Semaphore:
+    """Limite de buscas simultâneas no upstream, compartilhado entre requisições."""
+    return asyncio.Semaphore(concurrency or DEFAULT_BATCH_CONCURRENCY)
+
 
 class MovieService:
     def __init__(
         self,
         gateway: IMovieGateway,
         logger: Logger,
+        cache: Optional[IReadThroughCache] = None,
+        batch_concurrency: Optional[int] = DEFAULT_BATCH_CONCURRENCY,
+        semaphore: Optional[asyncio.Semaphore] = None,
     ):
         self.gateway = gateway
         self.logger = logger
+        self.cache = cache
+        # ✅ O Container injeta um semáforo Singleton; o limite vale para o processo
+        self.semaphore = semaphore or batch_semaphore(batch_concurrency)
 
     async def find_all(self, query: str) -> List[Movie]:
         return await self.gateway.find_all(query)
 
     async def popular(self) -> List[Movie]:
-        return await self.gateway.popular()
+        return await self._cached("movies:popular", self.gateway.popular)
 
     async def get(self, id: str) -> Optional[Movie]:
-        return await self.gateway.get(id)
+        return await self._cached(f"movies:{id}", lambda: self.gateway.get(id))
+
+    async def get_many(self, ids: List[int]) -> MovieBatch:
+        """Busca vários filmes; só as buscas no upstream disputam o semáforo."""
+
+        async def load(id: int) -> Optional[Movie]:
+            async with self.semaphore:
+                return await self.gateway.get(id)
+
+        unique_ids = list(dict.fromkeys(ids))
+        results = await asyncio.gather(
+            *(
+                self._cached(f"movies:{id}", lambda id=id: load(id))
+                for id in unique_ids
+            ),
+            return_exceptions=True,
+        )
+
+        movies: List[Movie] = []
+        errors: Dict[int, str] = {}
+        for id, result in zip(unique_ids, results):
+            # gather(return_exceptions=True) também devolve CancelledError
+            if isinstance(result, BaseException):
+                self.logger.warning(f"Falha ao buscar filme {id}: {result!r}")
+                errors[id] = self._describe_error(result)
+            elif result is None:
+                errors[id] = "Movie Not Found"
+            else:
+                movies.append(result)
+        return MovieBatch(movies=movies, errors=errors)
+
+    def _describe_error(self, exc: BaseException) -> str:
+        status_code = getattr(getattr(exc, "response", None), "status_code", None)
+        if status_code == 404:
+            return "Movie Not Found"
+        if status_code is not None:
+            return f"Upstream error ({status_code})"
+        return "Upstream unavailable"
+
+    async def _cached(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        if self.cache is None:
+            return await loader()
+        return await self.cache.get_or_load(key, loader)
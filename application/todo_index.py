@@ -0,0 +1,68 @@
+import time
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from domain.todo import ToDo
+from infrastructure.single_flight import SingleFlight
+
+
+class TodoSnapshot:
+    """Cópia local dos todos, indexada por id, userId e completed."""
+
+    def __init__(self, todos: List[ToDo], loaded_at: float = 0.0):
+        self.todos = todos
+        self.loaded_at = loaded_at
+        self.by_id: Dict[int, ToDo] = {}
+        self.by_user: Dict[int, List[ToDo]] = defaultdict(list)
+        self.by_completed: Dict[bool, List[ToDo]] = {True: [], False: []}
+        for todo in todos:
+            self.by_id[todo.id] = todo
+            self.by_user[todo.userId].append(todo)
+            self.by_completed[todo.completed].append(todo)
+
+    def get(self, id: int) -> Optional[ToDo]:
+        return self.by_id.get(id)
+
+    def find(
+        self, user_id: Optional[int] = None, completed: Optional[bool] = None
+    ) -> List[ToDo]:
+        if user_id is None and completed is None:
+            return self.todos
+        if user_id is None:
+            return self.by_completed[completed]
+        todos = self.by_user.get(user_id, [])
+        if completed is None:
+            return todos
+        return [todo for todo in todos if todo.completed == completed]
+
+
+class TodoIndex:
+    """Mantém um `TodoSnapshot` e o recarrega quando passa de `max_age`."""
+
+    def __init__(
+        self,
+        max_age: Optional[float] = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_age = 60.0 if max_age is None else max_age
+        self.clock = clock
+        self.current: Optional[TodoSnapshot] = None
+        self.single_flight = SingleFlight()
+
+    async def snapshot(
+        self, loader: Callable[[], Awaitable[List[ToDo]]]
+    ) -> TodoSnapshot:
+        current = self.current
+        if current is not None and self.clock() - current.loaded_at < self.max_age:
+            return current
+        return await self.single_flight.do("snapshot", lambda: self.refresh(loader))
+
+    async def refresh(
+        self, loader: Callable[[], Awaitable[List[ToDo]]]
+    ) -> TodoSnapshot:
+        todos = await loader()
+        if self.current is not None and self.current.todos is todos:
+            self.current.loaded_at = self.clock()
+        else:
+            self.current = TodoSnapshot(todos, loaded_at=self.clock())
+        return self.current
@@ -1,5 +1,7 @@
 from typing import List, Optional
 
+from application.todo_index import TodoIndex, TodoSnapshot
+from domain.cache_interface import IReadThroughCache
 from domain.todo import ToDo
 from domain.todo_api_client_interface import ITodoGateway
 from infrastructure.logger.logger import Logger
@@ -10,12 +12,32 @@ class TodoService:
         self,
         gateway: ITodoGateway,
         logger: Logger,
+        cache: Optional[IReadThroughCache] = None,
+        index: Optional[TodoIndex] = None,
     ):
         self.gateway = gateway
         self.logger = logger
+        self.cache = cache
+        self.index = index
 
     async def find_all(self) -> List[ToDo]:
-        return await self.gateway.find_all()
+        if self.cache is None:
+            return await self.gateway.find_all()
+        return await self.cache.get_or_load("todos:all", self.gateway.find_all)
 
-    async def get(self, id: str) -> Optional[ToDo]:
-        return await self.gateway.get(id)
+    async def find_by(
+        self, user_id: Optional[int] = None, completed: Optional[bool] = None
+    ) -> List[ToDo]:
+        snapshot = await self._snapshot()
+        return snapshot.find(user_id=user_id, completed=completed)
+
+    async def get(self, id: int) -> Optional[ToDo]:
+        if self.index is None:
+            return await self.gateway.get(id)
+        snapshot = await self.index.snapshot(self.find_all)
+        return snapshot.get(id)
+
+    async def _snapshot(self) -> TodoSnapshot:
+        if self.index is None:
+            return TodoSnapshot(await self.find_all())
+        return await self.index.snapshot(self.find_all)
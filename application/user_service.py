@@ -1,9 +1,27 @@
-from typing import Any, List, Optional
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
 
-from domain.user import User
+from domain.cache_interface import IReadThroughCache
+from domain.user import (
+    User,
+    UserBatchResult,
+    UserImportError,
+    UserImportReport,
+)
 from domain.user_repository_interface import IUserRepository
+from infrastructure.cache.change_tracker import ChangeTracker
 from infrastructure.logger.logger import Logger  # ok importar isso
 
+MAX_REPORTED_ERRORS = 100
+
 
 class UserService:
     """Serviço de Usuário desacoplado de repositórios específicos"""
@@ -12,9 +30,18 @@ class UserService:
         self,
         user_repository: IUserRepository,
         logger: Logger,
+        cache: Optional[IReadThroughCache] = None,
+        change_tracker: Optional[ChangeTracker] = None,
+        loader_repository: Optional[
+            Callable[[], AsyncContextManager[IUserRepository]]
+        ] = None,
     ):
         self.user_repository = user_repository
         self.logger = logger
+        self.cache = cache
+        self.change_tracker = change_tracker
+        # ✅ Cargas do cache abrem a própria sessão (ver `_load`)
+        self.loader_repository = loader_repository
 
     async def save(self, user: User) -> User:
         self.logger.info(f"Salvando usuário: {user}")
@@ -24,13 +51,111 @@ class UserService:
         self.logger.info("Buscando todos os usuários")
         return await self.user_repository.find_all()
 
+    async def export(self, chunk_size: int = 500) -> AsyncIterator[List[User]]:
+        self.logger.info("Exportando usuários")
+        async for users in self.user_repository.stream(chunk_size):
+            yield users
+
+    async def find_page(
+        self, limit: int, cursor: Optional[str] = None
+    ) -> Tuple[List[User], Optional[str]]:
+        self.logger.info(f"Buscando página de usuários (limit={limit})")
+        return await self.user_repository.find_page(limit, cursor)
+
     async def delete(self, id: str) -> bool:
         self.logger.warning(f"Deletando usuário com ID: {id}")
-        return await self.user_repository.delete(id)
+        deleted = await self.user_repository.delete(id)
+        self._invalidate(id)
+        return deleted
 
     async def get(self, id: str) -> Optional[User]:
         self.logger.debug(f"Buscando usuário com ID: {id}")
-        return await self.user_repository.get(id)
+        if self.cache is None:
+            return await self.user_repository.get(id)
+        await self._sync_cache()
+        return await self.cache.get_or_load(f"users:{id}", lambda: self._load(id))
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        self.logger.debug(f"Buscando usuário com e-mail: {email}")
+        return await self.user_repository.get_by_email(email)
+
+    async def search(self, query: str, limit: int, offset: int = 0) -> List[User]:
+        self.logger.debug(f"Buscando usuários por: {query}")
+        return await self.user_repository.search(query, limit, offset)
 
     async def update(self, user_id: str, user_data: dict[str, Any]) -> User | None:
-        return await self.user_repository.update(user_id, user_data)
+        updated = await self.user_repository.update(user_id, user_data)
+        self._invalidate(user_id)
+        return updated
+
+    async def save_many(self, users: List[User]) -> List[UserBatchResult]:
+        self.logger.info(f"Salvando {len(users)} usuários em lote")
+        saved = await self.user_repository.save_many(users)
+        return [UserBatchResult(id=user.id, status=201, user=user) for user in saved]
+
+    async def update_many(
+        self, changes: Dict[str, dict[str, Any]]
+    ) -> List[UserBatchResult]:
+        self.logger.info(f"Atualizando {len(changes)} usuários em lote")
+        updated = await self.user_repository.update_many(changes)
+        self._invalidate(*changes)
+        return [
+            UserBatchResult(id=id, status=200, user=user)
+            if user
+            else UserBatchResult(id=id, status=404, detail="Usuário não encontrado")
+            for id, user in updated.items()
+        ]
+
+    async def delete_many(self, ids: List[str]) -> List[UserBatchResult]:
+        self.logger.warning(f"Deletando {len(ids)} usuários em lote")
+        deleted = await self.user_repository.delete_many(ids)
+        self._invalidate(*deleted)
+        return [
+            UserBatchResult(id=id, status=204)
+            if id in deleted
+            else UserBatchResult(id=id, status=404, detail="Usuário não encontrado")
+            for id in dict.fromkeys(ids)
+        ]
+
+    async def import_users(
+        self, batches: AsyncIterator[Tuple[List[User], List[UserImportError]]]
+    ) -> UserImportReport:
+        """Grava cada lote válido na sua própria transação e acumula os erros."""
+        report = UserImportReport()
+        async for users, errors in batches:
+            for user in users:
+                user.id = None
+            if users:
+                await self.user_repository.save_many(users)
+            report.imported += len(users)
+            report.failed += len(errors)
+            room = MAX_REPORTED_ERRORS - len(report.errors)
+            report.errors.extend(errors[:room])
+            self.logger.info(
+                f"Importação: {report.imported} usuários gravados, "
+                f"{report.failed} linhas rejeitadas"
+            )
+        return report
+
+    def _invalidate(self, *ids: str) -> None:
+        if self.cache is not None:
+            for id in ids:
+                self.cache.invalidate(f"users:{id}")
+
+    async def _load(self, id: str) -> Optional[User]:
+        """Carga compartilhada entre requisições pelo single-flight do cache."""
+        if self.loader_repository is None:
+            return await self.user_repository.get(id)
+        async with self.loader_repository() as repository:
+            return await repository.get(id)
+
+    async def _sync_cache(self) -> None:
+        """Descarta do cache local os usuários alterados por outros processos."""
+        if self.change_tracker is None:
+            return
+        changed = await self.change_tracker.changes(self.user_repository.changes_since)
+        if changed is None:
+            self.logger.debug("Log de alterações defasado; limpando cache de usuários")
+            self.cache.clear()
+        else:
+            self._invalidate(*changed)
@@ -0,0 +1,28 @@
+from typing import Any, Awaitable, Callable, Hashable, Optional, Protocol
+
+
+class ICache(Protocol):
+    """Interface para caches de respostas usados pelos serviços"""
+
+    def get(self, key: Hashable) -> Optional[Any]: ...
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None: ...
+
+    def delete(self, key: Hashable) -> None: ...
+
+    def clear(self) -> None: ...
+
+
+class IReadThroughCache(Protocol):
+    """Interface para caches que carregam o valor sob demanda"""
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None,
+    ) -> Any: ...
+
+    def invalidate(self, key: Hashable) -> None: ...
+
+    def clear(self) -> None: ...
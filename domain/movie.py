@@ -1,4 +1,6 @@
-from pydantic import BaseModel
+from typing import Any, Dict, List
+
+from pydantic import BaseModel, ValidationInfo, field_validator
 
 
 class Movie(BaseModel):
@@ -9,3 +11,14 @@ class Movie(BaseModel):
     overview: str
 
     model_config = {"from_attributes": True}
+
+    @field_validator("poster_path", mode="before")
+    @classmethod
+    def prefix_poster_path(cls, value: Any, info: ValidationInfo) -> Any:
+        base_url = (info.context or {}).get("poster_base_url")
+        return f"{base_url}{value}" if base_url else value
+
+
+class MovieBatch(BaseModel):
+    movies: List[Movie]
+    errors: Dict[int, str]
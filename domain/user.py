@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel
 
@@ -9,3 +9,30 @@ class User(BaseModel):
     email: Optional[str] = None
 
     model_config = {"from_attributes": True}
+
+
+class DuplicateEmailError(ValueError):
+    """E-mail já usado por outro usuário (com USER_EMAIL_UNIQUE ativo)."""
+
+    def __init__(self):
+        super().__init__("E-mail já cadastrado")
+
+
+class UserBatchResult(BaseModel):
+    """Resultado por item de uma operação em lote."""
+
+    id: str
+    status: int
+    user: Optional[User] = None
+    detail: Optional[str] = None
+
+
+class UserImportError(BaseModel):
+    line: int
+    detail: str
+
+
+class UserImportReport(BaseModel):
+    imported: int = 0
+    failed: int = 0
+    errors: List[UserImportError] = []
@@ -1,4 +1,13 @@
-from typing import List, Optional, Protocol
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    List,
+    Optional,
+    Protocol,
+    Set,
+    Tuple,
+)
 
 from domain.user import User
 
@@ -10,6 +19,28 @@ class IUserRepository(Protocol):
 
     def find_all(self) -> List[User]: ...
 
+    def stream(self, chunk_size: int = 500) -> AsyncIterator[List[User]]: ...
+
+    def find_page(
+        self, limit: int, cursor: Optional[str] = None
+    ) -> Tuple[List[User], Optional[str]]: ...
+
     def delete(self, id: str) -> bool: ...
 
     def get(self, id: str) -> Optional[User]: ...
+
+    def get_by_email(self, email: str) -> Optional[User]: ...
+
+    def changes_since(
+        self, version: Optional[int]
+    ) -> Tuple[int, Optional[Set[str]]]: ...
+
+    def search(self, query: str, limit: int, offset: int = 0) -> List[User]: ...
+
+    def save_many(self, users: List[User]) -> List[User]: ...
+
+    def update_many(
+        self, changes: Dict[str, dict[str, Any]]
+    ) -> Dict[str, Optional[User]]: ...
+
+    def delete_many(self, ids: List[str]) -> Set[str]: ...
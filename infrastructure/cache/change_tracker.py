@@ -0,0 +1,35 @@
+import time
+from typing import Awaitable, Callable, Hashable, Optional, Set, Tuple
+
+# Versão atual do log e chaves alteradas desde a versão pedida (None quando o
+# log já não cobre o intervalo)
+LoadChanges = Callable[[Optional[int]], Awaitable[Tuple[int, Optional[Set[Hashable]]]]]
+
+
+class ChangeTracker:
+    """Detecta escritas feitas por outros processos a partir de um log de alterações.
+
+    O log (ex.: uma tabela alimentada por trigger no SQLite) é consultado no
+    máximo a cada `interval` segundos; esse é o atraso máximo com que uma
+    escrita de outro worker chega ao cache local.
+    """
+
+    def __init__(
+        self,
+        interval: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.interval = interval if interval is not None else 1.0
+        self.clock = clock
+        self.version: Optional[int] = None
+        self.checked_at: Optional[float] = None
+
+    async def changes(self, load_changes: LoadChanges) -> Optional[Set[Hashable]]:
+        """Chaves alteradas desde a última consulta; None se não há como saber."""
+        now = self.clock()
+        if self.checked_at is not None and now - self.checked_at < self.interval:
+            return set()
+        self.checked_at = now
+        since = self.version
+        self.version, changed = await load_changes(since)
+        return set() if since is None else changed
@@ -0,0 +1,137 @@
+import pickle
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from domain.cache_interface import ICache
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    stale_hits: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def snapshot(self) -> Dict[str, float]:
+        return {**asdict(self), "hit_ratio": self.hit_ratio}
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    expires_at: Optional[float]
+    size: int
+
+    def is_fresh(self, now: float) -> bool:
+        return self.expires_at is None or now < self.expires_at
+
+
+def pickle_size(value: Any) -> int:
+    return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+class MemoryCache(ICache):
+    """Cache LRU em memória com TTL por chave e limites de entradas/bytes.
+
+    `max_entries`, `max_bytes` e `default_ttl` iguais a None desativam o
+    respectivo limite. O tamanho só é calculado quando `max_bytes` é usado.
+    Entradas expiradas continuam disponíveis via `get_entry` por até
+    `max_stale` segundos (limite rígido de obsolescência).
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = 1024,
+        max_bytes: Optional[int] = None,
+        default_ttl: Optional[float] = 300.0,
+        max_stale: float = 0.0,
+        sizeof: Callable[[Any], int] = pickle_size,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.max_stale = max_stale or 0.0
+        self.sizeof = sizeof
+        self.clock = clock
+        self.stats = CacheStats()
+        self.size_bytes = 0
+        self._entries: OrderedDict[Hashable, CacheEntry] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._lookup(key)
+        if entry is None or not entry.is_fresh(self.clock()):
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return entry.value
+
+    def get_entry(self, key: Hashable) -> Optional[CacheEntry]:
+        entry = self._lookup(key)
+        if entry is None:
+            self.stats.misses += 1
+        elif entry.is_fresh(self.clock()):
+            self.stats.hits += 1
+        else:
+            self.stats.stale_hits += 1
+        return entry
+
+    def _lookup(self, key: Hashable) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if (
+            entry.expires_at is not None
+            and entry.expires_at + self.max_stale <= self.clock()
+        ):
+            self._remove(key)
+            self.stats.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.default_ttl if ttl is None else ttl
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        if key in self._entries:
+            self._remove(key)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        expires_at = self.clock() + ttl if ttl is not None else None
+        self._entries[key] = CacheEntry(value, expires_at, size)
+        self.size_bytes += size
+        self._evict()
+
+    def delete(self, key: Hashable) -> None:
+        if key in self._entries:
+            self._remove(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.size_bytes = 0
+
+    def _remove(self, key: Hashable) -> None:
+        self.size_bytes -= self._entries.pop(key).size
+
+    def _over_limit(self) -> bool:
+        if self.max_entries is not None and len(self._entries) > self.max_entries:
+            return True
+        return self.max_bytes is not None and self.size_bytes > self.max_bytes
+
+    def _evict(self) -> None:
+        while self._over_limit():
+            _, entry = self._entries.popitem(last=False)
+            self.size_bytes -= entry.size
+            self.stats.evictions += 1
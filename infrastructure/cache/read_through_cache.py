@@ -0,0 +1,103 @@
+import asyncio
+from contextvars import Context
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+import httpx
+
+from domain.cache_interface import IReadThroughCache
+from infrastructure.cache.memory_cache import MemoryCache
+from infrastructure.logger.logger import Logger
+from infrastructure.single_flight import SingleFlight
+
+
+def is_upstream_failure(exc: Exception) -> bool:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= 500
+    return isinstance(exc, httpx.TransportError)
+
+
+class ReadThroughCache(IReadThroughCache):
+    """Cache read-through com stale-while-revalidate e stale-if-error.
+
+    Entradas expiradas há menos de `stale_while_revalidate` segundos são
+    servidas na hora e atualizadas em segundo plano. Se o upstream falhar
+    (5xx, timeout ou erro de transporte), qualquer entrada ainda retida pelo
+    cache (até `cache.max_stale`) é servida no lugar do erro.
+    """
+
+    def __init__(
+        self,
+        cache: MemoryCache,
+        logger: Logger,
+        stale_while_revalidate: float = 0.0,
+        is_fallback_error: Callable[[Exception], bool] = is_upstream_failure,
+    ):
+        self.cache = cache
+        self.logger = logger
+        self.stale_while_revalidate = stale_while_revalidate or 0.0
+        self.is_fallback_error = is_fallback_error
+        self.single_flight = SingleFlight()
+        self._revalidating: Dict[Hashable, asyncio.Task] = {}
+        # Incrementado a cada invalidação: cargas iniciadas antes dela não
+        # podem gravar no cache um valor possivelmente anterior à escrita
+        self._generation = 0
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None,
+    ) -> Any:
+        entry = self.cache.get_entry(key)
+        now = self.cache.clock()
+        if entry is not None and entry.is_fresh(now):
+            return entry.value
+
+        if entry is not None and now - entry.expires_at < self.stale_while_revalidate:
+            self._revalidate(key, loader, ttl)
+            return entry.value
+
+        try:
+            return await self._load(key, loader, ttl)
+        except Exception as exc:
+            if entry is None or not self.is_fallback_error(exc):
+                raise
+            self.logger.warning(f"Servindo cache obsoleto para {key}: {exc!r}")
+            return entry.value
+
+    def _revalidate(
+        self, key: Hashable, loader: Callable[[], Awaitable[Any]], ttl: Optional[float]
+    ) -> None:
+        if key in self._revalidating:
+            return
+        # Contexto limpo: a revalidação não pertence à requisição que a disparou
+        task = asyncio.create_task(self._refresh(key, loader, ttl), context=Context())
+        self._revalidating[key] = task
+        task.add_done_callback(lambda _: self._revalidating.pop(key, None))
+
+    async def _refresh(
+        self, key: Hashable, loader: Callable[[], Awaitable[Any]], ttl: Optional[float]
+    ) -> None:
+        try:
+            await self._load(key, loader, ttl)
+        except Exception as exc:
+            self.logger.warning(f"Falha ao revalidar cache para {key}: {exc!r}")
+
+    async def _load(
+        self, key: Hashable, loader: Callable[[], Awaitable[Any]], ttl: Optional[float]
+    ) -> Any:
+        generation = self._generation
+        # Chave inclui a geração: leitores posteriores a uma invalidação não
+        # se juntam a uma carga iniciada antes dela
+        value = await self.single_flight.do((key, generation), loader)
+        if value is not None and generation == self._generation:
+            self.cache.set(key, value, ttl)
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        self._generation += 1
+        self.cache.delete(key)
+
+    def clear(self) -> None:
+        self._generation += 1
+        self.cache.clear()
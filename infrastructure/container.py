@@ -1,51 +1,99 @@
+from pathlib import Path
+
 from dependency_injector import containers, providers
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from adapters.out.api.http_cache import SqliteHttpCache
 from adapters.out.api.movies_api_client import MoviesApiClient
 from adapters.out.api.todo_api_client import TodoApiClient
-from adapters.out.database.user_repository import UserRepository
-from application.movie_service import MovieService
+from adapters.out.database.user_repository import (
+    UserRepository,
+    isolated_user_repository,
+)
+from application.movie_service import MovieService, batch_semaphore
+from application.todo_index import TodoIndex
 from application.todo_service import TodoService
 from application.user_service import UserService
+from infrastructure.cache.change_tracker import ChangeTracker
+from infrastructure.cache.memory_cache import MemoryCache
+from infrastructure.cache.read_through_cache import ReadThroughCache
+from infrastructure.database.engine import create_engine
+from infrastructure.database.session import current_read_session, current_session
+from infrastructure.database.write_batcher import create_write_batcher
+from infrastructure.http_client import create_http_client
 from infrastructure.logger.logger import Logger
 
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
 DB_PATH = "db.sqlite3"
-DATABASE_URL = "sqlite+aiosqlite:///" + DB_PATH  # ✅ async driver
+HTTP_CACHE_PATH = "http_cache.sqlite3"
+
+
+def project_path(path: str) -> str:
+    """Caminhos relativos partem da raiz do projeto, não do diretório atual."""
+    return str(PROJECT_ROOT / path)
+
+
+def database_url(path: str = DB_PATH) -> str:
+    return "sqlite+aiosqlite:///" + project_path(path)  # ✅ async driver
+
+
+DATABASE_URL = database_url()
 
 
 class Container(containers.DeclarativeContainer):
     wiring_config = containers.WiringConfiguration(
         modules=[
+            "adapters.inbound.database",
             "adapters.inbound.routes.user_router",
             "adapters.inbound.routes.todo_router",
             "adapters.inbound.routes.movies_router",
         ]
     )
 
-    config = providers.Configuration()
+    config = providers.Configuration(default={"database": {"url": DATABASE_URL}})
 
-    # ✅ Engine assíncrono
+    # ✅ Engine de escrita: o SQLite só aceita um escritor por vez, então uma
+    # única conexão evita que as escritas disputem o lock do banco
     engine = providers.Singleton(
-        create_async_engine,
-        DATABASE_URL,
-        connect_args={"check_same_thread": False},
-        echo=True,
+        create_engine,
+        config.database.url,
+        profile=config.database.profile,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=config.database.pool_timeout,
+        echo=config.database.echo,
+    )
+
+    # ✅ Engine de leitura: conexões somente leitura ao mesmo banco em WAL
+    read_engine = providers.Singleton(
+        create_engine,
+        config.database.url,
+        profile=config.database.profile,
+        pool_size=config.database.pool_size,
+        max_overflow=config.database.max_overflow,
+        pool_timeout=config.database.pool_timeout,
+        echo=config.database.echo,
+        read_only=True,
     )
 
-    # ✅ sessionmaker assíncrono
+    # ✅ sessionmakers assíncronos
     session_factory = providers.Singleton(
         async_sessionmaker,
         bind=engine,
         expire_on_commit=False,
         class_=AsyncSession,
     )
-
-    # ✅ Resource assíncrono (yield para injetar corretamente)
-    session = providers.Resource(
-        lambda session_factory: session_factory(),
-        session_factory,
+    read_session_factory = providers.Singleton(
+        async_sessionmaker,
+        bind=read_engine,
+        expire_on_commit=False,
+        class_=AsyncSession,
     )
 
+    # ✅ Sessões da requisição atual (abertas por `request_session`)
+    session = providers.Callable(current_session)
+    read_session = providers.Callable(current_read_session)
+
     logger = providers.Singleton(
         Logger,
         name=config.logging.app,
@@ -55,13 +103,113 @@ class Container(containers.DeclarativeContainer):
         log_file=config.logging.file,
     )
 
-    user_repository = providers.Factory(UserRepository, session=session)
+    # ✅ Group commit opcional das escritas de usuário
+    user_write_batcher = providers.Singleton(
+        create_write_batcher,
+        enabled=config.database.write_batching.enabled,
+        session_factory=session_factory,
+        max_batch=config.database.write_batching.max_batch,
+        max_delay=config.database.write_batching.max_delay,
+    )
+    user_repository = providers.Factory(
+        UserRepository,
+        session=session,
+        read_session=read_session,
+        write_batcher=user_write_batcher,
+    )
+    user_loader_repository = providers.Factory(
+        isolated_user_repository, read_session_factory
+    )
+    user_cache_store = providers.Singleton(
+        MemoryCache,
+        max_entries=config.cache.users.max_entries,
+        default_ttl=config.cache.users.ttl,
+    )
+    user_cache = providers.Singleton(ReadThroughCache, user_cache_store, logger=logger)
+    user_change_tracker = providers.Singleton(
+        ChangeTracker, interval=config.cache.users.sync_interval
+    )
     user_service = providers.Factory(
-        UserService, user_repository=user_repository, logger=logger
+        UserService,
+        user_repository=user_repository,
+        logger=logger,
+        cache=user_cache,
+        change_tracker=user_change_tracker,
+        loader_repository=user_loader_repository.provider,
+    )
+
+    # ✅ Pool HTTP compartilhado (fechado no lifespan da aplicação). Singleton e
+    # não Resource: o AsyncClient é um context manager assíncrono e tornaria
+    # assíncronos todos os providers que dependem dele.
+    http_client = providers.Singleton(
+        create_http_client,
+        max_connections=config.http.max_connections,
+        max_keepalive_connections=config.http.max_keepalive_connections,
+        keepalive_expiry=config.http.keepalive_expiry,
+        timeout=config.http.timeout,
+        connect_timeout=config.http.connect_timeout,
+        http2=config.http.http2,
     )
 
-    todo_client = TodoApiClient("https://jsonplaceholder.typicode.com")
-    todo_service = providers.Factory(TodoService, todo_client, logger=logger)
+    # ✅ Cache HTTP persistente compartilhado entre workers
+    http_cache = providers.Singleton(
+        SqliteHttpCache,
+        path=config.http_cache.path,
+        default_ttl=config.http_cache.default_ttl,
+        retention=config.http_cache.retention,
+    )
+
+    todo_client = providers.Singleton(
+        TodoApiClient,
+        "https://jsonplaceholder.typicode.com",
+        client=http_client,
+        http_cache=http_cache,
+    )
+    todo_cache_store = providers.Singleton(
+        MemoryCache,
+        max_entries=config.cache.todos.max_entries,
+        default_ttl=config.cache.todos.ttl,
+        max_stale=config.cache.todos.max_stale,
+    )
+    todo_cache = providers.Singleton(
+        ReadThroughCache,
+        todo_cache_store,
+        logger=logger,
+        stale_while_revalidate=config.cache.todos.stale_while_revalidate,
+    )
+    todo_index = providers.Singleton(
+        TodoIndex, max_age=config.cache.todos.index_max_age
+    )
+    todo_service = providers.Factory(
+        TodoService, todo_client, logger=logger, cache=todo_cache, index=todo_index
+    )
 
-    movies_client = MoviesApiClient("https://api.themoviedb.org/3")
-    movie_service = providers.Factory(MovieService, movies_client, logger=logger)
+    movies_client = providers.Singleton(
+        MoviesApiClient,
+        "https://api.themoviedb.org/3",
+        client=http_client,
+        http_cache=http_cache,
+    )
+    movie_cache_store = providers.Singleton(
+        MemoryCache,
+        max_entries=config.cache.movies.max_entries,
+        max_bytes=config.cache.movies.max_bytes,
+        default_ttl=config.cache.movies.ttl,
+        max_stale=config.cache.movies.max_stale,
+    )
+    movie_cache = providers.Singleton(
+        ReadThroughCache,
+        movie_cache_store,
+        logger=logger,
+        stale_while_revalidate=config.cache.movies.stale_while_revalidate,
+    )
+    movie_batch_semaphore = providers.Singleton(
+        batch_semaphore, config.movies.batch_concurrency
+    )
+    movie_service = providers.Factory(
+        MovieService,
+        movies_client,
+        logger=logger,
+        cache=movie_cache,
+        semaphore=movie_batch_semaphore,
+    )
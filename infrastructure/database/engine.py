@@ -0,0 +1,96 @@
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from infrastructure.database.instrumentation import instrument_engine
+
+DEFAULT_PROFILE = "performance"
+
+# ✅ Pragmas aplicados a cada conexão nova do pool
+SQLITE_PROFILES: Dict[str, Dict[str, Any]] = {
+    "default": {},
+    "performance": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,
+        "cache_size": -64000,  # KiB (negativo) → ~64 MB
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+    },
+}
+
+
+def sqlite_pragmas(profile: Optional[str]) -> Dict[str, Any]:
+    try:
+        return SQLITE_PROFILES[profile or DEFAULT_PROFILE]
+    except KeyError:
+        raise ValueError(
+            f"Perfil SQLite desconhecido: {profile!r} "
+            f"(opções: {', '.join(SQLITE_PROFILES)})"
+        ) from None
+
+
+# ✅ Conexões de leitura: o próprio SQLite recusa qualquer escrita
+READ_ONLY_PRAGMAS: Dict[str, Any] = {"query_only": "ON"}
+
+
+def read_only_url(url: str) -> str:
+    """Converte a URL do banco em URI SQLite aberta com `mode=ro`.
+
+    Bancos em memória não são compartilhados entre conexões e ficam como estão.
+    """
+    parsed = make_url(url)
+    if parsed.database in (None, "", ":memory:"):
+        return url
+    return parsed.set(
+        database=f"file:{parsed.database}",
+        query={**parsed.query, "mode": "ro", "uri": "true"},
+    ).render_as_string(hide_password=False)
+
+
+def create_engine(
+    url: str,
+    profile: Optional[str] = DEFAULT_PROFILE,
+    pool_size: Optional[int] = 5,
+    max_overflow: Optional[int] = 10,
+    pool_timeout: Optional[float] = 30.0,
+    echo: bool = False,
+    read_only: bool = False,
+) -> AsyncEngine:
+    """Cria o engine assíncrono do SQLite com o perfil de pragmas escolhido.
+
+    Com WAL, leitores não bloqueiam o escritor; o pool só precisa ser grande
+    o bastante para as leituras concorrentes, já que as escritas são
+    serializadas pelo próprio SQLite.
+
+    Com `read_only`, as conexões abrem o mesmo arquivo em `mode=ro` e com
+    `query_only`; o `journal_mode` é persistente e fica a cargo do escritor.
+    """
+    pragmas = sqlite_pragmas(profile)
+    if read_only:
+        url = read_only_url(url)
+        pragmas = {
+            **{k: v for k, v in pragmas.items() if k != "journal_mode"},
+            **READ_ONLY_PRAGMAS,
+        }
+    engine = create_async_engine(
+        url,
+        connect_args={"check_same_thread": False},
+        pool_size=pool_size if pool_size is not None else 5,
+        max_overflow=max_overflow if max_overflow is not None else 10,
+        pool_timeout=pool_timeout if pool_timeout is not None else 30.0,
+        echo=echo,
+    )
+
+    if pragmas:
+
+        @event.listens_for(engine.sync_engine, "connect")
+        def apply_pragmas(dbapi_connection, _):
+            cursor = dbapi_connection.cursor()
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+            cursor.close()
+
+    instrument_engine(engine)
+    return engine
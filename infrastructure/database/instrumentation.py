@@ -0,0 +1,59 @@
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+QUERY_START_KEY = "query_start_time"
+
+
+@dataclass
+class QueryStats:
+    """Totais de SQL de uma requisição."""
+
+    count: int = 0
+    duration_ms: float = 0.0
+    statements: Counter[str] = field(default_factory=Counter)
+
+    def record(self, statement: str, duration_ms: float) -> None:
+        self.count += 1
+        self.duration_ms += duration_ms
+        self.statements[statement] += 1
+
+    def most_repeated(self) -> Optional[Tuple[str, int]]:
+        """Consulta mais repetida: o sinal típico de um N+1."""
+        common = self.statements.most_common(1)
+        return common[0] if common else None
+
+
+# ✅ O middleware cria um QueryStats por requisição; as tasks filhas herdam a
+# mesma instância e os eventos do engine somam nela. Tasks compartilhadas entre
+# requisições (group commit, single-flight, revalidação) começam com contexto
+# limpo e não entram na conta de ninguém.
+query_stats_ctx_var: ContextVar[Optional[QueryStats]] = ContextVar(
+    "query_stats", default=None
+)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Conta as consultas e o tempo gasto no banco para a requisição atual."""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault(QUERY_START_KEY, []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def stop_timer(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info[QUERY_START_KEY].pop()
+        if (stats := query_stats_ctx_var.get()) is not None:
+            stats.record(statement, (time.perf_counter() - started) * 1000)
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def discard_timer(exception_context):
+        # Consulta que falhou não chega ao after_cursor_execute
+        conn = exception_context.connection
+        if conn is not None and conn.info.get(QUERY_START_KEY):
+            conn.info[QUERY_START_KEY].pop()
@@ -0,0 +1,201 @@
+import asyncio
+import fcntl
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    statements: Tuple[str, ...]
+    # Migração opcional: só é aplicada quando a opção é pedida em `migrate`
+    requires: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class AppliedMigration:
+    version: int
+    name: str
+    duration_ms: float
+
+
+# Entradas mantidas em userdb_changes; um cache mais atrasado que isso é limpo
+CHANGE_LOG_SIZE = 10_000
+
+# Migrações nunca são editadas depois de publicadas: mudanças novas entram
+# como uma versão nova. As que criam objetos existentes antes do controle de
+# versão usam IF NOT EXISTS para adotar esses bancos.
+MIGRATIONS: Tuple[Migration, ...] = (
+    Migration(
+        1,
+        "create_userdb",
+        (
+            "CREATE TABLE IF NOT EXISTS userdb (id VARCHAR NOT NULL, "
+            "name VARCHAR NOT NULL, email VARCHAR, PRIMARY KEY (id))",
+        ),
+    ),
+    Migration(
+        2,
+        "index_userdb_email",
+        ("CREATE INDEX IF NOT EXISTS ix_userdb_email ON userdb (email)",),
+    ),
+    # ✅ Busca textual: índice FTS5 com conteúdo externo (a própria userdb),
+    # mantido em sincronia por triggers. O rowid implícito de uma tabela sem
+    # INTEGER PRIMARY KEY pode mudar no VACUUM e dessincronizar o índice, então
+    # a tabela é recriada com `seq` como alias estável do rowid (preservando os
+    # valores atuais) e o índice aponta para ele.
+    Migration(
+        3,
+        "userdb_fts",
+        (
+            "CREATE TABLE userdb_new (seq INTEGER NOT NULL PRIMARY KEY, "
+            "id VARCHAR NOT NULL UNIQUE, name VARCHAR NOT NULL, email VARCHAR)",
+            "INSERT INTO userdb_new (seq, id, name, email) "
+            "SELECT rowid, id, name, email FROM userdb",
+            "DROP TABLE userdb",
+            "ALTER TABLE userdb_new RENAME TO userdb",
+            "CREATE INDEX ix_userdb_email ON userdb (email)",
+            "CREATE VIRTUAL TABLE userdb_fts USING fts5("
+            "name, email, content='userdb', content_rowid='seq', "
+            "tokenize='unicode61 remove_diacritics 2')",
+            "INSERT INTO userdb_fts(userdb_fts) VALUES ('rebuild')",
+            "CREATE TRIGGER userdb_fts_ai AFTER INSERT ON userdb BEGIN "
+            "INSERT INTO userdb_fts(rowid, name, email) "
+            "VALUES (new.seq, new.name, new.email); END",
+            "CREATE TRIGGER userdb_fts_ad AFTER DELETE ON userdb BEGIN "
+            "INSERT INTO userdb_fts(userdb_fts, rowid, name, email) "
+            "VALUES ('delete', old.seq, old.name, old.email); END",
+            "CREATE TRIGGER userdb_fts_au AFTER UPDATE ON userdb BEGIN "
+            "INSERT INTO userdb_fts(userdb_fts, rowid, name, email) "
+            "VALUES ('delete', old.seq, old.name, old.email); "
+            "INSERT INTO userdb_fts(rowid, name, email) "
+            "VALUES (new.seq, new.name, new.email); END",
+        ),
+    ),
+    # ✅ Log das chaves alteradas, lido pelos caches dos outros processos para
+    # descartar só o que mudou; o trigger mantém apenas as últimas
+    # CHANGE_LOG_SIZE entradas
+    Migration(
+        4,
+        "userdb_change_log",
+        (
+            "CREATE TABLE userdb_changes "
+            "(version INTEGER PRIMARY KEY AUTOINCREMENT, id VARCHAR NOT NULL)",
+            "CREATE TRIGGER userdb_changes_au AFTER UPDATE ON userdb BEGIN "
+            "INSERT INTO userdb_changes (id) VALUES (old.id); "
+            "DELETE FROM userdb_changes WHERE version <= "
+            f"(SELECT MAX(version) FROM userdb_changes) - {CHANGE_LOG_SIZE}; END",
+            "CREATE TRIGGER userdb_changes_ad AFTER DELETE ON userdb BEGIN "
+            "INSERT INTO userdb_changes (id) VALUES (old.id); "
+            "DELETE FROM userdb_changes WHERE version <= "
+            f"(SELECT MAX(version) FROM userdb_changes) - {CHANGE_LOG_SIZE}; END",
+        ),
+    ),
+    # ✅ E-mail único (USER_EMAIL_UNIQUE): falha se já houver duplicados. O IF
+    # NOT EXISTS adota o índice criado antes desta versão.
+    Migration(
+        5,
+        "userdb_unique_email",
+        ("CREATE UNIQUE INDEX IF NOT EXISTS uq_userdb_email ON userdb (email)",),
+        requires="unique_email",
+    ),
+)
+
+MIGRATIONS_TABLE = (
+    "CREATE TABLE IF NOT EXISTS schema_migrations (version INTEGER PRIMARY KEY, "
+    "name TEXT NOT NULL, applied_at REAL NOT NULL, duration_ms REAL NOT NULL)"
+)
+
+
+@asynccontextmanager
+async def file_lock(path: Optional[str]) -> AsyncIterator[None]:
+    """Lock exclusivo entre processos do host (sem lock para banco em memória)."""
+    if not path:
+        yield
+        return
+    with open(path, "a") as handle:
+        await asyncio.to_thread(fcntl.flock, handle.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+async def schema_version(conn: AsyncConnection) -> int:
+    await conn.execute(text(MIGRATIONS_TABLE))
+    return await conn.scalar(text("SELECT MAX(version) FROM schema_migrations")) or 0
+
+
+@asynccontextmanager
+async def transaction(engine: AsyncEngine) -> AsyncIterator[AsyncConnection]:
+    """Transação explícita, que também cobre DDL.
+
+    No modo legado do pysqlite/aiosqlite o driver só abre a transação antes
+    de INSERT/UPDATE/DELETE: um CREATE ou DROP anterior rodaria em
+    autocommit e não seria desfeito se a migração falhasse no meio.
+    """
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql("BEGIN IMMEDIATE")
+        yield conn
+
+
+async def migrate(
+    engine: AsyncEngine,
+    migrations: Tuple[Migration, ...] = MIGRATIONS,
+    unique_email: bool = False,
+) -> List[AppliedMigration]:
+    """Aplica as migrações pendentes, cada uma na sua transação (`transaction`).
+
+    Workers que sobem juntos disputam um lock de arquivo ao lado do banco;
+    quem chega depois encontra tudo aplicado e não faz nada. Com
+    `unique_email`, aplica também a migração opcional do índice único, que
+    falha se já houver e-mails duplicados na base.
+    """
+    database = engine.url.database
+    lock_path = (
+        f"{database}.migrate.lock" if database not in (None, ":memory:") else None
+    )
+    options = {"unique_email"} if unique_email else set()
+    applied: List[AppliedMigration] = []
+
+    async with file_lock(lock_path):
+        async with engine.begin() as conn:
+            await conn.execute(text(MIGRATIONS_TABLE))
+            done = set(
+                await conn.scalars(text("SELECT version FROM schema_migrations"))
+            )
+
+        for migration in migrations:
+            if migration.version in done:
+                continue
+            if migration.requires is not None and migration.requires not in options:
+                continue
+            started = time.perf_counter()
+            async with transaction(engine) as conn:
+                for statement in migration.statements:
+                    await conn.execute(text(statement))
+                duration_ms = (time.perf_counter() - started) * 1000
+                await conn.execute(
+                    text(
+                        "INSERT INTO schema_migrations "
+                        "(version, name, applied_at, duration_ms) "
+                        "VALUES (:version, :name, :applied_at, :duration_ms)"
+                    ),
+                    {
+                        "version": migration.version,
+                        "name": migration.name,
+                        "applied_at": time.time(),
+                        "duration_ms": duration_ms,
+                    },
+                )
+            applied.append(
+                AppliedMigration(migration.version, migration.name, duration_ms)
+            )
+
+    return applied
@@ -0,0 +1,56 @@
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+session_ctx_var: ContextVar[Optional[AsyncSession]] = ContextVar(
+    "db_session", default=None
+)
+read_session_ctx_var: ContextVar[Optional[AsyncSession]] = ContextVar(
+    "db_read_session", default=None
+)
+
+
+def current_session() -> AsyncSession:
+    """Sessão vinculada à requisição atual (ver `session_scope`)."""
+    session = session_ctx_var.get()
+    if session is None:
+        raise RuntimeError("Nenhuma sessão de banco ativa neste contexto")
+    return session
+
+
+def current_read_session() -> AsyncSession:
+    """Sessão somente leitura da requisição atual."""
+    session = read_session_ctx_var.get()
+    if session is None:
+        raise RuntimeError("Nenhuma sessão de leitura ativa neste contexto")
+    return session
+
+
+@asynccontextmanager
+async def session_scope(
+    session_factory: async_sessionmaker[AsyncSession],
+    ctx_var: ContextVar[Optional[AsyncSession]] = session_ctx_var,
+) -> AsyncIterator[AsyncSession]:
+    """Abre uma sessão exclusiva para o escopo e a devolve ao pool no final.
+
+    Em caso de erro a transação é desfeita; caso contrário, o que ficou
+    pendente é confirmado antes do fechamento.
+    """
+    async with session_factory() as session:
+        previous = ctx_var.get()
+        token = ctx_var.set(session)
+        try:
+            yield session
+            if session.in_transaction():
+                await session.commit()
+        except BaseException:
+            await session.rollback()
+            raise
+        finally:
+            try:
+                ctx_var.reset(token)  # ✅ devolve a sessão do escopo externo
+            except ValueError:
+                # Gerador finalizado em outro Context (ex.: stream abandonado)
+                ctx_var.set(previous)
@@ -0,0 +1,126 @@
+import asyncio
+from contextvars import Context
+from typing import Any, Awaitable, Callable, List, Optional, Tuple, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+R = TypeVar("R")
+Operation = Callable[[AsyncSession], Awaitable[Any]]
+
+
+class WriteBatcher:
+    """Group commit: escritas concorrentes numa única transação.
+
+    Uma task dedicada junta as operações que chegam em até `max_delay`
+    segundos (ou até `max_batch` itens), executa todas na mesma sessão e faz
+    um único commit. As operações não devem fazer commit por conta própria.
+    Se qualquer uma falhar, o lote é desfeito e cada operação é repetida na
+    sua própria transação, para que só a culpada receba o erro.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        max_batch: int = 100,
+        max_delay: float = 0.005,
+    ):
+        self.session_factory = session_factory
+        self.max_batch = max_batch or 100
+        self.max_delay = max_delay if max_delay is not None else 0.005
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+
+    async def submit(self, operation: Callable[[AsyncSession], Awaitable[R]]) -> R:
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        # ✅ Task encerrada (close, cancelamento ou erro) é recriada; o que
+        # ficou na fila é gravado pela nova
+        if self._writer is None or self._writer.done():
+            # Contexto limpo: a task serve todas as requisições, não a que a criou
+            self._writer = asyncio.create_task(self._run(), context=Context())
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((operation, future))
+        return await future
+
+    async def close(self) -> None:
+        """Grava o que já está na fila e encerra a task de escrita."""
+        if self._writer is None:
+            return
+        if not self._writer.done():
+            self._queue.put_nowait(None)  # sentinela: para depois da fila atual
+            await asyncio.gather(self._writer, return_exceptions=True)
+        self._writer = None
+        # Chegou depois da sentinela ou a task já tinha morrido: grava aqui
+        pending = []
+        while not self._queue.empty():
+            if (item := self._queue.get_nowait()) is not None:
+                pending.append(item)
+        if pending:
+            await self._commit(pending)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        closing = False
+        while not closing:
+            if (item := await self._queue.get()) is None:
+                return
+            batch = [item]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch:
+                if not self._queue.empty():
+                    item = self._queue.get_nowait()
+                elif (timeout := deadline - loop.time()) > 0:
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    break
+                if item is None:
+                    closing = True
+                    break
+                batch.append(item)
+            try:
+                await self._commit(batch)
+            finally:
+                # Task cancelada no meio do lote: ninguém fica esperando
+                for _, future in batch:
+                    if not future.done():
+                        future.cancel()
+
+    async def _commit(self, batch: List[Tuple[Operation, asyncio.Future]]) -> None:
+        try:
+            async with self.session_factory() as session:
+                results = [await operation(session) for operation, _ in batch]
+                await session.commit()
+        except Exception:
+            for item in batch:
+                await self._commit_one(*item)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def _commit_one(self, operation: Operation, future: asyncio.Future) -> None:
+        try:
+            async with self.session_factory() as session:
+                result = await operation(session)
+                await session.commit()
+        except Exception as exc:
+            if not future.done():
+                future.set_exception(exc)
+        else:
+            if not future.done():
+                future.set_result(result)
+
+
+def create_write_batcher(
+    enabled: bool,
+    session_factory: async_sessionmaker[AsyncSession],
+    max_batch: int = 100,
+    max_delay: float = 0.005,
+) -> Optional[WriteBatcher]:
+    """Group commit é opcional; desligado, os repositórios fazem commit direto."""
+    if not enabled:
+        return None
+    return WriteBatcher(session_factory, max_batch=max_batch, max_delay=max_delay)
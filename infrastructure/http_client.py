@@ -0,0 +1,33 @@
+from typing import Optional
+
+import httpx
+
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_CONNECT_TIMEOUT = 5.0
+
+
+def create_http_client(
+    max_connections: Optional[int] = DEFAULT_MAX_CONNECTIONS,
+    max_keepalive_connections: Optional[int] = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry: Optional[float] = DEFAULT_KEEPALIVE_EXPIRY,
+    timeout: Optional[float] = DEFAULT_TIMEOUT,
+    connect_timeout: Optional[float] = DEFAULT_CONNECT_TIMEOUT,
+    http2: bool = False,
+) -> httpx.AsyncClient:
+    """Cria o AsyncClient compartilhado (pool de conexões keep-alive).
+
+    `http2=True` exige o extra `httpx[http2]` instalado.
+    """
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+        keepalive_expiry=keepalive_expiry,
+    )
+    return httpx.AsyncClient(
+        limits=limits,
+        timeout=httpx.Timeout(timeout, connect=connect_timeout),
+        http2=http2,
+    )
@@ -1,4 +1,5 @@
 import datetime
+from typing import Optional
 from uuid import uuid4
 
 from dependency_injector.wiring import Provide, inject
@@ -7,6 +8,7 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import Response
 
 from infrastructure.container import Container
+from infrastructure.database.instrumentation import QueryStats, query_stats_ctx_var
 from infrastructure.logger.logger import Logger
 from infrastructure.logger.request_context import request_id_ctx_var
 
@@ -14,11 +16,17 @@ from infrastructure.logger.request_context import request_id_ctx_var
 class RequestLoggingMiddleware(BaseHTTPMiddleware):
     @inject
     async def dispatch(
-        self, request: Request, call_next, logger: Logger = Provide[Container.logger]
+        self,
+        request: Request,
+        call_next,
+        logger: Logger = Provide[Container.logger],
+        query_budget: Optional[int] = Provide[Container.config.database.query_budget],
     ):
         request_id = str(uuid4())
         request_id_ctx_var.set(request_id)
         request.state.request_id = request_id
+        queries = QueryStats()
+        query_stats_ctx_var.set(queries)
 
         start = datetime.datetime.now(datetime.timezone.utc)
         response: Response = await call_next(request)
@@ -33,9 +41,26 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
                 "path": request.url.path,
                 "response_code": response.status_code,
                 "duration_ms": int(duration),
+                "db_queries": queries.count,
+                "db_duration_ms": round(queries.duration_ms, 2),
                 "message": f"{request.method} {request.url.path} completed",
             }
         )
+        if query_budget and queries.count > query_budget:
+            # ✅ Muitas consultas numa requisição costumam indicar N+1
+            statement, repeats = queries.most_repeated()
+            logger.warning(
+                {
+                    "type": "QueryBudgetExceeded",
+                    "method": request.method,
+                    "path": request.url.path,
+                    "db_queries": queries.count,
+                    "query_budget": query_budget,
+                    "most_repeated": {"statement": statement, "count": repeats},
+                    "message": f"{request.method} {request.url.path} ran "
+                    f"{queries.count} queries (budget {query_budget})",
+                }
+            )
 
         return response
 
@@ -0,0 +1,47 @@
+import asyncio
+from contextvars import Context
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _Call:
+    def __init__(self, task: asyncio.Future):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Compartilha uma única chamada em andamento entre chamadores da mesma chave.
+
+    Erros são propagados para todos os chamadores. O cancelamento de um
+    chamador não afeta os demais; a chamada compartilhada só é cancelada
+    quando o último chamador desiste dela.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        call = self._calls.get(key)
+        if call is None:
+            # ✅ Contexto limpo: a chamada é compartilhada, então não herda o
+            # estado (ex.: métricas de SQL) de quem chegou primeiro
+            call = _Call(asyncio.create_task(self._call(fn), context=Context()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._calls.pop(key, None))
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if call.waiters == 1:
+                call.task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+    @staticmethod
+    async def _call(fn: Callable[[], Awaitable[Any]]) -> Any:
+        return await fn()
@@ -7,7 +7,6 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
-from sqlmodel import SQLModel
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from starlette.middleware.sessions import SessionMiddleware
 from strawberry.fastapi import GraphQLRouter
@@ -20,7 +19,14 @@ from adapters.inbound.routes import (
     todo_router,
     user_router,
 )
-from infrastructure.container import Container
+from infrastructure.container import (
+    DB_PATH,
+    HTTP_CACHE_PATH,
+    Container,
+    database_url,
+    project_path,
+)
+from infrastructure.database.migrations import migrate, schema_version
 from infrastructure.logger.exception_handlers import (
     global_exception_handler,
     http_exception_handler,
@@ -39,16 +45,32 @@ env = Env(
 )
 
 
+def _env_flag(value) -> bool:
+    return str(value).lower() in ("1", "true", "yes")
+
+
 @asynccontextmanager
-async def lifespan(_: FastAPI):
-    if not os.path.exists("db.sqlite3"):
-        logger.info("📦 Creating database and tables...")
-        async with container.engine().begin() as conn:
-            await conn.run_sync(SQLModel.metadata.create_all)
-        logger.info("✅ Database created successfully!")
-    else:
-        logger.info("📁 Database already exists. No need to create.")
+async def lifespan(app: FastAPI):
+    container.init_resources()
+    engine = container.engine()
+    logger.info(f"📦 Migrating database {engine.url.database}...")
+    applied = await migrate(
+        engine, unique_email=container.config.database.unique_email()
+    )
+    for migration in applied:
+        logger.info(
+            f"✅ Migration {migration.version} ({migration.name}) applied "
+            f"in {migration.duration_ms:.0f}ms"
+        )
+    async with engine.connect() as conn:
+        app.state.schema_version = await schema_version(conn)
+    logger.info(f"📁 Database ready at schema version {app.state.schema_version}")
     yield
+    await container.http_client().aclose()
+    await container.http_cache().close()
+    if (write_batcher := container.user_write_batcher()) is not None:
+        await write_batcher.close()
+    container.shutdown_resources()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -62,10 +84,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[user_router.NEXT_CURSOR_HEADER],  # ✅ paginação de GET /users
 )
 
 container = Container()
-container.init_resources()
 
 app.add_exception_handler(Exception, global_exception_handler)
 app.add_exception_handler(StarletteHTTPException, http_exception_handler)
@@ -76,9 +98,86 @@ container.config.logging.level.from_env("LOG_LEVEL", "INFO")
 container.config.logging.to_console.from_env("LOG_TO_CONSOLE", True)
 container.config.logging.rotation_days.from_env("ROTATION_DAYS", 5)
 container.config.logging.file.from_env("LOG_FILE", "logs/app.log")
+container.config.database.url.from_value(
+    database_url(os.getenv("DATABASE_PATH", DB_PATH))
+)
+container.config.database.profile.from_env("DB_SQLITE_PROFILE", "performance")
+container.config.database.pool_size.from_env("DB_POOL_SIZE", 5, as_=int)
+container.config.database.max_overflow.from_env("DB_MAX_OVERFLOW", 10, as_=int)
+container.config.database.pool_timeout.from_env("DB_POOL_TIMEOUT", 30.0, as_=float)
+container.config.database.echo.from_env("DB_ECHO", False, as_=_env_flag)
+container.config.database.query_budget.from_env("DB_QUERY_BUDGET", 20, as_=int)
+container.config.database.unique_email.from_env(
+    "USER_EMAIL_UNIQUE", False, as_=_env_flag
+)
+container.config.database.write_batching.enabled.from_env(
+    "USER_WRITE_BATCHING", False, as_=_env_flag
+)
+container.config.database.write_batching.max_batch.from_env(
+    "USER_WRITE_BATCH_MAX_SIZE", 100, as_=int
+)
+container.config.database.write_batching.max_delay.from_env(
+    "USER_WRITE_BATCH_MAX_DELAY", 0.005, as_=float
+)
+container.config.http.max_connections.from_env("HTTP_MAX_CONNECTIONS", 100, as_=int)
+container.config.http.max_keepalive_connections.from_env(
+    "HTTP_MAX_KEEPALIVE_CONNECTIONS", 20, as_=int
+)
+container.config.http.keepalive_expiry.from_env(
+    "HTTP_KEEPALIVE_EXPIRY", 30.0, as_=float
+)
+container.config.http.timeout.from_env("HTTP_TIMEOUT", 10.0, as_=float)
+container.config.http.connect_timeout.from_env("HTTP_CONNECT_TIMEOUT", 5.0, as_=float)
+container.config.http.http2.from_env("HTTP2", False, as_=_env_flag)
+container.config.http_cache.path.from_value(
+    project_path(os.getenv("HTTP_CACHE_PATH", HTTP_CACHE_PATH))
+)
+container.config.http_cache.default_ttl.from_env(
+    "HTTP_CACHE_DEFAULT_TTL", 300.0, as_=float
+)
+container.config.http_cache.retention.from_env(
+    "HTTP_CACHE_RETENTION", 86400.0, as_=float
+)
+container.config.cache.users.max_entries.from_env(
+    "USER_CACHE_MAX_ENTRIES", 10000, as_=int
+)
+container.config.cache.users.ttl.from_env("USER_CACHE_TTL", 60.0, as_=float)
+container.config.cache.users.sync_interval.from_env(
+    "USER_CACHE_SYNC_INTERVAL", 1.0, as_=float
+)
+container.config.cache.movies.max_entries.from_env(
+    "MOVIE_CACHE_MAX_ENTRIES", 1024, as_=int
+)
+container.config.cache.movies.max_bytes.from_env(
+    "MOVIE_CACHE_MAX_BYTES", 16 * 1024 * 1024, as_=int
+)
+container.config.cache.movies.ttl.from_env("MOVIE_CACHE_TTL", 900.0, as_=float)
+container.config.cache.movies.stale_while_revalidate.from_env(
+    "MOVIE_CACHE_STALE_WHILE_REVALIDATE", 300.0, as_=float
+)
+container.config.cache.movies.max_stale.from_env(
+    "MOVIE_CACHE_MAX_STALE", 3600.0, as_=float
+)
+container.config.movies.batch_concurrency.from_env(
+    "MOVIE_BATCH_CONCURRENCY", 10, as_=int
+)
+container.config.cache.todos.max_entries.from_env(
+    "TODO_CACHE_MAX_ENTRIES", 256, as_=int
+)
+container.config.cache.todos.ttl.from_env("TODO_CACHE_TTL", 300.0, as_=float)
+container.config.cache.todos.stale_while_revalidate.from_env(
+    "TODO_CACHE_STALE_WHILE_REVALIDATE", 120.0, as_=float
+)
+container.config.cache.todos.max_stale.from_env(
+    "TODO_CACHE_MAX_STALE", 3600.0, as_=float
+)
+container.config.cache.todos.index_max_age.from_env(
+    "TODO_INDEX_MAX_AGE", 60.0, as_=float
+)
 container.wire(
     modules=[
         "infrastructure.logger.logger_middleware",
+        "adapters.inbound.database",
         "adapters.inbound.routes.user_router",
     ]
 )
@@ -157,6 +256,26 @@ async def favicon():
     return FileResponse("static/favicon.ico")
 
 
+@app.get("/ready", include_in_schema=False)
+def ready():
+    # ✅ Só responde depois que o lifespan aplicou as migrações
+    return {"status": "ready", "schema_version": app.state.schema_version}
+
+
+@app.get("/metrics/cache", include_in_schema=False)
+def cache_metrics():
+    # ✅ Números deste worker: cada processo tem os seus caches em memória
+    stores = {
+        "users": container.user_cache_store(),
+        "todos": container.todo_cache_store(),
+        "movies": container.movie_cache_store(),
+    }
+    return {
+        name: {**store.stats.snapshot(), "entries": len(store)}
+        for name, store in stores.items()
+    }
+
+
 @app.get("/")
 def read_root():
     return {"message": "Hexagonal Architecture API! "}
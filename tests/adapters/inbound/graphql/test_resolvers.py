@@ -0,0 +1,15 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from adapters.inbound.graphql.resolvers import list_todos
+
+
+@pytest.mark.asyncio
+async def test_list_todos_uses_service_from_context():
+    service = MagicMock()
+    info = MagicMock(context={"todo_service": service})
+
+    result = await list_todos(info)
+
+    assert result is service.find_all.return_value
@@ -6,7 +6,7 @@ from fastapi.testclient import TestClient
 
 from adapters.inbound.auth import require_auth
 from adapters.inbound.routes import movies_router
-from domain.movie import Movie
+from domain.movie import Movie, MovieBatch
 from infrastructure.container import Container
 from infrastructure.logger.logger import Logger
 from infrastructure.logger.logger_middleware import RequestLoggingMiddleware
@@ -21,6 +21,7 @@ def client_and_service():
     mock_service.find_all = AsyncMock()
     mock_service.get = AsyncMock()
     mock_service.popular = AsyncMock()
+    mock_service.get_many = AsyncMock()
 
     mock_logger = MagicMock(spec=Logger)
 
@@ -114,3 +115,41 @@ def test_get_movie_not_found(client_and_service):
     assert response.status_code == 404
     assert response.json()["detail"] == "Movie Not Found"
     mock_service.get.assert_awaited_once_with(999)
+
+
+def test_get_movies_batch(client_and_service):
+    client, mock_service = client_and_service
+    movie = Movie(
+        id=1,
+        title="The Matrix",
+        poster_path="url",
+        overview="Neo",
+        release_date="1999-03-31",
+    )
+    batch = MovieBatch(movies=[movie], errors={2: "Movie Not Found"})
+    mock_service.get_many.return_value = batch
+
+    response = client.get("/movies?ids=1,2")
+    assert response.status_code == 200
+    assert response.json() == {
+        "movies": [movie.model_dump()],
+        "errors": {"2": "Movie Not Found"},
+    }
+    mock_service.get_many.assert_awaited_once_with([1, 2])
+
+
+def test_get_movies_batch_invalid_ids(client_and_service):
+    client, mock_service = client_and_service
+
+    response = client.get("/movies?ids=1,abc")
+    assert response.status_code == 422
+    mock_service.get_many.assert_not_awaited()
+
+
+def test_get_movies_batch_too_many_ids(client_and_service):
+    client, mock_service = client_and_service
+    ids = ",".join(str(i) for i in range(movies_router.MAX_BATCH_SIZE + 1))
+
+    response = client.get(f"/movies?ids={ids}")
+    assert response.status_code == 422
+    mock_service.get_many.assert_not_awaited()
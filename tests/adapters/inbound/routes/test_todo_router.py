@@ -19,6 +19,7 @@ def client_and_gateway():
     mock_gateway = MagicMock()
     mock_gateway.find_all = AsyncMock()
     mock_gateway.get = AsyncMock()
+    mock_gateway.find_by = AsyncMock()
 
     mock_logger = MagicMock(spec=Logger)
 
@@ -47,12 +48,12 @@ def test_list_todos(client_and_gateway):
     todo1 = ToDo(id=1, userId=1, title="Start Learning", completed=True)
     todo2 = ToDo(id=2, userId=1, title="Finish Azure AZ-104", completed=False)
 
-    mock_gateway.find_all.return_value = [todo1, todo2]
+    mock_gateway.find_by.return_value = [todo1, todo2]
 
     response = client.get("/todos/")
     assert response.status_code == 200
     assert response.json() == [todo1.model_dump(), todo2.model_dump()]
-    mock_gateway.find_all.assert_awaited_once()
+    mock_gateway.find_by.assert_awaited_once_with(user_id=None, completed=None)
 
 
 def test_get_todo_found(client_and_gateway):
@@ -75,3 +76,43 @@ def test_get_user_not_found(client_and_gateway):
     assert response.status_code == 404
     assert response.json()["detail"] == "Todo Not Found"
     mock_gateway.get.assert_awaited_once_with(999)
+
+
+def test_list_todos_filters_and_paginates(client_and_gateway):
+    client, mock_gateway = client_and_gateway
+    todos = [
+        ToDo(id=i, userId=1, title=f"Todo {i}", completed=True) for i in range(1, 6)
+    ]
+    mock_gateway.find_by.return_value = todos
+
+    response = client.get("/todos/?userId=1&completed=true&limit=2&offset=1")
+    assert response.status_code == 200
+    assert response.json() == [todos[1].model_dump(), todos[2].model_dump()]
+    mock_gateway.find_by.assert_awaited_once_with(user_id=1, completed=True)
+
+
+def test_list_todos_projects_fields(client_and_gateway):
+    client, mock_gateway = client_and_gateway
+    mock_gateway.find_by.return_value = [
+        ToDo(id=1, userId=1, title="Start Learning", completed=True)
+    ]
+
+    response = client.get("/todos/?fields=id,title")
+    assert response.status_code == 200
+    assert response.json() == [{"id": 1, "title": "Start Learning"}]
+
+
+def test_list_todos_rejects_unknown_fields(client_and_gateway):
+    client, mock_gateway = client_and_gateway
+
+    response = client.get("/todos/?fields=id,secret")
+    assert response.status_code == 422
+    assert response.json()["detail"] == "Unknown fields: secret"
+    mock_gateway.find_by.assert_not_awaited()
+
+
+def test_list_todos_rejects_oversized_limit(client_and_gateway):
+    client, _ = client_and_gateway
+
+    response = client.get(f"/todos/?limit={todo_router.MAX_PAGE_SIZE + 1}")
+    assert response.status_code == 422
@@ -1,19 +1,26 @@
 import os
+from contextlib import asynccontextmanager
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from dependency_injector import providers
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 from starlette.middleware.sessions import SessionMiddleware
 
 from adapters.inbound.auth import require_auth
 from adapters.inbound.routes import user_router
-from domain.user import User
+from adapters.inbound.user_import import MAX_LINE_BYTES
+from domain.user import DuplicateEmailError, User
 from infrastructure.container import Container
 from infrastructure.logger.logger import Logger
 from infrastructure.logger.logger_middleware import RequestLoggingMiddleware
 
 
+async def _yield(value):
+    yield value
+
+
 @pytest.fixture
 def client_and_repo():
     container = Container()
@@ -23,11 +30,20 @@ def client_and_repo():
     mock_repo.save = AsyncMock()
     mock_repo.get = AsyncMock()
     mock_repo.find_all = AsyncMock()
+    mock_repo.find_page = AsyncMock()
+    mock_repo.changes_since = AsyncMock(return_value=(0, set()))
     mock_repo.delete = AsyncMock()
+    mock_repo.save_many = AsyncMock()
+    mock_repo.update_many = AsyncMock()
+    mock_repo.delete_many = AsyncMock()
 
     mock_logger = MagicMock(spec=Logger)
 
     container.user_repository.override(mock_repo)
+    # As cargas do cache usam o mesmo mock, sem abrir sessão própria
+    container.user_loader_repository.override(
+        providers.Factory(asynccontextmanager(_yield), mock_repo)
+    )
     container.logger.override(mock_logger)
     container.wire(
         modules=[
@@ -69,12 +85,39 @@ def test_list_users(client_and_repo):
     client, mock_repo = client_and_repo
     user1 = User(id="1", name="Alice", email="alice@example.com")
     user2 = User(id="2", name="Bob", email="bob@example.com")
-    mock_repo.find_all.return_value = [user1, user2]
+    mock_repo.find_page.return_value = ([user1, user2], None)
 
     response = client.get("/users/")
     assert response.status_code == 200
     assert response.json() == [user1.model_dump(), user2.model_dump()]
-    mock_repo.find_all.assert_awaited_once()
+    assert "X-Next-Cursor" not in response.headers
+    mock_repo.find_page.assert_awaited_once_with(user_router.DEFAULT_PAGE_SIZE, None)
+
+
+def test_list_users_returns_next_cursor(client_and_repo):
+    client, mock_repo = client_and_repo
+    mock_repo.find_page.return_value = ([User(id="1", name="Alice")], "next")
+
+    response = client.get("/users/?limit=1&cursor=abc")
+    assert response.status_code == 200
+    assert response.headers["X-Next-Cursor"] == "next"
+    mock_repo.find_page.assert_awaited_once_with(1, "abc")
+
+
+def test_list_users_rejects_invalid_cursor(client_and_repo):
+    client, mock_repo = client_and_repo
+    mock_repo.find_page.side_effect = ValueError("Cursor inválido")
+
+    response = client.get("/users/?cursor=%25%25")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Cursor inválido"
+
+
+def test_list_users_caps_page_size(client_and_repo):
+    client, _ = client_and_repo
+
+    response = client.get(f"/users/?limit={user_router.MAX_PAGE_SIZE + 1}")
+    assert response.status_code == 422
 
 
 def test_get_user_found(client_and_repo):
@@ -144,3 +187,225 @@ def test_update_user_not_found(client_and_repo):
     assert response.status_code == 404
     assert response.json()["detail"] == "Usuário não encontrado"
     mock_repo.update.assert_awaited_once_with(user_id, user_input)
+
+
+def test_create_users_batch(client_and_repo):
+    client, mock_repo = client_and_repo
+    created = [User(id="1", name="Alice"), User(id="2", name="Bob")]
+    mock_repo.save_many.return_value = created
+
+    response = client.post(
+        "/users/batch", json=[{"id": "x", "name": "Alice"}, {"name": "Bob"}]
+    )
+
+    assert response.status_code == 200
+    assert [item["status"] for item in response.json()] == [201, 201]
+    sent = mock_repo.save_many.await_args.args[0]
+    assert [user.id for user in sent] == [None, None]
+
+
+def test_update_users_batch(client_and_repo):
+    client, mock_repo = client_and_repo
+    mock_repo.update_many.return_value = {"1": User(id="1", name="Alice"), "2": None}
+
+    response = client.put(
+        "/users/batch", json=[{"id": "1", "name": "Alice"}, {"id": "2", "name": "X"}]
+    )
+
+    assert response.status_code == 200
+    assert [(item["id"], item["status"]) for item in response.json()] == [
+        ("1", 200),
+        ("2", 404),
+    ]
+    mock_repo.update_many.assert_awaited_once_with(
+        {"1": {"id": "1", "name": "Alice"}, "2": {"id": "2", "name": "X"}}
+    )
+
+
+@pytest.mark.parametrize(
+    "repo_method, method, path, body",
+    [
+        ("save", "post", "/users/", {"name": "Alice", "email": "a@x.com"}),
+        ("update", "put", "/users/1", {"name": "Alice", "email": "a@x.com"}),
+        ("save_many", "post", "/users/batch", [{"name": "Alice"}]),
+        ("update_many", "put", "/users/batch", [{"id": "1", "name": "Alice"}]),
+    ],
+)
+def test_duplicate_email_returns_conflict(
+    client_and_repo, repo_method, method, path, body
+):
+    client, mock_repo = client_and_repo
+    setattr(mock_repo, repo_method, AsyncMock(side_effect=DuplicateEmailError()))
+
+    response = client.request(method, path, json=body)
+
+    assert response.status_code == 409
+    assert response.json()["detail"] == "E-mail já cadastrado"
+
+
+def test_import_users_duplicate_email_returns_conflict(client_and_repo):
+    client, mock_repo = client_and_repo
+    mock_repo.save_many.side_effect = DuplicateEmailError()
+
+    response = client.post("/users/import", content=b'{"name": "Alice"}\n')
+
+    assert response.status_code == 409
+
+
+def test_update_users_batch_requires_ids(client_and_repo):
+    client, mock_repo = client_and_repo
+
+    response = client.put("/users/batch", json=[{"name": "Alice"}])
+
+    assert response.status_code == 422
+    mock_repo.update_many.assert_not_awaited()
+
+
+def test_delete_users_batch(client_and_repo):
+    client, mock_repo = client_and_repo
+    mock_repo.delete_many.return_value = {"1"}
+
+    response = client.request("DELETE", "/users/batch", json=["1", "2"])
+
+    assert response.status_code == 200
+    assert [(item["id"], item["status"]) for item in response.json()] == [
+        ("1", 204),
+        ("2", 404),
+    ]
+
+
+def _stream_of(*chunks):
+    async def stream(chunk_size):
+        for chunk in chunks:
+            yield chunk
+
+    return stream
+
+
+def test_export_users_ndjson(client_and_repo):
+    client, mock_repo = client_and_repo
+    alice = User(id="1", name="Alice", email="alice@example.com")
+    bob = User(id="2", name="Bob")
+    mock_repo.stream = MagicMock(side_effect=_stream_of([alice], [bob]))
+
+    response = client.get("/users/export")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.text.splitlines() == [
+        alice.model_dump_json(),
+        bob.model_dump_json(),
+    ]
+    mock_repo.stream.assert_called_once_with(user_router.EXPORT_CHUNK_SIZE)
+
+
+def test_export_users_csv(client_and_repo):
+    client, mock_repo = client_and_repo
+    mock_repo.stream = MagicMock(
+        side_effect=_stream_of(
+            [User(id="1", name="Alice", email="alice@example.com")],
+            [User(id="2", name="Bob")],
+        )
+    )
+
+    response = client.get("/users/export?format=csv")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert 'filename="users.csv"' in response.headers["content-disposition"]
+    assert response.text.splitlines() == [
+        "id,name,email",
+        "1,Alice,alice@example.com",
+        "2,Bob,",
+    ]
+
+
+def test_export_users_csv_empty_table(client_and_repo):
+    client, mock_repo = client_and_repo
+    mock_repo.stream = MagicMock(side_effect=_stream_of())
+
+    response = client.get("/users/export?format=csv")
+
+    assert response.text.splitlines() == ["id,name,email"]
+
+
+def test_import_users_ndjson(client_and_repo):
+    client, mock_repo = client_and_repo
+
+    response = client.post(
+        "/users/import", content=b'{"name": "Alice"}\n{"email": "x"}\n'
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "imported": 1,
+        "failed": 1,
+        "errors": [{"line": 2, "detail": "name: Field required"}],
+    }
+    mock_repo.save_many.assert_awaited_once_with([User(name="Alice")])
+
+
+def test_import_users_rejects_oversized_lines(client_and_repo):
+    client, mock_repo = client_and_repo
+
+    response = client.post("/users/import", content=b"x" * (MAX_LINE_BYTES + 1))
+
+    assert response.status_code == 413
+    assert response.json()["detail"].startswith("Linha 1 excede")
+    mock_repo.save_many.assert_not_awaited()
+
+
+def test_import_users_csv(client_and_repo):
+    client, mock_repo = client_and_repo
+
+    response = client.post(
+        "/users/import?format=csv", content=b"name,email\nAlice,a@example.com\n"
+    )
+
+    assert response.json()["imported"] == 1
+    mock_repo.save_many.assert_awaited_once_with(
+        [User(name="Alice", email="a@example.com")]
+    )
+
+
+def test_get_user_by_email(client_and_repo):
+    client, mock_repo = client_and_repo
+    user = User(id="1", name="Alice", email="alice@example.com")
+    mock_repo.get_by_email = AsyncMock(return_value=user)
+
+    response = client.get("/users/by-email?email=alice@example.com")
+
+    assert response.status_code == 200
+    assert response.json() == user.model_dump()
+    mock_repo.get_by_email.assert_awaited_once_with("alice@example.com")
+    mock_repo.get.assert_not_awaited()
+
+
+def test_get_user_by_email_not_found(client_and_repo):
+    client, mock_repo = client_and_repo
+    mock_repo.get_by_email = AsyncMock(return_value=None)
+
+    response = client.get("/users/by-email?email=ghost@example.com")
+
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Usuário não encontrado"
+
+
+def test_search_users(client_and_repo):
+    client, mock_repo = client_and_repo
+    user = User(id="1", name="Alice", email="alice@example.com")
+    mock_repo.search = AsyncMock(return_value=[user])
+
+    response = client.get("/users/search?q=ali&limit=5&offset=10")
+
+    assert response.status_code == 200
+    assert response.json() == [user.model_dump()]
+    mock_repo.search.assert_awaited_once_with("ali", 5, 10)
+
+
+def test_search_users_requires_query(client_and_repo):
+    client, _ = client_and_repo
+
+    assert client.get("/users/search").status_code == 422
+    limit = user_router.MAX_SEARCH_RESULTS + 1
+    assert client.get(f"/users/search?q=a&limit={limit}").status_code == 422
@@ -0,0 +1,140 @@
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlmodel import SQLModel
+
+from adapters.inbound.user_import import (
+    LineTooLongError,
+    csv_batches,
+    iter_lines,
+    ndjson_batches,
+)
+from adapters.out.database.user_repository import UserRepository
+from application.user_service import UserService
+from domain.user import User
+
+
+async def _chunks(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+async def _collect(batches):
+    return [batch async for batch in batches]
+
+
+@pytest.mark.asyncio
+async def test_iter_lines_splits_across_chunks():
+    lines = iter_lines(_chunks(b'{"a":', b"1}\r\n\n", b"second", b"\nthird"))
+
+    assert [line async for line in lines] == [
+        (1, b'{"a":1}'),
+        (3, b"second"),
+        (4, b"third"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_iter_lines_rejects_lines_over_the_limit():
+    lines = iter_lines(_chunks(b"ok\n", b"x" * 8, b"x" * 8, b"\n"), max_line_bytes=10)
+    with pytest.raises(LineTooLongError, match="Linha 2"):
+        [line async for line in lines]
+
+    # Corpo sem nenhuma quebra de linha não é acumulado indefinidamente
+    lines = iter_lines(_chunks(*[b"x" * 4] * 100), max_line_bytes=10)
+    with pytest.raises(LineTooLongError, match="Linha 1"):
+        [line async for line in lines]
+
+    lines = iter_lines(_chunks(b"x" * 12 + b"\nok"), max_line_bytes=10)
+    with pytest.raises(LineTooLongError, match="Linha 1"):
+        [line async for line in lines]
+
+
+@pytest.mark.asyncio
+async def test_iter_lines_joins_many_small_chunks():
+    chunks = [b"ab"] * 1000 + [b"\nc"]
+
+    lines = [line async for line in iter_lines(_chunks(*chunks))]
+
+    assert lines == [(1, b"ab" * 1000), (2, b"c")]
+
+
+@pytest.mark.asyncio
+async def test_ndjson_batches_validate_in_bulk():
+    body = b'{"name": "Alice"}\n{"name": "Bob", "email": "bob@example.com"}\n'
+
+    batches = await _collect(ndjson_batches(iter_lines(_chunks(body)), batch_size=1))
+
+    assert batches == [
+        ([User(name="Alice")], []),
+        ([User(name="Bob", email="bob@example.com")], []),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_ndjson_batches_report_bad_lines():
+    body = (
+        b'{"name": "Alice"}\n'
+        b"not json\n"
+        b'{"email": "x@example.com"}\n'
+        b'{"name": "A"}, {"name": "B"}\n'
+    )
+
+    [(users, errors)] = await _collect(ndjson_batches(iter_lines(_chunks(body))))
+
+    assert users == [User(name="Alice")]
+    assert [error.line for error in errors] == [2, 3, 4]
+    assert errors[1].detail == "name: Field required"
+
+
+@pytest.mark.asyncio
+async def test_ndjson_lines_cannot_complete_each_other():
+    # Juntas num array, as duas linhas formariam dois objetos válidos
+    body = b'{"name":"a"},{"name":"b"\n"x":1}\n'
+
+    [(users, errors)] = await _collect(ndjson_batches(iter_lines(_chunks(body))))
+
+    assert users == []
+    assert [error.line for error in errors] == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_csv_batches_map_header_and_empty_fields():
+    body = b"id,name,email\n1,Alice,alice@example.com\n2,Bob,\n3,,x@example.com\n"
+
+    batches = await _collect(csv_batches(iter_lines(_chunks(body)), batch_size=2))
+
+    assert batches[0] == ([User(id="1", name="Alice", email="alice@example.com")], [])
+    users, errors = batches[1]
+    assert users == [User(id="2", name="Bob")]
+    assert [(error.line, error.detail) for error in errors] == [
+        (4, "name: Input should be a valid string")
+    ]
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_benchmark_streaming_import(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.sqlite3'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    rows = 20000
+    body = b"".join(
+        b'{"name": "User %d", "email": "user%d@example.com"}\n' % (i, i)
+        for i in range(rows)
+    )
+    chunks = [body[i : i + 64 * 1024] for i in range(0, len(body), 64 * 1024)]
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        service = UserService(UserRepository(session), MagicMock())
+        started = time.perf_counter()
+        report = await service.import_users(
+            ndjson_batches(iter_lines(_chunks(*chunks)))
+        )
+        elapsed = time.perf_counter() - started
+    await engine.dispose()
+
+    assert (report.imported, report.failed) == (rows, 0), f"{rows / elapsed:.0f}/s"
@@ -0,0 +1,207 @@
+import json
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from adapters.out.api.base_api_client import BaseApiClient
+from adapters.out.api.http_cache import SqliteHttpCache
+
+
+class Upstream:
+    def __init__(self, headers=None):
+        self.calls = 0
+        self.headers = headers or {}
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        return httpx.Response(200, json={"calls": self.calls}, headers=self.headers)
+
+
+@pytest_asyncio.fixture
+async def http_cache(tmp_path):
+    cache = SqliteHttpCache(str(tmp_path / "http_cache.sqlite3"), default_ttl=60)
+    yield cache
+    await cache.close()
+
+
+def make_client(upstream, http_cache):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(upstream))
+    return BaseApiClient("https://fakeapi.com", client=client, http_cache=http_cache)
+
+
+@pytest.mark.asyncio
+async def test_fetch_reads_through_persistent_cache(http_cache):
+    upstream = Upstream()
+    api = make_client(upstream, http_cache)
+
+    first = await api._fetch("/todos", json.loads, params={"page": 1})
+    second = await api._fetch("/todos", json.loads, params={"page": 1})
+
+    assert first == second == {"calls": 1}
+    assert upstream.calls == 1
+    assert await http_cache.get("https://fakeapi.com/todos?page=1") is not None
+
+
+@pytest.mark.asyncio
+async def test_fetch_warms_once_for_every_worker(http_cache, tmp_path):
+    upstream = Upstream()
+    other_worker_cache = SqliteHttpCache(http_cache.path)
+
+    await make_client(upstream, http_cache)._fetch("/todos", json.loads)
+    result = await make_client(upstream, other_worker_cache)._fetch(
+        "/todos", json.loads
+    )
+
+    assert result == {"calls": 1}
+    assert upstream.calls == 1
+    await other_worker_cache.close()
+
+
+@pytest.mark.asyncio
+async def test_fetch_refreshes_expired_entries(http_cache):
+    upstream = Upstream(headers={"cache-control": "max-age=0"})
+    api = make_client(upstream, http_cache)
+
+    await api._fetch("/todos", json.loads)
+    result = await api._fetch("/todos", json.loads)
+
+    assert result == {"calls": 2}
+
+
+@pytest.mark.asyncio
+async def test_fetch_raises_upstream_errors(http_cache):
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(500))
+    )
+    api = BaseApiClient("https://fakeapi.com", client=client, http_cache=http_cache)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await api._fetch("/todos", json.loads)
+
+
+class ConditionalUpstream:
+    def __init__(self, etag='"v1"', last_modified=None):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        headers = {"cache-control": "max-age=0"}
+        if self.etag:
+            headers["etag"] = self.etag
+        if self.last_modified:
+            headers["last-modified"] = self.last_modified
+
+        if self.etag and request.headers.get("if-none-match") == self.etag:
+            return httpx.Response(304, headers=headers)
+        if (
+            self.last_modified
+            and request.headers.get("if-modified-since") == self.last_modified
+        ):
+            return httpx.Response(304, headers=headers)
+        return httpx.Response(200, json=[{"version": self.etag}], headers=headers)
+
+
+class CountingParser:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, body):
+        self.calls += 1
+        return json.loads(body)
+
+
+@pytest.mark.asyncio
+async def test_not_modified_reuses_parsed_objects(http_cache):
+    upstream = ConditionalUpstream()
+    api = make_client(upstream, http_cache)
+    parse = CountingParser()
+
+    first = await api._fetch("/todos", parse)
+    second = await api._fetch("/todos", parse)
+
+    assert second is first
+    assert parse.calls == 1
+    assert upstream.requests[1].headers["if-none-match"] == '"v1"'
+
+
+@pytest.mark.asyncio
+async def test_last_modified_validator_is_sent(http_cache):
+    last_modified = "Wed, 21 Oct 2015 07:28:00 GMT"
+    upstream = ConditionalUpstream(etag=None, last_modified=last_modified)
+    api = make_client(upstream, http_cache)
+
+    await api._fetch("/todos", CountingParser())
+    await api._fetch("/todos", CountingParser())
+
+    assert upstream.requests[1].headers["if-modified-since"] == last_modified
+    assert "if-none-match" not in upstream.requests[1].headers
+
+
+@pytest.mark.asyncio
+async def test_changed_resource_is_downloaded_again(http_cache):
+    upstream = ConditionalUpstream()
+    api = make_client(upstream, http_cache)
+    parse = CountingParser()
+
+    await api._fetch("/todos", parse)
+    upstream.etag = '"v2"'
+    result = await api._fetch("/todos", parse)
+
+    assert result == [{"version": '"v2"'}]
+    assert parse.calls == 2
+    assert (await http_cache.get("https://fakeapi.com/todos")).etag == '"v2"'
+
+
+@pytest.mark.asyncio
+async def test_fresh_hit_reuses_parsed_objects(http_cache):
+    api = make_client(Upstream(), http_cache)
+    parse = CountingParser()
+
+    await api._fetch("/todos", parse)
+    await api._fetch("/todos", parse)
+
+    assert parse.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_validators_merge_with_request_headers(http_cache):
+    upstream = ConditionalUpstream()
+    api = make_client(upstream, http_cache)
+
+    await api._fetch("/todos", CountingParser(), headers={"Accept": "application/json"})
+    await api._fetch("/todos", CountingParser(), headers={"Accept": "application/json"})
+
+    assert upstream.requests[1].headers["accept"] == "application/json"
+    assert upstream.requests[1].headers["if-none-match"] == '"v1"'
+
+
+@pytest.mark.asyncio
+async def test_vary_keeps_variants_apart(http_cache):
+    def upstream(request: httpx.Request) -> httpx.Response:
+        language = request.headers["accept-language"]
+        return httpx.Response(200, json=[language], headers={"vary": "Accept-Language"})
+
+    api = make_client(upstream, http_cache)
+
+    async def fetch(language):
+        headers = {"Accept-Language": language}
+        return await api._fetch("/todos", json.loads, headers=headers)
+
+    assert await fetch("pt-BR") == ["pt-BR"]
+    assert await fetch("en") == ["en"]
+    assert await fetch("en") == ["en"]
+
+
+@pytest.mark.asyncio
+async def test_private_responses_are_not_shared(http_cache):
+    upstream = Upstream(headers={"cache-control": "private, max-age=60"})
+    api = make_client(upstream, http_cache)
+
+    await api._fetch("/todos", json.loads)
+    await api._fetch("/todos", json.loads)
+
+    assert upstream.calls == 2
+    assert await http_cache.get("https://fakeapi.com/todos") is None
@@ -0,0 +1,162 @@
+import json
+import time
+
+import aiosqlite
+import httpx
+import pytest
+import pytest_asyncio
+
+from adapters.out.api import http_cache as http_cache_module
+from adapters.out.api.http_cache import (
+    HttpCacheEntry,
+    SqliteHttpCache,
+    parse_cache_control,
+)
+
+
+@pytest_asyncio.fixture
+async def cache(tmp_path):
+    cache = SqliteHttpCache(str(tmp_path / "http_cache.sqlite3"), default_ttl=60)
+    yield cache
+    await cache.close()
+
+
+@pytest.mark.parametrize(
+    "header,expected",
+    [
+        ("", (True, 60)),
+        ("max-age=120", (True, 120)),
+        ("public, s-maxage=30, max-age=120", (True, 30)),
+        ('max-age="15"', (True, 15)),
+        ("no-cache", (True, 0)),
+        ("no-store", (False, 0)),
+        ("private, max-age=60", (False, 0)),
+        ("max-age=abc", (True, 60)),
+    ],
+)
+def test_parse_cache_control(header, expected):
+    headers = httpx.Headers({"cache-control": header} if header else {})
+    assert parse_cache_control(headers, 60) == expected
+
+
+def test_entry_freshness():
+    entry = HttpCacheEntry(body=b"{}", expires_at=100)
+
+    assert entry.is_fresh(now=99)
+    assert not entry.is_fresh(now=100)
+    assert not entry.is_fresh()
+
+
+@pytest.mark.asyncio
+async def test_set_and_get_roundtrip(cache):
+    entry = HttpCacheEntry(body=b"[1]", expires_at=123.0, etag='"v1"')
+
+    await cache.set("k", entry)
+
+    assert await cache.get("k") == entry
+    assert await cache.get("missing") is None
+
+
+@pytest.mark.asyncio
+async def test_store_honors_cache_control_and_validators(cache):
+    response = httpx.Response(
+        200,
+        content=b'{"id": 1}',
+        headers={
+            "cache-control": "max-age=600",
+            "etag": '"abc"',
+            "last-modified": "Wed, 21 Oct 2015 07:28:00 GMT",
+        },
+    )
+
+    entry = await cache.store("k", response)
+
+    stored = await cache.get("k")
+    assert stored == entry
+    assert stored.etag == '"abc"'
+    assert stored.last_modified == "Wed, 21 Oct 2015 07:28:00 GMT"
+    assert stored.expires_at == pytest.approx(time.time() + 600, abs=5)
+
+
+@pytest.mark.asyncio
+async def test_store_skips_no_store_responses(cache):
+    response = httpx.Response(200, content=b"{}", headers={"cache-control": "no-store"})
+
+    assert await cache.store("k", response) is None
+    assert await cache.get("k") is None
+
+
+@pytest.mark.asyncio
+async def test_store_records_vary_headers(cache):
+    response = httpx.Response(
+        200, content=b"{}", headers={"vary": "Accept-Language, Accept"}
+    )
+    request_headers = httpx.Headers({"Accept-Language": "pt-BR"})
+
+    entry = await cache.store("k", response, request_headers)
+
+    assert json.loads(entry.vary) == {"accept": None, "accept-language": "pt-BR"}
+    assert entry.matches(request_headers)
+    assert not entry.matches(httpx.Headers({"Accept-Language": "en"}))
+    assert await cache.store("k", httpx.Response(200, headers={"vary": "*"})) is None
+
+
+@pytest.mark.asyncio
+async def test_upgrades_cache_files_without_vary_column(tmp_path):
+    path = str(tmp_path / "old.sqlite3")
+    async with aiosqlite.connect(path) as conn:
+        await conn.execute(
+            "CREATE TABLE http_cache (key TEXT PRIMARY KEY, body BLOB NOT NULL, "
+            "etag TEXT, last_modified TEXT, expires_at REAL NOT NULL)"
+        )
+        await conn.execute(
+            "INSERT INTO http_cache VALUES ('k', x'7b7d', NULL, NULL, 1.0)"
+        )
+        await conn.commit()
+
+    cache = SqliteHttpCache(path)
+    assert await cache.get("k") == HttpCacheEntry(body=b"{}", expires_at=1.0)
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_cache_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "shared.sqlite3")
+    worker_a = SqliteHttpCache(path)
+    worker_b = SqliteHttpCache(path)
+
+    await worker_a.set("k", HttpCacheEntry(body=b"{}", expires_at=time.time() + 60))
+
+    assert (await worker_b.get("k")).body == b"{}"
+    await worker_a.close()
+    await worker_b.close()
+
+
+@pytest.mark.asyncio
+async def test_prunes_entries_past_retention(cache, monkeypatch):
+    monkeypatch.setattr(http_cache_module, "PRUNE_EVERY", 2)
+    cache.retention = 10
+
+    await cache.set("old", HttpCacheEntry(body=b"{}", expires_at=time.time() - 60))
+    await cache.set("new", HttpCacheEntry(body=b"{}", expires_at=time.time() + 60))
+
+    assert await cache.get("old") is None
+    assert await cache.get("new") is not None
+
+
+@pytest.mark.asyncio
+async def test_close_without_connection_is_noop(tmp_path):
+    await SqliteHttpCache(str(tmp_path / "unused.sqlite3")).close()
+
+
+@pytest.mark.asyncio
+async def test_revalidate_extends_expiry_and_keeps_body(cache):
+    entry = HttpCacheEntry(body=b"[1]", expires_at=0, etag='"v1"')
+    response = httpx.Response(304, headers={"cache-control": "max-age=120"})
+
+    refreshed = await cache.revalidate("k", entry, response)
+
+    assert refreshed.body == b"[1]"
+    assert refreshed.etag == '"v1"'
+    assert refreshed.is_fresh()
+    assert await cache.get("k") == refreshed
@@ -1,15 +1,21 @@
+import asyncio
+import json
+import timeit
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
+import pytest_asyncio
 from httpx import HTTPStatusError, Request, Response
 
-from adapters.out.api.movies_api_client import MoviesApiClient
+from adapters.out.api.movies_api_client import POSTER_BASE_URL, MoviesApiClient
 from domain.movie import Movie
 
 
-@pytest.fixture
-def client():
-    return MoviesApiClient(base_url="https://fakeapi.com")
+@pytest_asyncio.fixture
+async def client():
+    async with httpx.AsyncClient() as http_client:
+        yield MoviesApiClient(base_url="https://fakeapi.com", client=http_client)
 
 
 @pytest.mark.asyncio
@@ -34,7 +40,7 @@ async def test_find_all(client):
     }
 
     mock_response = MagicMock()
-    mock_response.json.return_value = movies_data
+    mock_response.content = json.dumps(movies_data).encode()
     mock_response.raise_for_status.return_value = None
 
     with patch(
@@ -75,7 +81,7 @@ async def test_popular(client):
     }
 
     mock_response = MagicMock()
-    mock_response.json.return_value = movies_data
+    mock_response.content = json.dumps(movies_data).encode()
     mock_response.raise_for_status.return_value = None
 
     with patch(
@@ -107,7 +113,7 @@ async def test_get(client):
     }
 
     mock_response = MagicMock()
-    mock_response.json.return_value = movie_data
+    mock_response.content = json.dumps(movie_data).encode()
     mock_response.raise_for_status.return_value = None
 
     with patch(
@@ -185,7 +191,7 @@ async def test_find_all_without_poster_path(client):
     }
 
     mock_response = MagicMock()
-    mock_response.json.return_value = movies_data
+    mock_response.content = json.dumps(movies_data).encode()
     mock_response.raise_for_status.return_value = None
 
     with patch("httpx.AsyncClient.get", new=AsyncMock(return_value=mock_response)):
@@ -205,9 +211,75 @@ async def test_get_without_poster_path(client):
     }
 
     mock_response = MagicMock()
-    mock_response.json.return_value = movie_data
+    mock_response.content = json.dumps(movie_data).encode()
     mock_response.raise_for_status.return_value = None
 
     with patch("httpx.AsyncClient.get", new=AsyncMock(return_value=mock_response)):
         result = await client.get(99)
         assert result.title == "The Hidden Poster"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_get_is_coalesced(client):
+    movie_data = {
+        "id": 1,
+        "title": "Matrix",
+        "poster_path": "/matrix.jpg",
+        "overview": "Neo",
+        "release_date": "1999-03-31",
+    }
+
+    mock_response = MagicMock()
+    mock_response.content = json.dumps(movie_data).encode()
+    mock_response.raise_for_status.return_value = None
+
+    async def slow_get(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        return mock_response
+
+    with patch(
+        "httpx.AsyncClient.get", new=AsyncMock(side_effect=slow_get)
+    ) as mock_get:
+        results = await asyncio.gather(*(client.get(1) for _ in range(20)))
+
+        mock_get.assert_awaited_once()
+        assert all(result.title == "Matrix" for result in results)
+
+
+BULK_PAYLOAD = json.dumps(
+    {
+        "results": [
+            {
+                "id": i,
+                "title": f"Movie {i}",
+                "poster_path": f"/poster{i}.jpg",
+                "overview": "Overview " * 20,
+                "release_date": "2024-01-01",
+            }
+            for i in range(200)
+        ]
+    }
+).encode()
+
+
+def _validate_per_item(payload):
+    results = []
+    for movie_data in json.loads(payload)["results"]:
+        movie_data["poster_path"] = f"{POSTER_BASE_URL}{movie_data['poster_path']}"
+        results.append(Movie.model_validate(movie_data))
+    return results
+
+
+def test_bulk_validation_matches_per_item(client):
+    assert client._process_movies(BULK_PAYLOAD) == _validate_per_item(BULK_PAYLOAD)
+
+
+@pytest.mark.benchmark
+def test_bulk_validation_benchmark(client):
+    def measure(fn):
+        return min(timeit.repeat(fn, number=50, repeat=5)) / 50 * 1e6
+
+    per_item_us = measure(lambda: _validate_per_item(BULK_PAYLOAD))
+    bulk_us = measure(lambda: client._process_movies(BULK_PAYLOAD))
+
+    assert bulk_us < per_item_us, f"bulk={bulk_us:.1f}us per-item={per_item_us:.1f}us"
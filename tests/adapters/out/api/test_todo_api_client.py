@@ -1,15 +1,21 @@
+import asyncio
+import json
+import timeit
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
+import pytest_asyncio
 from httpx import HTTPStatusError, Request, Response
 
-from adapters.out.api.todo_api_client import TodoApiClient
+from adapters.out.api.todo_api_client import TODO_LIST_ADAPTER, TodoApiClient
 from domain.todo import ToDo
 
 
-@pytest.fixture
-def client():
-    return TodoApiClient(base_url="https://fakeapi.com")
+@pytest_asyncio.fixture
+async def client():
+    async with httpx.AsyncClient() as http_client:
+        yield TodoApiClient(base_url="https://fakeapi.com", client=http_client)
 
 
 @pytest.mark.asyncio
@@ -20,7 +26,7 @@ async def test_find_all(client):
     ]
 
     mock_response = MagicMock()
-    mock_response.json.return_value = todos_data  # <-- método síncrono
+    mock_response.content = json.dumps(todos_data).encode()
     mock_response.raise_for_status.return_value = None  # <-- método síncrono
 
     with patch(
@@ -37,7 +43,7 @@ async def test_get(client):
     todo_data = {"id": 1, "userId": 1, "title": "Estudar", "completed": False}
 
     mock_response = MagicMock()
-    mock_response.json.return_value = todo_data
+    mock_response.content = json.dumps(todo_data).encode()
     mock_response.raise_for_status.return_value = None
 
     with patch(
@@ -77,3 +83,53 @@ async def test_get_http_error(client):
 
         with pytest.raises(HTTPStatusError):
             await client.get(1)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_find_all_is_coalesced(client):
+    todos_data = [{"id": 1, "userId": 1, "title": "Estudar", "completed": False}]
+
+    mock_response = MagicMock()
+    mock_response.content = json.dumps(todos_data).encode()
+    mock_response.raise_for_status.return_value = None
+
+    async def slow_get(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        return mock_response
+
+    with patch(
+        "httpx.AsyncClient.get", new=AsyncMock(side_effect=slow_get)
+    ) as mock_get:
+        results = await asyncio.gather(*(client.find_all() for _ in range(20)))
+
+        mock_get.assert_awaited_once_with("https://fakeapi.com/todos")
+        assert all(result == [ToDo.model_validate(todos_data[0])] for result in results)
+
+
+BULK_PAYLOAD = json.dumps(
+    [
+        {"id": i, "userId": i % 10, "title": f"Todo {i}", "completed": i % 2 == 0}
+        for i in range(200)
+    ]
+).encode()
+
+
+def _validate_per_item(payload):
+    return [ToDo.model_validate(todo) for todo in json.loads(payload)]
+
+
+def test_bulk_validation_matches_per_item():
+    assert TODO_LIST_ADAPTER.validate_json(BULK_PAYLOAD) == _validate_per_item(
+        BULK_PAYLOAD
+    )
+
+
+@pytest.mark.benchmark
+def test_bulk_validation_benchmark():
+    def measure(fn):
+        return min(timeit.repeat(fn, number=50, repeat=5)) / 50 * 1e6
+
+    per_item_us = measure(lambda: _validate_per_item(BULK_PAYLOAD))
+    bulk_us = measure(lambda: TODO_LIST_ADAPTER.validate_json(BULK_PAYLOAD))
+
+    assert bulk_us < per_item_us, f"bulk={bulk_us:.1f}us per-item={per_item_us:.1f}us"
@@ -1,16 +1,37 @@
+import time
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
-
+import pytest_asyncio
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlmodel import SQLModel, select
+
+from adapters.out.database.base_repository import (
+    BaseRepository,
+    decode_cursor,
+    encode_cursor,
+)
 from adapters.out.database.models import UserDB
-from adapters.out.database.user_repository import UserRepository
-from domain.user import User
+from adapters.out.database.user_repository import (
+    UserRepository,
+    fts_prefix_query,
+    isolated_user_repository,
+)
+from domain.user import DuplicateEmailError, User
+from infrastructure.database.engine import create_engine
+from infrastructure.database.migrations import CHANGE_LOG_SIZE, migrate
+from infrastructure.database.write_batcher import WriteBatcher
 
 
 @pytest.fixture
 def mock_session():
     session = AsyncMock()
-    session.get = AsyncMock()
     session.execute = AsyncMock()
     session.commit = AsyncMock()
     session.refresh = AsyncMock()
@@ -29,37 +50,37 @@ def user_repository(mock_session):
 async def test_get_user(user_repository, mock_session):
     user_id = "123"
     fake_user_db = UserDB(id=user_id, name="John Doe", email="john@example.com")
-    mock_session.get.return_value = fake_user_db
+    mock_session.execute.return_value = _selected(fake_user_db)
 
     result = await user_repository.get(user_id)
 
     assert result.id == user_id
     assert result.name == "John Doe"
-    mock_session.get.assert_awaited_once_with(UserDB, user_id)
+    mock_session.execute.assert_awaited_once()
 
 
 @pytest.mark.asyncio
 async def test_get_user_not_found(user_repository, mock_session):
-    mock_session.get.return_value = None
+    mock_session.execute.return_value = _selected(None)
 
     result = await user_repository.get("not-found-id")
 
     assert result is None
-    mock_session.get.assert_awaited_once_with(UserDB, "not-found-id")
+    mock_session.execute.assert_awaited_once()
 
 
 @pytest.mark.asyncio
 async def test_find_all_users(user_repository, mock_session):
-    fake_users_db = [
-        UserDB(id="1", name="Alice", email="alice@example.com"),
-        UserDB(id="2", name="Bob", email="bob@example.com"),
+    fake_rows = [
+        {"id": "1", "name": "Alice", "email": "alice@example.com"},
+        {"id": "2", "name": "Bob", "email": "bob@example.com"},
     ]
 
-    mock_scalars = MagicMock()
-    mock_scalars.all.return_value = fake_users_db  # ✅
+    mock_mappings = MagicMock()
+    mock_mappings.all.return_value = fake_rows  # ✅ linhas projetadas, sem UserDB
 
     mock_result = MagicMock()
-    mock_result.scalars.return_value = mock_scalars
+    mock_result.mappings.return_value = mock_mappings
 
     mock_session.execute.return_value = mock_result
 
@@ -84,41 +105,472 @@ async def test_save_user(user_repository, mock_session):
     assert result.name == "Alice"
 
 
+def _returning(value):
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = value
+    return result
+
+
+def _selected(value):
+    result = MagicMock()
+    result.scalars.return_value.first.return_value = value
+    return result
+
+
 @pytest.mark.asyncio
 async def test_delete_user(user_repository, mock_session):
-    user_id = "1"
-    fake_user_db = UserDB(id=user_id, name="ToDelete", email="del@example.com")
-    mock_session.get.return_value = fake_user_db
+    mock_session.execute.return_value = _returning("1")
 
-    result = await user_repository.delete(user_id)
+    result = await user_repository.delete("1")
 
     assert result is True
-    mock_session.get.assert_awaited_once_with(UserDB, user_id)
-    mock_session.delete.assert_awaited_once()  # <- relaxa a verificação
+    mock_session.execute.assert_awaited_once()
     mock_session.commit.assert_awaited_once()
 
 
 @pytest.mark.asyncio
 async def test_delete_user_not_found(user_repository, mock_session):
-    mock_session.get.return_value = None
+    mock_session.execute.return_value = _returning(None)
 
     result = await user_repository.delete("not-exist")
 
     assert result is False
     mock_session.delete.assert_not_called()
-    mock_session.commit.assert_not_called()
 
 
 @pytest.mark.asyncio
 async def test_update_user(user_repository, mock_session):
     user_id = "1"
-    fake_user_db = UserDB(id=user_id, name="ToUpdate", email="del@example.com")
-    mock_session.get.return_value = fake_user_db
+    mock_session.execute.return_value = _returning(
+        UserDB(id=user_id, name="UpdatedName", email="updated@example.com")
+    )
 
     data = {"id": "1", "name": "UpdatedName", "email": "updated@example.com"}
 
     result = await user_repository.update(user_id, data)
 
-    assert result == UserDB(id=user_id, name="UpdatedName", email="updated@example.com")
-    mock_session.get.assert_awaited_once_with(UserDB, user_id)
+    assert result == User(id=user_id, name="UpdatedName", email="updated@example.com")
+    mock_session.execute.assert_awaited_once()
     mock_session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_update_user_not_found(user_repository, mock_session):
+    mock_session.execute.return_value = _returning(None)
+
+    assert await user_repository.update("not-exist", {"name": "X"}) is None
+
+
+@pytest.mark.asyncio
+async def test_update_user_without_changes_reads_current(user_repository, mock_session):
+    mock_session.execute.return_value = _selected(UserDB(id="1", name="Alice"))
+
+    result = await user_repository.update("1", {"id": "2", "seq": 9, "unknown": "x"})
+
+    assert result == User(id="1", name="Alice")
+    mock_session.execute.assert_awaited_once()
+    mock_session.commit.assert_not_called()
+
+
+@pytest_asyncio.fixture
+async def sqlite_session(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.sqlite3'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    statements = []
+    event.listen(
+        engine.sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session, statements
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_update_and_delete_use_one_statement(sqlite_session):
+    session, statements = sqlite_session
+    repository = UserRepository(session)
+    await repository.save(User(id="1", name="Alice"))
+
+    statements.clear()
+    updated = await repository.update("1", {"email": "alice@example.com"})
+    assert updated == User(id="1", name="Alice", email="alice@example.com")
+    assert [s.split()[0] for s in statements] == ["UPDATE"]
+
+    statements.clear()
+    assert await repository.delete("1") is True
+    assert await repository.delete("1") is False
+    assert [s.split()[0] for s in statements] == ["DELETE", "DELETE"]
+    assert await repository.update("1", {"name": "Ghost"}) is None
+
+
+@pytest.mark.asyncio
+async def test_bulk_operations_report_per_item(sqlite_session):
+    session, statements = sqlite_session
+    repository = UserRepository(session)
+
+    saved = await repository.save_many(
+        [User(name="Alice"), User(id="bob", name="Bob", email="bob@example.com")]
+    )
+    assert saved[0].id is not None
+    assert saved[1] == User(id="bob", name="Bob", email="bob@example.com")
+    assert await repository.save_many([]) == []
+
+    updated = await repository.update_many(
+        {
+            saved[0].id: {"email": "alice@example.com"},
+            "bob": {"id": "x"},
+            "ghost": {"name": "Ghost"},
+        }
+    )
+    assert updated == {
+        saved[0].id: User(id=saved[0].id, name="Alice", email="alice@example.com"),
+        "bob": User(id="bob", name="Bob", email="bob@example.com"),
+        "ghost": None,
+    }
+
+    assert await repository.delete_many(["bob", "ghost"]) == {"bob"}
+    assert [user.name for user in await repository.find_all()] == ["Alice"]
+
+
+@pytest.mark.asyncio
+async def test_save_many_uses_one_insert(sqlite_session):
+    session, statements = sqlite_session
+    repository = UserRepository(session)
+    users = [User(name=f"User {i}") for i in range(1000)]
+
+    await repository.save_many(users)
+    inserts = [s for s in statements if s.startswith("INSERT")]
+    statements.clear()
+    for user in users[:10]:
+        await repository.save(User(name=user.name))
+
+    assert len(inserts) == 1  # executemany: um comando para o lote todo
+    assert len([s for s in statements if s.startswith("INSERT")]) == 10
+    assert len(await repository.find_all()) == 1010
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_benchmark_bulk_insert(sqlite_session):
+    session, _ = sqlite_session
+    repository = UserRepository(session)
+    users = [User(name=f"User {i}", email=f"user{i}@example.com") for i in range(20000)]
+
+    started = time.perf_counter()
+    await repository.save_many(users)
+    bulk = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for user in users[:200]:
+        await repository.save(User(name=user.name, email=user.email))
+    one_by_one = (time.perf_counter() - started) / 200 * len(users)
+
+    assert bulk < one_by_one, f"save_many={bulk:.2f}s save={one_by_one:.2f}s"
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor("0b7e-ä")) == "0b7e-ä"
+    with pytest.raises(ValueError):
+        decode_cursor("%%%")
+    with pytest.raises(ValueError):
+        decode_cursor("_w")  # 0xff não é UTF-8
+
+
+@pytest.mark.asyncio
+async def test_find_page_walks_table_by_key(sqlite_session):
+    session, statements = sqlite_session
+    repository = UserRepository(session)
+    await repository.save_many([User(id=f"{i:02d}", name=f"U{i}") for i in range(5)])
+
+    pages, cursor = [], None
+    while True:
+        users, cursor = await repository.find_page(2, cursor)
+        pages.append([user.id for user in users])
+        if cursor is None:
+            break
+
+    assert pages == [["00", "01"], ["02", "03"], ["04"]]
+    assert "LIMIT" in statements[-1]
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_ordered_chunks(sqlite_session):
+    session, _ = sqlite_session
+    repository = UserRepository(session)
+    await repository.save_many([User(id=f"{i:02d}", name=f"U{i}") for i in range(5)])
+
+    chunks = [[user.id for user in users] async for users in repository.stream(2)]
+
+    assert chunks == [["00", "01"], ["02", "03"], ["04"]]
+
+
+@pytest.mark.asyncio
+async def test_base_save_many_inserts_orm_entities(sqlite_session):
+    session, statements = sqlite_session
+    repository = BaseRepository(session, UserDB)
+
+    saved = await repository.save_many([UserDB(name="Alice"), UserDB(name="Bob")])
+
+    assert [statement.split()[0] for statement in statements].count("INSERT") == 1
+    assert set(await session.scalars(select(UserDB.id))) == {user.id for user in saved}
+
+
+@pytest.mark.asyncio
+async def test_listings_project_columns_without_tracking(sqlite_session):
+    session, statements = sqlite_session
+    repository = UserRepository(session)
+    await repository.save_many([User(id=f"{i:02d}", name=f"U{i}") for i in range(3)])
+    session.expunge_all()
+
+    statements.clear()
+    users = await repository.find_all()
+    page, _ = await repository.find_page(2)
+
+    assert users[:2] == page
+    assert "userdb.id, userdb.name, userdb.email" in statements[0]
+    assert not session.identity_map
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+@pytest.mark.parametrize("total", [10_000, 100_000])
+async def test_benchmark_projection_vs_orm(sqlite_session, total):
+    session, _ = sqlite_session
+    repository = UserRepository(session)
+    await repository.save_many(
+        [User(name=f"User {i}", email=f"user{i}@example.com") for i in range(total)]
+    )
+
+    session.expunge_all()
+    started = time.perf_counter()
+    hydrated = [
+        User.model_validate(user) for user in await session.scalars(select(UserDB))
+    ]
+    orm = (time.perf_counter() - started) / total
+    session.expunge_all()
+
+    started = time.perf_counter()
+    projected = await repository.find_all()
+    projection = (time.perf_counter() - started) / total
+
+    assert len(projected) == len(hydrated) == total
+    assert projection < orm
+
+
+@pytest.mark.asyncio
+async def test_reads_go_to_read_only_session(tmp_path):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'test.sqlite3'}"
+    writer = create_engine(url, pool_size=1, max_overflow=0)
+    reader = create_engine(url, read_only=True)
+    await migrate(writer)
+    executed = {writer: [], reader: []}
+    for engine, statements in executed.items():
+        event.listen(
+            engine.sync_engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args, log=statements: log.append(
+                statement
+            ),
+        )
+    try:
+        async with (
+            AsyncSession(writer, expire_on_commit=False) as session,
+            AsyncSession(reader) as read_session,
+        ):
+            repository = UserRepository(session, read_session=read_session)
+            saved = await repository.save(User(name="Alice", email="a@example.com"))
+            executed[writer].clear()
+
+            assert await repository.get(saved.id) == saved
+            assert await repository.get_by_email("a@example.com") == saved
+            assert await repository.search("alice", 10) == [saved]
+            assert await repository.find_all() == [saved]
+            assert await repository.changes_since(None) == (0, set())
+            assert executed[writer] == []
+            assert len(executed[reader]) == 5
+    finally:
+        await reader.dispose()
+        await writer.dispose()
+
+
+@pytest.mark.asyncio
+async def test_get_by_email_uses_index(sqlite_session):
+    session, statements = sqlite_session
+    repository = UserRepository(session)
+    await repository.save_many(
+        [User(id="1", name="Alice", email="alice@example.com"), User(name="Bob")]
+    )
+
+    assert await repository.get_by_email("alice@example.com") == User(
+        id="1", name="Alice", email="alice@example.com"
+    )
+    assert await repository.get_by_email("ghost@example.com") is None
+
+    conn = await session.connection()
+    plan = await conn.exec_driver_sql(
+        f"EXPLAIN QUERY PLAN {statements[-1]}", ("x", 1, 0)
+    )
+    assert "ix_userdb_email" in " ".join(row[-1] for row in plan)
+
+
+def test_fts_prefix_query_quotes_terms():
+    assert fts_prefix_query('ali "OR" ex.com') == '"ali"* "OR"* "ex"* "com"*'
+    assert fts_prefix_query("  ** ") == ""
+
+
+@pytest.mark.asyncio
+async def test_search_follows_table_changes(sqlite_session):
+    session, _ = sqlite_session
+    await migrate(session.bind)
+    repository = UserRepository(session)
+    await repository.save_many(
+        [
+            User(id="1", name="Alice Souza", email="alice@example.com"),
+            User(id="2", name="João Alves", email="joao@empresa.com"),
+            User(id="3", name="Bob", email="bob@alice.dev"),
+        ]
+    )
+
+    assert [u.id for u in await repository.search("ali", 10)] == ["1", "3"]
+    assert [u.id for u in await repository.search("joao EMP", 10)] == ["2"]
+    assert [u.id for u in await repository.search("ali", 1, offset=1)] == ["3"]
+    assert await repository.search("***", 10) == []
+
+    await repository.update("2", {"name": "Maria"})
+    await repository.delete("1")
+    assert [u.id for u in await repository.search("ali", 10)] == ["3"]
+    assert [u.id for u in await repository.search("mar", 10)] == ["2"]
+    assert await repository.search("alves", 10) == []
+
+
+@pytest.mark.asyncio
+async def test_changes_since_lists_updated_and_deleted_ids(sqlite_session):
+    session, _ = sqlite_session
+    await migrate(session.bind)
+    repository = UserRepository(session)
+    await repository.save_many([User(id=str(i), name=f"U{i}") for i in range(3)])
+    assert await repository.changes_since(None) == (0, set())
+
+    await repository.update("1", {"name": "A"})
+    await repository.update_many({"1": {"name": "B"}, "2": {"name": "C"}})
+    await repository.delete("0")
+
+    assert await repository.changes_since(0) == (4, {"0", "1", "2"})
+    assert await repository.changes_since(3) == (4, {"0"})
+    assert await repository.changes_since(4) == (4, set())
+    # Log podado além da versão pedida, ou banco trocado: não há como saber
+    assert await repository.changes_since(4 - CHANGE_LOG_SIZE - 1) == (4, None)
+    assert await repository.changes_since(5) == (4, None)
+
+
+@pytest.mark.asyncio
+async def test_search_survives_vacuum(sqlite_session):
+    session, _ = sqlite_session
+    await migrate(session.bind)
+    repository = UserRepository(session)
+    await repository.save_many(
+        [User(id=str(i), name=f"User {i}", email=f"user{i}@x.com") for i in range(5)]
+    )
+    await repository.delete("0")
+    await repository.delete("2")
+    await session.commit()
+
+    # ✅ O VACUUM pode renumerar o rowid implícito; `seq` não muda
+    async with session.bind.connect() as conn:
+        await conn.exec_driver_sql("VACUUM")
+
+    assert [u.id for u in await repository.search("user4", 10)] == ["4"]
+    assert [u.id for u in await repository.search("user", 10)] == ["1", "3", "4"]
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_benchmark_search(sqlite_session):
+    session, _ = sqlite_session
+    await migrate(session.bind)
+    repository = UserRepository(session)
+    rows = 100_000
+    await repository.save_many(
+        [User(name=f"User {i}", email=f"user{i}@example.com") for i in range(rows)]
+    )
+    await repository.save(User(name="Zelda Needle", email="zelda@needle.io"))
+
+    started = time.perf_counter()
+    for _ in range(20):
+        found = await repository.search("zel need", 20)
+    elapsed = (time.perf_counter() - started) / 20
+
+    assert [user.name for user in found] == ["Zelda Needle"]
+    assert elapsed < 0.05
+
+
+@pytest.mark.asyncio
+async def test_duplicate_email_raises_domain_error(sqlite_session):
+    session, _ = sqlite_session
+    await migrate(session.bind, unique_email=True)
+    repository = UserRepository(session)
+    await repository.save(User(id="1", name="Alice", email="alice@example.com"))
+    await repository.save(User(id="2", name="Bob", email="bob@example.com"))
+
+    with pytest.raises(DuplicateEmailError):
+        await repository.save(User(name="Outra", email="alice@example.com"))
+    with pytest.raises(DuplicateEmailError):
+        await repository.update("2", {"email": "alice@example.com"})
+    with pytest.raises(DuplicateEmailError):
+        await repository.save_many([User(name="X", email="bob@example.com")])
+    with pytest.raises(DuplicateEmailError):
+        await repository.update_many({"2": {"email": "alice@example.com"}})
+    # Outras violações de integridade seguem como estão
+    with pytest.raises(IntegrityError):
+        await repository.save_many([User(id="1", name="Clone")])
+    await session.rollback()
+
+    assert await repository.get("2") == User(
+        id="2", name="Bob", email="bob@example.com"
+    )
+
+
+@pytest.mark.asyncio
+async def test_duplicate_email_with_write_batcher_keeps_session_usable(
+    sqlite_session,
+):
+    session, _ = sqlite_session
+    await migrate(session.bind, unique_email=True)
+    factory = async_sessionmaker(session.bind, expire_on_commit=False)
+    batcher = WriteBatcher(factory, max_delay=0)
+    repository = UserRepository(session, write_batcher=batcher)
+    try:
+        await repository.save(User(id="1", name="Alice", email="alice@example.com"))
+        await repository.save(User(id="2", name="Bob", email="bob@example.com"))
+
+        with pytest.raises(DuplicateEmailError):
+            await repository.save(User(name="Outra", email="alice@example.com"))
+        with pytest.raises(DuplicateEmailError):
+            await repository.update("2", {"email": "alice@example.com"})
+        # Lotes usam a sessão da requisição: sem rollback ela manteria o lock
+        # de escrita do SQLite e o batcher não conseguiria mais gravar
+        with pytest.raises(DuplicateEmailError):
+            await repository.save_many([User(name="X", email="bob@example.com")])
+        await repository.save(User(id="3", name="Carol"))
+        with pytest.raises(DuplicateEmailError):
+            await repository.update_many({"2": {"email": "alice@example.com"}})
+        await repository.save(User(id="4", name="Dave"))
+    finally:
+        await batcher.close()
+
+    assert {user.id for user in await repository.find_all()} == {"1", "2", "3", "4"}
+
+
+@pytest.mark.asyncio
+async def test_isolated_repository_uses_its_own_session(sqlite_session):
+    session, _ = sqlite_session
+    await UserRepository(session).save(User(id="1", name="Alice"))
+    await session.commit()
+    factory = async_sessionmaker(session.bind, expire_on_commit=False)
+
+    async with isolated_user_repository(factory) as repository:
+        assert repository.read_session is not session
+        assert await repository.get("1") == User(id="1", name="Alice")
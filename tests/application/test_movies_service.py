@@ -1,9 +1,13 @@
+import asyncio
 from unittest.mock import AsyncMock, Mock
 
 import pytest
+from httpx import HTTPStatusError, Request, Response
 
-from application.movie_service import MovieService
+from application.movie_service import MovieService, batch_semaphore
 from domain.movie import Movie
+from infrastructure.cache.memory_cache import MemoryCache
+from infrastructure.cache.read_through_cache import ReadThroughCache
 
 
 @pytest.fixture
@@ -107,3 +111,198 @@ async def test_get_not_found(movie_service, mock_gateway):
     # Assert
     mock_gateway.get.assert_awaited_once_with(999)
     assert result is None
+
+
+@pytest.fixture
+def cached_movie_service(mock_gateway, mock_logger):
+    cache = ReadThroughCache(MemoryCache(max_entries=10), logger=mock_logger)
+    return MovieService(gateway=mock_gateway, logger=mock_logger, cache=cache)
+
+
+@pytest.mark.asyncio
+async def test_get_served_from_cache(cached_movie_service, mock_gateway):
+    # Arrange
+    movie = Movie(
+        id=1,
+        title="Matrix",
+        poster_path="url",
+        overview="Neo",
+        release_date="1999-03-31",
+    )
+    mock_gateway.get.return_value = movie
+
+    # Act
+    first = await cached_movie_service.get(1)
+    second = await cached_movie_service.get(1)
+
+    # Assert
+    mock_gateway.get.assert_awaited_once_with(1)
+    assert first == second == movie
+    assert cached_movie_service.cache.cache.stats.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_popular_served_from_cache(cached_movie_service, mock_gateway):
+    # Arrange
+    mock_gateway.popular.return_value = []
+
+    # Act
+    await cached_movie_service.popular()
+    await cached_movie_service.popular()
+
+    # Assert
+    mock_gateway.popular.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_get_not_found_is_not_cached(cached_movie_service, mock_gateway):
+    # Arrange
+    mock_gateway.get.return_value = None
+
+    # Act
+    await cached_movie_service.get(999)
+    result = await cached_movie_service.get(999)
+
+    # Assert
+    assert mock_gateway.get.await_count == 2
+    assert result is None
+
+
+def make_movie(id):
+    return Movie(
+        id=id,
+        title=f"Movie {id}",
+        poster_path="url",
+        overview="Overview",
+        release_date="2024-01-01",
+    )
+
+
+def status_error(status_code):
+    request = Request("GET", "https://fakeapi.com")
+    return HTTPStatusError(
+        "Erro", request=request, response=Response(status_code, request=request)
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_many_returns_partial_results(movie_service, mock_gateway):
+    # Arrange
+    outcomes = {
+        1: make_movie(1),
+        2: None,
+        3: status_error(404),
+        4: status_error(503),
+        5: ConnectionError("down"),
+    }
+
+    async def get(id):
+        outcome = outcomes[id]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    mock_gateway.get.side_effect = get
+
+    # Act
+    result = await movie_service.get_many([1, 2, 3, 4, 5, 1])
+
+    # Assert
+    assert mock_gateway.get.await_count == 5
+    assert result.movies == [make_movie(1)]
+    assert result.errors == {
+        2: "Movie Not Found",
+        3: "Movie Not Found",
+        4: "Upstream error (503)",
+        5: "Upstream unavailable",
+    }
+
+
+@pytest.mark.asyncio
+async def test_get_many_limits_upstream_concurrency(mock_gateway, mock_logger):
+    # Arrange
+    service = MovieService(
+        gateway=mock_gateway, logger=mock_logger, batch_concurrency=3
+    )
+    running = 0
+    peak = 0
+
+    async def get(id):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return make_movie(id)
+
+    mock_gateway.get.side_effect = get
+
+    # Act
+    result = await service.get_many(list(range(20)))
+
+    # Assert
+    assert len(result.movies) == 20
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_get_many_limit_is_shared_between_requests(mock_gateway, mock_logger):
+    # Arrange: cada requisição recebe um MovieService novo (Factory)
+    semaphore = batch_semaphore(3)
+    services = [
+        MovieService(gateway=mock_gateway, logger=mock_logger, semaphore=semaphore)
+        for _ in range(4)
+    ]
+    running = 0
+    peak = 0
+
+    async def get(id):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return make_movie(id)
+
+    mock_gateway.get.side_effect = get
+
+    # Act
+    results = await asyncio.gather(
+        *(service.get_many(list(range(5))) for service in services)
+    )
+
+    # Assert
+    assert all(len(result.movies) == 5 for result in results)
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_get_many_reports_cancelled_lookups(movie_service, mock_gateway):
+    # Arrange
+    async def get(id):
+        if id == 2:
+            raise asyncio.CancelledError()
+        return make_movie(id)
+
+    mock_gateway.get.side_effect = get
+
+    # Act
+    result = await movie_service.get_many([1, 2])
+
+    # Assert
+    assert result.movies == [make_movie(1)]
+    assert result.errors == {2: "Upstream unavailable"}
+
+
+@pytest.mark.asyncio
+async def test_get_many_serves_hits_from_cache(cached_movie_service, mock_gateway):
+    # Arrange
+    mock_gateway.get.side_effect = make_movie
+    await cached_movie_service.get(1)
+
+    # Act
+    result = await cached_movie_service.get_many([1, 2])
+
+    # Assert
+    assert [movie.id for movie in result.movies] == [1, 2]
+    assert mock_gateway.get.await_count == 2
@@ -0,0 +1,98 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from application.todo_index import TodoIndex, TodoSnapshot
+from domain.todo import ToDo
+
+TODOS = [
+    ToDo(id=1, userId=1, title="Comprar pão", completed=False),
+    ToDo(id=2, userId=1, title="Estudar Python", completed=True),
+    ToDo(id=3, userId=2, title="Lavar o carro", completed=True),
+]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_snapshot_lookup_by_id():
+    snapshot = TodoSnapshot(TODOS)
+
+    assert snapshot.get(2) == TODOS[1]
+    assert snapshot.get(99) is None
+
+
+@pytest.mark.parametrize(
+    "user_id,completed,expected_ids",
+    [
+        (None, None, [1, 2, 3]),
+        (1, None, [1, 2]),
+        (None, True, [2, 3]),
+        (1, True, [2]),
+        (1, False, [1]),
+        (42, None, []),
+    ],
+)
+def test_snapshot_find(user_id, completed, expected_ids):
+    snapshot = TodoSnapshot(TODOS)
+
+    result = snapshot.find(user_id=user_id, completed=completed)
+
+    assert [todo.id for todo in result] == expected_ids
+
+
+@pytest.mark.asyncio
+async def test_index_reuses_snapshot_until_too_old():
+    clock = FakeClock()
+    index = TodoIndex(max_age=10, clock=clock)
+    loader = AsyncMock(side_effect=lambda: list(TODOS))
+
+    first = await index.snapshot(loader)
+    clock.now = 5
+    second = await index.snapshot(loader)
+    clock.now = 11
+    third = await index.snapshot(loader)
+
+    assert first is second
+    assert third is not first
+    assert loader.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_index_keeps_indexes_when_loader_returns_same_list():
+    clock = FakeClock()
+    index = TodoIndex(max_age=10, clock=clock)
+    loader = AsyncMock(return_value=TODOS)
+
+    first = await index.snapshot(loader)
+    clock.now = 20
+    second = await index.snapshot(loader)
+
+    assert second is first
+    assert second.loaded_at == 20
+
+
+@pytest.mark.asyncio
+async def test_concurrent_refreshes_share_one_load():
+    index = TodoIndex()
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return TODOS
+
+    await asyncio.gather(*(index.snapshot(loader) for _ in range(10)))
+
+    assert calls == 1
+
+
+def test_index_default_max_age():
+    assert TodoIndex(max_age=None).max_age == 60.0
@@ -2,8 +2,11 @@ from unittest.mock import AsyncMock, Mock
 
 import pytest
 
+from application.todo_index import TodoIndex
 from application.todo_service import TodoService
 from domain.todo import ToDo
+from infrastructure.cache.memory_cache import MemoryCache
+from infrastructure.cache.read_through_cache import ReadThroughCache
 
 
 @pytest.fixture
@@ -66,3 +69,78 @@ async def test_get_not_found(todo_service, mock_gateway):
     # Assert
     mock_gateway.get.assert_awaited_once_with(999)
     assert result is None
+
+
+@pytest.mark.asyncio
+async def test_find_all_served_from_cache(mock_gateway, mock_logger):
+    # Arrange
+    cache = ReadThroughCache(MemoryCache(), logger=mock_logger)
+    todo_service = TodoService(gateway=mock_gateway, logger=mock_logger, cache=cache)
+    todos = [ToDo(id=1, userId=1, title="Comprar pão", completed=False)]
+    mock_gateway.find_all.return_value = todos
+
+    # Act
+    await todo_service.find_all()
+    result = await todo_service.find_all()
+
+    # Assert
+    mock_gateway.find_all.assert_awaited_once()
+    assert result == todos
+
+
+@pytest.mark.asyncio
+async def test_get_reads_from_index(mock_gateway, mock_logger):
+    # Arrange
+    todos = [
+        ToDo(id=1, userId=1, title="Comprar pão", completed=False),
+        ToDo(id=2, userId=2, title="Estudar Python", completed=True),
+    ]
+    mock_gateway.find_all.return_value = todos
+    todo_service = TodoService(
+        gateway=mock_gateway, logger=mock_logger, index=TodoIndex()
+    )
+
+    # Act
+    found = await todo_service.get(2)
+    missing = await todo_service.get(99)
+
+    # Assert
+    assert found == todos[1]
+    assert missing is None
+    mock_gateway.find_all.assert_awaited_once()
+    mock_gateway.get.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_find_by_uses_index(mock_gateway, mock_logger):
+    # Arrange
+    todos = [
+        ToDo(id=1, userId=1, title="Comprar pão", completed=False),
+        ToDo(id=2, userId=1, title="Estudar Python", completed=True),
+    ]
+    mock_gateway.find_all.return_value = todos
+    todo_service = TodoService(
+        gateway=mock_gateway, logger=mock_logger, index=TodoIndex()
+    )
+
+    # Act
+    result = await todo_service.find_by(user_id=1, completed=True)
+
+    # Assert
+    assert result == [todos[1]]
+
+
+@pytest.mark.asyncio
+async def test_find_by_without_index(todo_service, mock_gateway):
+    # Arrange
+    todos = [
+        ToDo(id=1, userId=1, title="Comprar pão", completed=False),
+        ToDo(id=2, userId=2, title="Estudar Python", completed=True),
+    ]
+    mock_gateway.find_all.return_value = todos
+
+    # Act
+    result = await todo_service.find_by(user_id=2)
+
+    # Assert
+    assert result == [todos[1]]
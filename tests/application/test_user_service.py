@@ -1,9 +1,16 @@
+from contextlib import asynccontextmanager
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 
-from application.user_service import UserService
-from domain.user import User
+from adapters.out.database.user_repository import UserRepository
+from application.user_service import MAX_REPORTED_ERRORS, UserService
+from domain.user import User, UserImportError
+from infrastructure.cache.change_tracker import ChangeTracker
+from infrastructure.cache.memory_cache import MemoryCache
+from infrastructure.cache.read_through_cache import ReadThroughCache
+from infrastructure.database.migrations import migrate
 
 
 @pytest.fixture
@@ -82,3 +89,206 @@ async def test_update_user(user_service, mock_repo):
 
     mock_repo.update.assert_awaited_once_with("id_01", user)
     assert result is True
+
+
+@pytest.mark.asyncio
+async def test_save_many(user_service, mock_repo):
+    users = [User(id="1", name="Alice"), User(id="2", name="Bob")]
+    mock_repo.save_many.return_value = users
+
+    result = await user_service.save_many(users)
+
+    assert [(item.id, item.status, item.user) for item in result] == [
+        ("1", 201, users[0]),
+        ("2", 201, users[1]),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_update_many_reports_missing(user_service, mock_repo):
+    alice = User(id="1", name="Alice")
+    mock_repo.update_many.return_value = {"1": alice, "2": None}
+
+    result = await user_service.update_many({"1": {"name": "Alice"}, "2": {}})
+
+    assert [(item.id, item.status, item.user) for item in result] == [
+        ("1", 200, alice),
+        ("2", 404, None),
+    ]
+    assert result[1].detail == "Usuário não encontrado"
+
+
+@pytest.mark.asyncio
+async def test_delete_many_reports_missing(user_service, mock_repo):
+    mock_repo.delete_many.return_value = {"1"}
+
+    result = await user_service.delete_many(["1", "2", "1"])
+
+    assert [(item.id, item.status) for item in result] == [("1", 204), ("2", 404)]
+    mock_repo.delete_many.assert_awaited_once_with(["1", "2", "1"])
+
+
+@pytest.mark.asyncio
+async def test_find_page(user_service, mock_repo):
+    users = [User(id="1", name="Alice")]
+    mock_repo.find_page.return_value = (users, "cursor")
+
+    assert await user_service.find_page(1, "prev") == (users, "cursor")
+    mock_repo.find_page.assert_awaited_once_with(1, "prev")
+
+
+@pytest.mark.asyncio
+async def test_export_streams_repository_chunks(user_service, mock_repo):
+    chunks = [[User(id="1", name="Alice")], [User(id="2", name="Bob")]]
+
+    async def stream(chunk_size):
+        for chunk in chunks:
+            yield chunk
+
+    mock_repo.stream = MagicMock(side_effect=stream)
+
+    assert [users async for users in user_service.export(1)] == chunks
+    mock_repo.stream.assert_called_once_with(1)
+
+
+@pytest.mark.asyncio
+async def test_import_users_saves_batches_and_caps_errors(user_service, mock_repo):
+    async def batches():
+        yield (
+            [User(id="x", name="Alice")],
+            [UserImportError(line=i, detail="erro") for i in range(1, 80)],
+        )
+        yield [], [UserImportError(line=i, detail="erro") for i in range(80, 160)]
+
+    report = await user_service.import_users(batches())
+
+    assert report.imported == 1
+    assert report.failed == 159
+    assert len(report.errors) == MAX_REPORTED_ERRORS
+    mock_repo.save_many.assert_awaited_once_with([User(name="Alice")])
+
+
+@pytest.mark.asyncio
+async def test_get_by_email(user_service, mock_repo):
+    user = User(id="1", name="Alice", email="alice@example.com")
+    mock_repo.get_by_email.return_value = user
+
+    assert await user_service.get_by_email("alice@example.com") == user
+    mock_repo.get_by_email.assert_awaited_once_with("alice@example.com")
+
+
+@pytest.mark.asyncio
+async def test_search(user_service, mock_repo):
+    users = [User(id="1", name="Alice")]
+    mock_repo.search.return_value = users
+
+    assert await user_service.search("ali", 10, 5) == users
+    mock_repo.search.assert_awaited_once_with("ali", 10, 5)
+
+
+@pytest.fixture
+def cached_service(mock_repo, mock_logger):
+    store = MemoryCache(default_ttl=60)
+    return UserService(
+        user_repository=mock_repo,
+        logger=mock_logger,
+        cache=ReadThroughCache(store, logger=mock_logger),
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_is_cached_and_writes_invalidate(cached_service, mock_repo):
+    alice = User(id="1", name="Alice")
+    mock_repo.get.return_value = alice
+
+    assert await cached_service.get("1") == alice
+    assert await cached_service.get("1") == alice
+    assert mock_repo.get.await_count == 1
+    assert cached_service.cache.cache.stats.hit_ratio == 0.5
+
+    for write in (
+        lambda: cached_service.update("1", {"name": "A"}),
+        lambda: cached_service.delete("1"),
+        lambda: cached_service.update_many({"1": {"name": "A"}}),
+        lambda: cached_service.delete_many(["1"]),
+    ):
+        mock_repo.delete_many.return_value = {"1"}
+        mock_repo.update_many.return_value = {"1": alice}
+        calls = mock_repo.get.await_count
+        await write()
+        await cached_service.get("1")
+        assert mock_repo.get.await_count == calls + 1
+
+
+@pytest.mark.asyncio
+async def test_cache_follows_writes_from_other_processes(tmp_path, mock_logger):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite3'}"
+    engines = [create_async_engine(url), create_async_engine(url)]
+    await migrate(engines[0])
+    clock_now = [0.0]
+
+    store_a = MemoryCache(default_ttl=60)
+
+    def worker(engine, store):
+        session = AsyncSession(engine, expire_on_commit=False)
+        service = UserService(
+            UserRepository(session),
+            mock_logger,
+            cache=ReadThroughCache(store, logger=mock_logger),
+            change_tracker=ChangeTracker(interval=1.0, clock=lambda: clock_now[0]),
+        )
+        return session, service
+
+    session_a, worker_a = worker(engines[0], store_a)
+    session_b, worker_b = worker(engines[1], MemoryCache(default_ttl=60))
+    try:
+        await worker_a.save_many([User(id="1", name="Alice"), User(id="2", name="Bob")])
+        assert (await worker_a.get("1")).name == "Alice"
+        assert (await worker_a.get("2")).name == "Bob"
+
+        await worker_b.update("1", {"name": "Alicia"})
+        assert (await worker_a.get("1")).name == "Alice"  # ainda no intervalo
+
+        clock_now[0] = 1.0
+        await session_a.rollback()  # encerra a transação de leitura anterior
+        assert (await worker_a.get("1")).name == "Alicia"
+        # ✅ Só a chave alterada sai do cache
+        assert store_a.get("users:2") == User(id="2", name="Bob")
+    finally:
+        await session_a.close()
+        await session_b.close()
+        for engine in engines:
+            await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_stale_change_log_clears_cache(cached_service, mock_repo):
+    cached_service.change_tracker = ChangeTracker(interval=0.0)
+    mock_repo.changes_since.side_effect = [(1, set()), (9, None)]
+    mock_repo.get.return_value = User(id="1", name="Alice")
+
+    await cached_service.get("1")
+    await cached_service.get("1")
+
+    assert mock_repo.get.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_loads_with_own_repository(mock_repo, mock_logger):
+    loader_repo = AsyncMock()
+    loader_repo.get.return_value = User(id="1", name="Alice")
+
+    @asynccontextmanager
+    async def loader_repository():
+        yield loader_repo
+
+    service = UserService(
+        user_repository=mock_repo,
+        logger=mock_logger,
+        cache=ReadThroughCache(MemoryCache(), logger=mock_logger),
+        loader_repository=loader_repository,
+    )
+
+    assert await service.get("1") == User(id="1", name="Alice")
+    loader_repo.get.assert_awaited_once_with("1")
+    mock_repo.get.assert_not_awaited()
@@ -0,0 +1,20 @@
+import pytest
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--benchmark",
+        action="store_true",
+        default=False,
+        help="roda também os testes marcados com @pytest.mark.benchmark",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    # ✅ Medições de tempo ficam fora da execução padrão (e do CI)
+    if config.getoption("--benchmark"):
+        return
+    skip = pytest.mark.skip(reason="benchmark: rode com --benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
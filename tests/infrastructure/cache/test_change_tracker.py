@@ -0,0 +1,36 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from infrastructure.cache.change_tracker import ChangeTracker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_reports_changed_keys_at_most_once_per_interval():
+    clock = FakeClock()
+    tracker = ChangeTracker(interval=1.0, clock=clock)
+    load_changes = AsyncMock(side_effect=[(1, set()), (3, {"a", "b"}), (9, None)])
+
+    assert await tracker.changes(load_changes) == set()  # primeira leitura
+    clock.now = 0.5
+    assert await tracker.changes(load_changes) == set()  # dentro do intervalo
+    assert load_changes.await_count == 1
+
+    clock.now = 1.0
+    assert await tracker.changes(load_changes) == {"a", "b"}
+    clock.now = 2.0
+    assert await tracker.changes(load_changes) is None
+    assert [call.args for call in load_changes.await_args_list] == [
+        (None,),
+        (1,),
+        (3,),
+    ]
+    assert tracker.version == 9
@@ -0,0 +1,146 @@
+import pytest
+
+from infrastructure.cache.memory_cache import MemoryCache, pickle_size
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def test_get_returns_cached_value_and_counts_hits(clock):
+    cache = MemoryCache(clock=clock)
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+    assert cache.stats.hit_ratio == 0.5
+    assert cache.stats.snapshot() == {
+        "hits": 1,
+        "misses": 1,
+        "evictions": 0,
+        "expirations": 0,
+        "stale_hits": 0,
+        "hit_ratio": 0.5,
+    }
+
+
+def test_hit_ratio_without_lookups(clock):
+    assert MemoryCache(clock=clock).stats.hit_ratio == 0.0
+
+
+def test_entry_expires_after_ttl(clock):
+    cache = MemoryCache(default_ttl=10, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=100)
+
+    clock.now = 10
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert cache.stats.expirations == 1
+    assert len(cache) == 1
+
+
+def test_entry_without_ttl_never_expires(clock):
+    cache = MemoryCache(default_ttl=None, clock=clock)
+    cache.set("a", 1)
+
+    clock.now = 1_000_000
+    assert cache.get("a") == 1
+
+
+def test_evicts_least_recently_used_entry(clock):
+    cache = MemoryCache(max_entries=2, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats.evictions == 1
+
+
+def test_respects_max_bytes(clock):
+    cache = MemoryCache(max_entries=None, max_bytes=10, sizeof=len, clock=clock)
+    cache.set("a", "12345")
+    cache.set("b", "12345")
+    cache.set("c", "1")
+
+    assert cache.get("a") is None
+    assert cache.size_bytes == 6
+    assert cache.stats.evictions == 1
+
+
+def test_value_larger_than_max_bytes_is_not_stored(clock):
+    cache = MemoryCache(max_bytes=3, sizeof=len, clock=clock)
+    cache.set("a", "1")
+    cache.set("a", "12345")
+
+    assert cache.get("a") is None
+    assert cache.size_bytes == 0
+
+
+def test_overwrite_updates_size(clock):
+    cache = MemoryCache(max_bytes=100, sizeof=len, clock=clock)
+    cache.set("a", "1234")
+    cache.set("a", "12")
+
+    assert cache.get("a") == "12"
+    assert cache.size_bytes == 2
+
+
+def test_delete_and_clear(clock):
+    cache = MemoryCache(max_bytes=100, sizeof=len, clock=clock)
+    cache.set("a", "1")
+    cache.set("b", "2")
+
+    cache.delete("a")
+    cache.delete("missing")
+    assert cache.get("a") is None
+    assert cache.size_bytes == 1
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.size_bytes == 0
+
+
+def test_pickle_size():
+    assert pickle_size({"a": 1}) > 0
+
+
+def test_get_entry_returns_stale_entry_within_max_stale(clock):
+    cache = MemoryCache(default_ttl=10, max_stale=20, clock=clock)
+    cache.set("a", 1)
+
+    clock.now = 15
+    assert cache.get("a") is None
+    entry = cache.get_entry("a")
+    assert entry.value == 1
+    assert not entry.is_fresh(clock.now)
+    assert cache.stats.stale_hits == 1
+
+    clock.now = 30
+    assert cache.get_entry("a") is None
+    assert cache.stats.expirations == 1
+
+
+def test_get_entry_counts_hits_and_misses(clock):
+    cache = MemoryCache(clock=clock)
+    cache.set("a", 1)
+
+    assert cache.get_entry("a").is_fresh(clock.now)
+    assert cache.get_entry("b") is None
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
@@ -0,0 +1,206 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+
+from infrastructure.cache.memory_cache import MemoryCache
+from infrastructure.cache.read_through_cache import (
+    ReadThroughCache,
+    is_upstream_failure,
+)
+from infrastructure.database.instrumentation import QueryStats, query_stats_ctx_var
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def http_error(status_code):
+    request = httpx.Request("GET", "https://fakeapi.com")
+    return httpx.HTTPStatusError(
+        "Erro", request=request, response=httpx.Response(status_code, request=request)
+    )
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def logger():
+    return MagicMock()
+
+
+@pytest.fixture
+def cache(clock, logger):
+    store = MemoryCache(default_ttl=10, max_stale=100, clock=clock)
+    return ReadThroughCache(store, logger=logger, stale_while_revalidate=30)
+
+
+@pytest.mark.asyncio
+async def test_loads_once_and_serves_fresh_value(cache):
+    loader = AsyncMock(return_value="v1")
+
+    assert await cache.get_or_load("k", loader) == "v1"
+    assert await cache.get_or_load("k", loader) == "v1"
+    loader.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_none_is_not_cached(cache):
+    loader = AsyncMock(return_value=None)
+
+    await cache.get_or_load("k", loader)
+    await cache.get_or_load("k", loader)
+
+    assert loader.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_stale_value_is_served_and_refreshed_in_background(cache, clock):
+    await cache.get_or_load("k", AsyncMock(return_value="v1"))
+    clock.now = 15
+    release = asyncio.Event()
+
+    async def slow_loader():
+        await release.wait()
+        return "v2"
+
+    assert await cache.get_or_load("k", slow_loader) == "v1"
+    assert await cache.get_or_load("k", slow_loader) == "v1"
+    assert len(cache._revalidating) == 1
+
+    release.set()
+    await asyncio.gather(*cache._revalidating.values())
+    assert await cache.get_or_load("k", slow_loader) == "v2"
+
+
+@pytest.mark.asyncio
+async def test_background_refresh_runs_outside_the_request_context(cache, clock):
+    await cache.get_or_load("k", AsyncMock(return_value="v1"))
+    clock.now = 15
+    query_stats_ctx_var.set(QueryStats())
+    seen = []
+
+    async def loader():
+        seen.append(query_stats_ctx_var.get())
+        return "v2"
+
+    assert await cache.get_or_load("k", loader) == "v1"
+    await asyncio.gather(*cache._revalidating.values())
+    assert seen == [None]
+
+
+@pytest.mark.asyncio
+async def test_failed_revalidation_keeps_stale_value(cache, clock, logger):
+    await cache.get_or_load("k", AsyncMock(return_value="v1"))
+    clock.now = 15
+
+    assert await cache.get_or_load("k", AsyncMock(side_effect=http_error(503))) == "v1"
+    await asyncio.gather(*cache._revalidating.values())
+
+    logger.warning.assert_called_once()
+    assert cache.cache.get_entry("k").value == "v1"
+
+
+@pytest.mark.asyncio
+async def test_past_revalidate_window_loads_synchronously(cache, clock):
+    await cache.get_or_load("k", AsyncMock(return_value="v1"))
+    clock.now = 50
+
+    assert await cache.get_or_load("k", AsyncMock(return_value="v2")) == "v2"
+
+
+@pytest.mark.asyncio
+async def test_stale_if_error_on_upstream_failure(cache, clock, logger):
+    await cache.get_or_load("k", AsyncMock(return_value="v1"))
+    clock.now = 50
+
+    loader = AsyncMock(side_effect=httpx.ReadTimeout("timeout"))
+    assert await cache.get_or_load("k", loader) == "v1"
+    logger.warning.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_masked(cache, clock):
+    await cache.get_or_load("k", AsyncMock(return_value="v1"))
+    clock.now = 50
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await cache.get_or_load("k", AsyncMock(side_effect=http_error(404)))
+
+
+@pytest.mark.asyncio
+async def test_error_without_entry_is_raised(cache):
+    with pytest.raises(httpx.HTTPStatusError):
+        await cache.get_or_load("k", AsyncMock(side_effect=http_error(500)))
+
+
+@pytest.mark.asyncio
+async def test_entries_beyond_max_stale_are_never_served(cache, clock):
+    await cache.get_or_load("k", AsyncMock(return_value="v1"))
+    clock.now = 200
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await cache.get_or_load("k", AsyncMock(side_effect=http_error(500)))
+
+
+def test_is_upstream_failure():
+    assert is_upstream_failure(http_error(502))
+    assert not is_upstream_failure(http_error(404))
+    assert is_upstream_failure(httpx.ConnectError("refused"))
+    assert not is_upstream_failure(ValueError("boom"))
+
+
+@pytest.mark.asyncio
+async def test_invalidate_and_clear_drop_entries(cache):
+    await cache.get_or_load("a", AsyncMock(return_value="v1"))
+    await cache.get_or_load("b", AsyncMock(return_value="v1"))
+
+    cache.invalidate("a")
+    assert await cache.get_or_load("a", AsyncMock(return_value="v2")) == "v2"
+
+    cache.clear()
+    assert await cache.get_or_load("b", AsyncMock(return_value="v2")) == "v2"
+
+
+@pytest.mark.asyncio
+async def test_load_started_before_invalidation_is_not_cached(cache):
+    release = asyncio.Event()
+
+    async def slow_loader():
+        await release.wait()
+        return "old"
+
+    pending = asyncio.create_task(cache.get_or_load("k", slow_loader))
+    await asyncio.sleep(0)
+    cache.invalidate("k")
+    release.set()
+
+    assert await pending == "old"
+    assert await cache.get_or_load("k", AsyncMock(return_value="new")) == "new"
+
+
+@pytest.mark.asyncio
+async def test_load_after_invalidation_does_not_join_earlier_load(cache):
+    release = asyncio.Event()
+
+    async def slow_loader():
+        await release.wait()
+        return "old"
+
+    pending = asyncio.create_task(cache.get_or_load("k", slow_loader))
+    await asyncio.sleep(0)
+    cache.invalidate("k")
+
+    fresh = cache.get_or_load("k", AsyncMock(return_value="new"))
+    assert await asyncio.wait_for(fresh, timeout=1) == "new"
+    release.set()
+    assert await pending == "old"
+    assert await cache.get_or_load("k", AsyncMock(return_value="newer")) == "new"
@@ -0,0 +1,164 @@
+import asyncio
+import time
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+from dependency_injector import providers
+from fastapi import FastAPI
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlmodel import SQLModel
+
+from adapters.inbound.auth import require_auth
+from adapters.inbound.routes import user_router
+from infrastructure.container import Container
+from infrastructure.database.engine import (
+    SQLITE_PROFILES,
+    create_engine,
+    read_only_url,
+)
+from infrastructure.logger.logger import Logger
+
+
+def test_unknown_profile_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="Perfil SQLite desconhecido"):
+        create_engine(f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite3'}", profile="x")
+
+
+@pytest.mark.asyncio
+async def test_performance_profile_applies_pragmas(tmp_path):
+    engine = create_engine(f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite3'}")
+    try:
+        async with engine.connect() as conn:
+            journal_mode = await conn.scalar(text("PRAGMA journal_mode"))
+            synchronous = await conn.scalar(text("PRAGMA synchronous"))
+            busy_timeout = await conn.scalar(text("PRAGMA busy_timeout"))
+            temp_store = await conn.scalar(text("PRAGMA temp_store"))
+    finally:
+        await engine.dispose()
+
+    assert journal_mode == "wal"
+    assert synchronous == 1  # NORMAL
+    assert busy_timeout == 5000
+    assert temp_store == 2  # MEMORY
+
+
+@pytest.mark.asyncio
+async def test_explicit_zero_pool_settings_are_kept(tmp_path):
+    engine = create_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite3'}",
+        pool_size=0,
+        max_overflow=0,
+        pool_timeout=0,
+    )
+    try:
+        pool = engine.sync_engine.pool
+        assert (pool.size(), pool.overflow(), pool.timeout()) == (0, 0, 0)
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_default_profile_keeps_sqlite_defaults(tmp_path):
+    engine = create_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite3'}", profile="default"
+    )
+    try:
+        async with engine.connect() as conn:
+            assert await conn.scalar(text("PRAGMA journal_mode")) == "delete"
+    finally:
+        await engine.dispose()
+
+
+def test_read_only_url_uses_sqlite_uri():
+    assert read_only_url("sqlite+aiosqlite:////data/db.sqlite3") == (
+        "sqlite+aiosqlite:///file:/data/db.sqlite3?mode=ro&uri=true"
+    )
+    assert read_only_url("sqlite+aiosqlite://") == "sqlite+aiosqlite://"
+    assert read_only_url("sqlite+aiosqlite:///:memory:") == (
+        "sqlite+aiosqlite:///:memory:"
+    )
+
+
+@pytest.mark.asyncio
+async def test_read_only_engine_sees_writes_but_rejects_them(tmp_path):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite3'}"
+    writer = create_engine(url, pool_size=1, max_overflow=0)
+    reader = create_engine(url, read_only=True)
+    try:
+        async with writer.begin() as conn:
+            await conn.execute(text("CREATE TABLE t (x INTEGER)"))
+            await conn.execute(text("INSERT INTO t VALUES (1)"))
+        async with reader.connect() as conn:
+            assert await conn.scalar(text("SELECT count(*) FROM t")) == 1
+            assert await conn.scalar(text("PRAGMA query_only")) == 1
+            assert await conn.scalar(text("PRAGMA journal_mode")) == "wal"
+            with pytest.raises(OperationalError, match="readonly"):
+                await conn.execute(text("INSERT INTO t VALUES (2)"))
+    finally:
+        await reader.dispose()
+        await writer.dispose()
+
+
+def _sessionmaker(engine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+
+async def _mixed_users_load(path, profile: str, rounds: int = 10) -> float:
+    # Mesma divisão do Container: um escritor e um pool somente leitura
+    url = f"sqlite+aiosqlite:///{path}"
+    engine = create_engine(url, profile=profile, pool_size=1, max_overflow=0)
+    read_engine = create_engine(url, profile=profile, read_only=True)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    container = Container()
+    container.session_factory.override(providers.Object(_sessionmaker(engine)))
+    container.read_session_factory.override(
+        providers.Object(_sessionmaker(read_engine))
+    )
+    container.logger.override(MagicMock(spec=Logger))
+    app = FastAPI()
+    app.dependency_overrides[require_auth] = lambda: {"email": "test@example.com"}
+    app.container = container
+    app.include_router(user_router.router)
+
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            started = time.perf_counter()
+            for round in range(rounds):
+                responses = await asyncio.gather(
+                    *(
+                        client.post("/users/", json={"name": f"User {round}-{i}"})
+                        for i in range(5)
+                    ),
+                    *(client.get("/users/") for _ in range(15)),
+                )
+                assert all(response.status_code == 200 for response in responses)
+            return time.perf_counter() - started
+    finally:
+        await read_engine.dispose()
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_mixed_users_load_succeeds_with_single_writer(tmp_path):
+    await _mixed_users_load(tmp_path / "tuned.sqlite3", "performance", rounds=2)
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_benchmark_mixed_users_load(tmp_path):
+    baseline = await _mixed_users_load(tmp_path / "default.sqlite3", "default")
+    tuned = await _mixed_users_load(tmp_path / "tuned.sqlite3", "performance")
+
+    assert set(SQLITE_PROFILES) == {"default", "performance"}
+    # O ganho depende do custo de fsync do disco; aqui só garantimos que não piora
+    assert tuned < baseline * 1.5, (
+        f"default={baseline * 1000:.0f}ms performance={tuned * 1000:.0f}ms"
+    )
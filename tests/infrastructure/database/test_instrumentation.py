@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from infrastructure.database.engine import create_engine
+from infrastructure.database.instrumentation import (
+    QUERY_START_KEY,
+    QueryStats,
+    query_stats_ctx_var,
+)
+
+
+def test_query_stats_tracks_most_repeated_statement():
+    stats = QueryStats()
+    assert stats.most_repeated() is None
+
+    for statement in ["SELECT a", "SELECT b", "SELECT b"]:
+        stats.record(statement, 1.5)
+
+    assert stats.count == 3
+    assert stats.duration_ms == 4.5
+    assert stats.most_repeated() == ("SELECT b", 2)
+
+
+@pytest.mark.asyncio
+async def test_engine_records_queries_of_current_context(tmp_path):
+    engine = create_engine(f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite3'}")
+
+    async def request(queries: int) -> QueryStats:
+        stats = QueryStats()
+        query_stats_ctx_var.set(stats)
+        async with engine.connect() as conn:
+            for _ in range(queries):
+                await conn.execute(text("SELECT 1"))
+        return stats
+
+    try:
+        # Fora de uma requisição nada é registrado (nem os pragmas da conexão)
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+        first, second = await asyncio.gather(
+            asyncio.create_task(request(2)), asyncio.create_task(request(5))
+        )
+        assert (first.count, second.count) == (2, 5)
+        assert second.duration_ms > 0
+        assert second.most_repeated() == ("SELECT 1", 5)
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_failed_query_does_not_leak_timer(tmp_path):
+    engine = create_engine(f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite3'}")
+    try:
+        async with engine.connect() as conn:
+            with pytest.raises(OperationalError):
+                await conn.execute(text("SELECT * FROM missing"))
+            raw = await conn.get_raw_connection()
+            assert raw.info[QUERY_START_KEY] == []
+    finally:
+        await engine.dispose()
@@ -0,0 +1,172 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from adapters.out.database.models import UserDB
+from infrastructure.container import PROJECT_ROOT, database_url, project_path
+from infrastructure.database.migrations import (
+    MIGRATIONS,
+    Migration,
+    migrate,
+    schema_version,
+)
+
+# Versões aplicadas sem opções (a do e-mail único é opcional)
+DEFAULT_VERSIONS = [m.version for m in MIGRATIONS if m.requires is None]
+
+
+@pytest_asyncio.fixture
+async def legacy_engine(tmp_path):
+    """Banco criado antes do controle de versão do schema."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite3'}")
+    async with engine.begin() as conn:
+        await conn.execute(
+            text(
+                "CREATE TABLE userdb (id VARCHAR NOT NULL PRIMARY KEY, "
+                "name VARCHAR NOT NULL, email VARCHAR)"
+            )
+        )
+        await conn.execute(
+            text(
+                "INSERT INTO userdb VALUES ('1', 'A', 'a@example.com'), "
+                "('2', 'B', 'a@example.com')"
+            )
+        )
+    yield engine
+    await engine.dispose()
+
+
+async def _indexes(engine):
+    async with engine.connect() as conn:
+        result = await conn.execute(text("PRAGMA index_list('userdb')"))
+        return {row[1]: bool(row[2]) for row in result}
+
+
+async def _columns(engine):
+    async with engine.connect() as conn:
+        result = await conn.execute(text("PRAGMA table_info('userdb')"))
+        return [(row[1], row[2], row[3], row[5]) for row in result]
+
+
+def test_database_url_does_not_depend_on_cwd():
+    assert database_url() == f"sqlite+aiosqlite:///{PROJECT_ROOT / 'db.sqlite3'}"
+    assert database_url("/data/users.db") == "sqlite+aiosqlite:////data/users.db"
+    assert project_path("http_cache.sqlite3") == str(
+        PROJECT_ROOT / "http_cache.sqlite3"
+    )
+
+
+def test_migration_versions_are_sequential():
+    assert [m.version for m in MIGRATIONS] == list(range(1, len(MIGRATIONS) + 1))
+
+
+@pytest.mark.asyncio
+async def test_migrate_adopts_existing_database(legacy_engine):
+    applied = await migrate(legacy_engine)
+
+    assert [m.version for m in applied] == DEFAULT_VERSIONS
+    assert all(m.duration_ms >= 0 for m in applied)
+    assert await migrate(legacy_engine) == []
+
+    indexes = await _indexes(legacy_engine)
+    assert indexes["ix_userdb_email"] is False
+    assert "uq_userdb_email" not in indexes
+    async with legacy_engine.connect() as conn:
+        assert await schema_version(conn) == DEFAULT_VERSIONS[-1]
+        matches = await conn.execute(
+            text("SELECT rowid FROM userdb_fts WHERE userdb_fts MATCH 'a*'")
+        )
+        assert len(matches.all()) == 2
+        # O alias do rowid preserva os valores que o índice já usava
+        rows = await conn.execute(text("SELECT seq, id FROM userdb ORDER BY seq"))
+        assert rows.all() == [(1, "1"), (2, "2")]
+
+
+@pytest.mark.asyncio
+async def test_migrated_table_matches_model(legacy_engine, tmp_path):
+    await migrate(legacy_engine)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'model.sqlite3'}")
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(UserDB.metadata.create_all)
+        columns, indexes = await _columns(engine), await _indexes(engine)
+    finally:
+        await engine.dispose()
+
+    assert columns == await _columns(legacy_engine)
+    # O índice único do id tem nome gerado pelo SQLite, que muda com a tabela
+    assert sorted(indexes.values()) == sorted((await _indexes(legacy_engine)).values())
+
+
+@pytest.mark.asyncio
+async def test_concurrent_workers_apply_each_migration_once(tmp_path):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite3'}"
+    engines = [create_async_engine(url) for _ in range(4)]
+    try:
+        results = await asyncio.gather(*(migrate(engine) for engine in engines))
+        async with engines[0].connect() as conn:
+            versions = await conn.scalars(text("SELECT version FROM schema_migrations"))
+            recorded = list(versions)
+    finally:
+        for engine in engines:
+            await engine.dispose()
+
+    assert sorted(len(applied) for applied in results) == [
+        0,
+        0,
+        0,
+        len(DEFAULT_VERSIONS),
+    ]
+    assert recorded == DEFAULT_VERSIONS
+
+
+@pytest.mark.asyncio
+async def test_in_memory_database_migrates_without_lock():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    try:
+        assert len(await migrate(engine)) == len(DEFAULT_VERSIONS)
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_unique_email_rejects_existing_duplicates(legacy_engine):
+    with pytest.raises(IntegrityError):
+        await migrate(legacy_engine, unique_email=True)
+
+    async with legacy_engine.begin() as conn:
+        await conn.execute(text("DELETE FROM userdb WHERE id = '2'"))
+    applied = await migrate(legacy_engine, unique_email=True)
+
+    # ✅ Versionada: schema_migrations reflete o índice que existe de fato
+    assert [m.name for m in applied] == ["userdb_unique_email"]
+    assert (await _indexes(legacy_engine))["uq_userdb_email"] is True
+    assert await migrate(legacy_engine, unique_email=True) == []
+    async with legacy_engine.connect() as conn:
+        assert await schema_version(conn) == MIGRATIONS[-1].version
+
+
+@pytest.mark.asyncio
+async def test_failed_migration_rolls_back_its_ddl(legacy_engine):
+    broken = Migration(
+        1,
+        "broken",
+        (
+            "CREATE TABLE extra (id INTEGER PRIMARY KEY)",
+            "INSERT INTO missing VALUES (1)",
+        ),
+    )
+
+    with pytest.raises(OperationalError):
+        await migrate(legacy_engine, (broken,))
+
+    async with legacy_engine.connect() as conn:
+        tables = await conn.scalars(
+            text("SELECT name FROM sqlite_master WHERE type = 'table'")
+        )
+        assert "extra" not in set(tables)
+        assert await schema_version(conn) == 0
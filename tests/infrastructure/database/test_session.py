@@ -0,0 +1,166 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+import pytest_asyncio
+from dependency_injector import providers
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel, select
+
+from adapters.inbound.auth import require_auth
+from adapters.inbound.routes import user_router
+from adapters.out.database.models import UserDB
+from infrastructure.container import Container
+from infrastructure.database.session import (
+    current_read_session,
+    current_session,
+    read_session_ctx_var,
+    session_scope,
+)
+from infrastructure.logger.logger import Logger
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.sqlite3'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    yield async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    await engine.dispose()
+
+
+async def _get_user(session, id):
+    return await session.scalar(select(UserDB).where(UserDB.id == id))
+
+
+def test_current_session_requires_scope():
+    with pytest.raises(RuntimeError):
+        current_session()
+    with pytest.raises(RuntimeError):
+        current_read_session()
+
+
+@pytest.mark.asyncio
+async def test_read_session_scope_binds_its_own_variable(session_factory):
+    async with session_scope(session_factory, read_session_ctx_var) as session:
+        assert current_read_session() is session
+        with pytest.raises(RuntimeError):
+            current_session()
+
+
+@pytest.mark.asyncio
+async def test_session_scope_commits_pending_work(session_factory):
+    async with session_scope(session_factory) as session:
+        assert current_session() is session
+        session.add(UserDB(id="1", name="Alice"))
+
+    with pytest.raises(RuntimeError):
+        current_session()
+    async with session_factory() as session:
+        assert (await _get_user(session, "1")).name == "Alice"
+
+
+@pytest.mark.asyncio
+async def test_session_scope_rolls_back_on_error(session_factory):
+    with pytest.raises(ValueError):
+        async with session_scope(session_factory) as session:
+            session.add(UserDB(id="1", name="Alice"))
+            await session.flush()
+            raise ValueError("boom")
+
+    async with session_factory() as session:
+        assert await _get_user(session, "1") is None
+
+
+@pytest.mark.asyncio
+async def test_nested_session_scope_restores_outer_session(session_factory):
+    async with session_scope(session_factory) as outer:
+        async with session_scope(session_factory) as inner:
+            assert current_session() is inner
+        assert current_session() is outer
+
+
+@pytest.mark.asyncio
+async def test_session_scope_exited_from_another_context(session_factory):
+    scope = session_scope(session_factory)
+    # Entra numa task (Context copiado) e sai na atual, como um gerador órfão
+    await asyncio.create_task(scope.__aenter__())
+
+    await scope.__aexit__(None, None, None)
+
+    with pytest.raises(RuntimeError):
+        current_session()
+
+
+@pytest.mark.asyncio
+async def test_session_scope_isolates_concurrent_tasks(session_factory):
+    async def worker():
+        async with session_scope(session_factory) as session:
+            await asyncio.sleep(0)
+            assert current_session() is session
+            return session
+
+    sessions = await asyncio.gather(*(worker() for _ in range(10)))
+    assert len({id(session) for session in sessions}) == 10
+
+
+@pytest.mark.asyncio
+async def test_parallel_user_requests_get_their_own_session(session_factory):
+    opened = []
+
+    def tracking_factory():
+        session = session_factory()
+        opened.append(session)
+        return session
+
+    container = Container()
+    container.session_factory.override(providers.Object(tracking_factory))
+    container.read_session_factory.override(providers.Object(session_factory))
+    container.logger.override(MagicMock(spec=Logger))
+    app = FastAPI()
+    app.dependency_overrides[require_auth] = lambda: {"email": "test@example.com"}
+    app.container = container
+    app.include_router(user_router.router)
+
+    requests = 50
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        created = await asyncio.gather(
+            *(
+                client.post("/users/", json={"name": f"User {i}"})
+                for i in range(requests)
+            )
+        )
+        listed = await client.get("/users/")
+
+    assert [response.status_code for response in created] == [200] * requests
+    assert len({response.json()["id"] for response in created}) == requests
+    assert len(listed.json()) == requests
+    assert len({id(session) for session in opened}) == requests + 1
+
+
+@pytest.mark.asyncio
+async def test_export_streams_with_its_own_session(session_factory):
+    async with session_factory() as session:
+        session.add_all(UserDB(id=f"{i:04d}", name=f"User {i}") for i in range(2500))
+        await session.commit()
+
+    container = Container()
+    container.session_factory.override(providers.Object(session_factory))
+    container.read_session_factory.override(providers.Object(session_factory))
+    container.logger.override(MagicMock(spec=Logger))
+    app = FastAPI()
+    app.dependency_overrides[require_auth] = lambda: {"email": "test@example.com"}
+    app.container = container
+    app.include_router(user_router.router)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        async with client.stream("GET", "/users/export") as response:
+            lines = [line async for line in response.aiter_lines()]
+
+    assert response.status_code == 200
+    assert len(lines) == 2500
+    assert lines[0] == '{"id":"0000","name":"User 0","email":null}'
@@ -0,0 +1,280 @@
+import asyncio
+import time
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlmodel import SQLModel
+
+from adapters.out.database.user_repository import UserRepository
+from domain.user import User
+from infrastructure.database.engine import create_engine
+from infrastructure.database.write_batcher import WriteBatcher, create_write_batcher
+
+
+@pytest_asyncio.fixture
+async def database(tmp_path):
+    engine = create_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.sqlite3'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    commits = []
+    event.listen(engine.sync_engine, "commit", lambda conn: commits.append(1))
+    session_factory = async_sessionmaker(
+        engine, expire_on_commit=False, class_=AsyncSession
+    )
+    yield session_factory, commits
+    await engine.dispose()
+
+
+def insert(id: str):
+    async def operation(session):
+        await session.execute(
+            text("INSERT INTO userdb (id, name) VALUES (:id, :name)"),
+            {"id": id, "name": f"User {id}"},
+        )
+        return id
+
+    return operation
+
+
+def test_create_write_batcher_is_opt_in(database):
+    session_factory, _ = database
+
+    assert create_write_batcher(False, session_factory) is None
+    batcher = create_write_batcher(True, session_factory, max_batch=10, max_delay=0)
+    assert (batcher.max_batch, batcher.max_delay) == (10, 0)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_share_one_commit(database):
+    session_factory, commits = database
+    batcher = WriteBatcher(session_factory, max_batch=100, max_delay=0.01)
+    commits.clear()
+
+    try:
+        results = await asyncio.gather(
+            *(batcher.submit(insert(str(i))) for i in range(20))
+        )
+    finally:
+        await batcher.close()
+
+    assert results == [str(i) for i in range(20)]
+    assert len(commits) == 1
+
+
+@pytest.mark.asyncio
+async def test_batches_are_capped_at_max_batch(database):
+    session_factory, commits = database
+    batcher = WriteBatcher(session_factory, max_batch=5, max_delay=0.01)
+    commits.clear()
+
+    try:
+        await asyncio.gather(*(batcher.submit(insert(str(i))) for i in range(12)))
+    finally:
+        await batcher.close()
+
+    assert len(commits) == 3
+
+
+@pytest.mark.asyncio
+async def test_zero_delay_commits_what_is_already_queued(database):
+    session_factory, commits = database
+    batcher = WriteBatcher(session_factory, max_delay=0)
+    commits.clear()
+
+    try:
+        await batcher.submit(insert("1"))
+        await batcher.submit(insert("2"))
+    finally:
+        await batcher.close()
+
+    assert len(commits) == 2
+
+
+@pytest.mark.asyncio
+async def test_failing_write_only_fails_its_caller(database):
+    session_factory, _ = database
+    batcher = WriteBatcher(session_factory, max_delay=0.01)
+
+    try:
+        results = await asyncio.gather(
+            batcher.submit(insert("1")),
+            batcher.submit(insert("1")),  # chave duplicada
+            batcher.submit(insert("2")),
+            return_exceptions=True,
+        )
+    finally:
+        await batcher.close()
+
+    assert results[0] == "1"
+    assert isinstance(results[1], IntegrityError)
+    assert results[2] == "2"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_break_the_batch(database):
+    session_factory, _ = database
+    batcher = WriteBatcher(session_factory, max_delay=0.05)
+
+    try:
+        cancelled = asyncio.create_task(batcher.submit(insert("1")))
+        failing = asyncio.create_task(batcher.submit(insert("1")))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        assert await batcher.submit(insert("2")) == "2"
+    finally:
+        await batcher.close()
+
+    assert cancelled.cancelled()
+    with pytest.raises(IntegrityError):
+        await failing
+
+
+@pytest.mark.asyncio
+async def test_repository_writes_go_through_the_batcher(database):
+    session_factory, commits = database
+    batcher = WriteBatcher(session_factory, max_delay=0.01)
+
+    async with session_factory() as session:
+        repository = UserRepository(session, write_batcher=batcher)
+        try:
+            saved = await asyncio.gather(
+                *(repository.save(User(id=str(i), name=f"U{i}")) for i in range(3))
+            )
+            commits.clear()
+            updated, deleted = await asyncio.gather(
+                repository.update("1", {"name": "Alice"}), repository.delete("2")
+            )
+        finally:
+            await batcher.close()
+
+        assert [user.id for user in saved] == ["0", "1", "2"]
+        assert updated == User(id="1", name="Alice")
+        assert deleted is True
+        assert len(commits) == 1
+        assert [user.id for user in await repository.find_all()] == ["0", "1"]
+
+
+@pytest.mark.asyncio
+async def test_batched_save_returns_what_the_database_stored(database):
+    session_factory, _ = database
+    async with session_factory() as session:
+        await session.execute(
+            text(
+                "CREATE TRIGGER upper_name AFTER INSERT ON userdb BEGIN "
+                "UPDATE userdb SET name = upper(new.name) WHERE id = new.id; END"
+            )
+        )
+        await session.commit()
+    batcher = WriteBatcher(session_factory, max_delay=0)
+
+    async with session_factory() as session:
+        direct = UserRepository(session)
+        batched = UserRepository(session, write_batcher=batcher)
+        try:
+            assert (await direct.save(User(id="1", name="alice"))).name == "ALICE"
+            assert (await batched.save(User(id="2", name="bob"))).name == "BOB"
+        finally:
+            await batcher.close()
+
+
+@pytest.mark.asyncio
+async def test_close_drains_pending_writes(database):
+    session_factory, commits = database
+    batcher = WriteBatcher(session_factory, max_batch=2, max_delay=1.0)
+
+    writes = [asyncio.create_task(batcher.submit(insert(str(i)))) for i in range(5)]
+    await asyncio.sleep(0)
+    await batcher.close()
+
+    assert [write.result() for write in writes] == [str(i) for i in range(5)]
+    # Depois de fechado, a próxima escrita sobe uma task nova
+    assert await batcher.submit(insert("5")) == "5"
+    await batcher.close()
+    await batcher.close()
+
+
+@pytest.mark.asyncio
+async def test_writer_restarts_after_dying(database):
+    session_factory, _ = database
+    batcher = WriteBatcher(session_factory, max_delay=0)
+
+    try:
+        assert await batcher.submit(insert("1")) == "1"
+        batcher._writer.cancel()
+        await asyncio.sleep(0)
+        assert batcher._writer.done()
+
+        assert await batcher.submit(insert("2")) == "2"
+    finally:
+        await batcher.close()
+
+
+@pytest.mark.asyncio
+async def test_close_commits_writes_left_by_a_dead_writer(database):
+    session_factory, _ = database
+    batcher = WriteBatcher(session_factory, max_delay=0)
+
+    # A fila recebe a escrita, mas a task que a gravaria morre antes de rodar
+    write = asyncio.create_task(batcher.submit(insert("1")))
+    await asyncio.sleep(0)
+    batcher._writer.cancel()
+    await asyncio.sleep(0)
+    assert batcher._writer.done()
+    await batcher.close()
+
+    assert await write == "1"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_writer_does_not_leave_callers_waiting(database):
+    session_factory, _ = database
+    batcher = WriteBatcher(session_factory, max_delay=0)
+    started = asyncio.Event()
+
+    async def slow(session):
+        started.set()
+        await asyncio.sleep(10)
+
+    write = asyncio.create_task(batcher.submit(slow))
+    await started.wait()
+    batcher._writer.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await write
+    await batcher.close()
+
+
+async def _concurrent_saves(session_factory, writers: int, batcher=None) -> float:
+    async def save(i):
+        # Uma sessão por "requisição", como em POST /users/
+        async with session_factory() as session:
+            repository = UserRepository(session, write_batcher=batcher)
+            await repository.save(User(name=f"User {i}"))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(save(i) for i in range(writers)))
+    return time.perf_counter() - started
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_benchmark_group_commit(database):
+    session_factory, commits = database
+    writers = 200
+
+    commits.clear()
+    direct = await _concurrent_saves(session_factory, writers)
+    direct_commits = len(commits)
+
+    batcher = WriteBatcher(session_factory, max_batch=100, max_delay=0.005)
+    commits.clear()
+    try:
+        batched = await _concurrent_saves(session_factory, writers, batcher)
+    finally:
+        await batcher.close()
+
+    assert len(commits) < direct_commits
+    assert batched < direct
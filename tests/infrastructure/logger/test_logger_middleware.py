@@ -1,9 +1,21 @@
 from unittest.mock import MagicMock
 
+import httpx
 import pytest
-from fastapi import Request
+from fastapi import FastAPI, Request
+from sqlalchemy import text
 
-from infrastructure.logger.logger_middleware import log_with_request
+from adapters.inbound.database import database_scope
+from domain.user import User
+from infrastructure.container import Container
+from infrastructure.database.engine import create_engine
+from infrastructure.database.instrumentation import query_stats_ctx_var
+from infrastructure.database.migrations import migrate
+from infrastructure.logger.logger import Logger
+from infrastructure.logger.logger_middleware import (
+    RequestLoggingMiddleware,
+    log_with_request,
+)
 
 
 class DummyReceive:
@@ -46,3 +58,88 @@ def test_log_with_request_calls_correct_logger_method(level, method):
     getattr(mock_logger, method).assert_called_once_with(
         {"foo": "bar"}, request_id="mocked-request-id"
     )
+
+
+@pytest.mark.asyncio
+async def test_request_log_reports_queries_and_budget(tmp_path):
+    engine = create_engine(f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite3'}")
+    container = Container()
+    container.config.database.query_budget.from_value(3)
+    mock_logger = MagicMock(spec=Logger)
+    container.logger.override(mock_logger)
+    container.wire(modules=["infrastructure.logger.logger_middleware"])
+
+    app = FastAPI()
+    app.add_middleware(RequestLoggingMiddleware)
+
+    @app.get("/queries/{count}")
+    async def run_queries(count: int):
+        async with engine.connect() as conn:
+            for i in range(count):
+                await conn.execute(text("SELECT :i"), {"i": i})
+        return {}
+
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            await client.get("/queries/2")
+            await client.get("/queries/4")
+    finally:
+        await engine.dispose()
+
+    logged = [call.args[0] for call in mock_logger.info.call_args_list]
+    assert [line["db_queries"] for line in logged] == [2, 4]
+    assert all(line["db_duration_ms"] >= 0 for line in logged)
+
+    warning = mock_logger.warning.call_args.args[0]
+    mock_logger.warning.assert_called_once()
+    assert warning["type"] == "QueryBudgetExceeded"
+    assert warning["db_queries"] == 4
+    assert warning["most_repeated"] == {"statement": "SELECT ?", "count": 4}
+
+
+@pytest.mark.asyncio
+async def test_batched_writes_are_not_billed_to_the_first_request(tmp_path):
+    container = Container()
+    container.config.database.url.from_value(
+        f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite3'}"
+    )
+    container.config.database.write_batching.enabled.from_value(True)
+    container.config.database.write_batching.max_delay.from_value(0)
+    mock_logger = MagicMock(spec=Logger)
+    container.logger.override(mock_logger)
+    container.wire(modules=["infrastructure.logger.logger_middleware"])
+    await migrate(container.engine())
+    request_stats = []
+
+    app = FastAPI()
+    app.add_middleware(RequestLoggingMiddleware)
+
+    @app.post("/users")
+    async def create_user():
+        request_stats.append(query_stats_ctx_var.get())
+        async with database_scope(
+            container.session_factory(), container.read_session_factory()
+        ):
+            await container.user_repository().save(User(name="Alice"))
+        return {}
+
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            for _ in range(3):
+                await client.post("/users")
+    finally:
+        await container.user_write_batcher().close()
+        await container.read_engine().dispose()
+        await container.engine().dispose()
+
+    # ✅ A task do group commit nasce na primeira requisição, mas com contexto
+    # limpo: as escritas das seguintes não somam no QueryStats dela
+    logged = [call.args[0]["db_queries"] for call in mock_logger.info.call_args_list]
+    assert logged == [0, 0, 0]
+    assert [stats.count for stats in request_stats] == [0, 0, 0]
@@ -0,0 +1,99 @@
+import asyncio
+
+import httpx
+import pytest
+
+from adapters.out.api.movies_api_client import MoviesApiClient
+from infrastructure.http_client import create_http_client
+
+MOVIE_BODY = (
+    b'{"id": 1, "title": "Matrix", "poster_path": "/m.jpg",'
+    b' "overview": "Neo", "release_date": "1999-03-31"}'
+)
+
+
+class StubServer:
+    """Servidor HTTP/1.1 mínimo (keep-alive) que conta conexões abertas."""
+
+    def __init__(self):
+        self.connections = 0
+        self.server = None
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                if not head:
+                    break
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\n"
+                    b"Content-Type: application/json\r\n"
+                    b"Content-Length: " + str(len(MOVIE_BODY)).encode() + b"\r\n"
+                    b"\r\n" + MOVIE_BODY
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self.server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}"
+        return self
+
+    async def __aexit__(self, *exc):
+        self.server.close()
+        await self.server.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_create_http_client_applies_limits_and_timeouts():
+    client = create_http_client(max_connections=2, timeout=3.0, connect_timeout=1.0)
+
+    async with StubServer() as server:
+        movies = MoviesApiClient(server.base_url, client=client)
+        await asyncio.gather(*(movies.get(movie_id) for movie_id in range(10)))
+        await client.aclose()
+
+    assert 1 <= server.connections <= 2
+    assert client.timeout == httpx.Timeout(3.0, connect=1.0)
+
+
+@pytest.mark.asyncio
+async def test_movies_client_uses_injected_client():
+    async with StubServer() as server:
+        http_client = create_http_client()
+        movies = MoviesApiClient(server.base_url, client=http_client)
+
+        for movie_id in range(5):
+            movie = await movies.get(movie_id)
+            assert movie.title == "Matrix"
+
+        await http_client.aclose()
+
+    assert movies.client is http_client
+    assert server.connections == 1
+
+
+@pytest.mark.asyncio
+async def test_shared_client_reuses_connection_across_requests():
+    requests = 20
+
+    async with StubServer() as server:
+        for movie_id in range(requests):
+            async with httpx.AsyncClient() as fresh:
+                await MoviesApiClient(server.base_url, client=fresh).get(movie_id)
+        fresh_connections = server.connections
+
+        server.connections = 0
+        pooled = create_http_client()
+        movies = MoviesApiClient(server.base_url, client=pooled)
+        for movie_id in range(requests):
+            await movies.get(movie_id)
+        await pooled.aclose()
+
+    assert fresh_connections == requests
+    assert server.connections == 1
@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from infrastructure.database.instrumentation import QueryStats, query_stats_ctx_var
+from infrastructure.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    single_flight = SingleFlight()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "movie"
+
+    results = await asyncio.gather(*(single_flight.do("k", fetch) for _ in range(50)))
+
+    assert results == ["movie"] * 50
+    assert calls == 1
+    assert not single_flight.in_flight("k")
+
+
+@pytest.mark.asyncio
+async def test_different_keys_run_separately():
+    single_flight = SingleFlight()
+
+    async def fetch(value):
+        await asyncio.sleep(0)
+        return value
+
+    results = await asyncio.gather(
+        single_flight.do("a", lambda: fetch(1)),
+        single_flight.do("b", lambda: fetch(2)),
+    )
+
+    assert results == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_error_is_propagated_to_every_caller():
+    single_flight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream down")
+
+    results = await asyncio.gather(
+        *(single_flight.do("k", fetch) for _ in range(3)), return_exceptions=True
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert not single_flight.in_flight("k")
+
+
+@pytest.mark.asyncio
+async def test_cancelling_one_caller_keeps_shared_call_running():
+    single_flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def fetch():
+        await release.wait()
+        return "ok"
+
+    first = asyncio.create_task(single_flight.do("k", fetch))
+    second = asyncio.create_task(single_flight.do("k", fetch))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await second == "ok"
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+@pytest.mark.asyncio
+async def test_cancelling_last_caller_cancels_shared_call():
+    single_flight = SingleFlight()
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def fetch():
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    caller = asyncio.create_task(single_flight.do("k", fetch))
+    await started.wait()
+    caller.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await caller
+    await asyncio.wait_for(cancelled.wait(), 1)
+    await asyncio.sleep(0)
+    assert not single_flight.in_flight("k")
+
+
+@pytest.mark.asyncio
+async def test_shared_call_does_not_inherit_callers_context():
+    single_flight = SingleFlight()
+    query_stats_ctx_var.set(QueryStats())
+
+    async def fetch():
+        return query_stats_ctx_var.get()
+
+    assert await single_flight.do("k", fetch) is None
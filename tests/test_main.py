@@ -0,0 +1,31 @@
+from fastapi.testclient import TestClient
+
+from adapters.inbound.routes.user_router import NEXT_CURSOR_HEADER
+
+
+def test_cors_exposes_pagination_cursor():
+    # Importado aqui: o main religa (wire) os módulos no próprio Container, o que
+    # na coleta sobrescreveria o wiring feito por outros módulos de teste
+    from main import app
+
+    client = TestClient(app)
+
+    response = client.get("/missing", headers={"Origin": "http://localhost:3000"})
+
+    exposed = response.headers["access-control-expose-headers"]
+    assert NEXT_CURSOR_HEADER in [header.strip() for header in exposed.split(",")]
+
+
+def test_cache_metrics_report_hit_ratio():
+    from main import app, container
+
+    container.user_cache_store().get("users:missing")
+
+    response = TestClient(app).get("/metrics/cache")
+
+    assert response.status_code == 200
+    metrics = response.json()
+    assert set(metrics) == {"users", "todos", "movies"}
+    assert metrics["users"]["misses"] >= 1
+    assert metrics["users"]["hit_ratio"] == 0.0
+    assert metrics["users"]["entries"] == 0